@@ -51,6 +51,7 @@ CACHES = {
         },
     },
 }
+RETRIEVE_CACHE_TIMEOUT = env.int("RETRIEVE_CACHE_TIMEOUT", default=3600)
 
 
 # DATABASES
@@ -233,11 +234,66 @@ CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_BEAT_SCHEDULE = {
     "record_historical_performance": {
         "task": "vendor_management_system.historical_performances.tasks.record_historical_performance",
-        "schedule": crontab(hour="*/6"),  # Run every 6 hours
+        "schedule": crontab(minute=0, hour="*/6"),  # Run every 6 hours
+    },
+    "expire_historical_performance": {
+        "task": "vendor_management_system.historical_performances.tasks.expire_historical_performance",
+        "schedule": crontab(minute=30, hour=3),  # Run every day at 03:30
+    },
+    "create_historical_performance_partitions": {
+        "task": "vendor_management_system.historical_performances.tasks.create_historical_performance_partitions",
+        "schedule": crontab(minute=0, hour=3),  # Run every day at 03:00
+    },
+    "compact_historical_performance": {
+        "task": "vendor_management_system.historical_performances.tasks.compact_historical_performance",
+        "schedule": crontab(minute=0, hour=4, day_of_month=1),  # Run every month
     },
 }
 
 
+# Vendor metrics
+# -------------------------------------------------------------------------------
+VENDOR_METRICS_ASYNC = env.bool("VENDOR_METRICS_ASYNC", default=False)
+VENDOR_METRICS_DEBOUNCE_SECONDS = env.int("VENDOR_METRICS_DEBOUNCE_SECONDS", default=60)
+
+
+# Historical performance
+# -------------------------------------------------------------------------------
+HISTORICAL_PERFORMANCE_BATCH_SIZE = env.int(
+    "HISTORICAL_PERFORMANCE_BATCH_SIZE", default=1000
+)
+HISTORICAL_PERFORMANCE_SHARDS = env.int("HISTORICAL_PERFORMANCE_SHARDS", default=4)
+HISTORICAL_PERFORMANCE_DELTA_MODE = env.bool(
+    "HISTORICAL_PERFORMANCE_DELTA_MODE", default=False
+)
+HISTORICAL_PERFORMANCE_HEARTBEAT_HOURS = env.int(
+    "HISTORICAL_PERFORMANCE_HEARTBEAT_HOURS", default=24
+)
+HISTORICAL_PERFORMANCE_RETENTION_DAYS = env.int(
+    "HISTORICAL_PERFORMANCE_RETENTION_DAYS", default=365
+)
+HISTORICAL_PERFORMANCE_PARTITIONS_AHEAD = env.int(
+    "HISTORICAL_PERFORMANCE_PARTITIONS_AHEAD", default=3
+)
+HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE = env.bool(
+    "HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE", default=False
+)
+
+
+# Purchase orders
+# -------------------------------------------------------------------------------
+PURCHASE_ORDER_EXPORT_CHUNK_SIZE = env.int(
+    "PURCHASE_ORDER_EXPORT_CHUNK_SIZE", default=2000
+)
+
+
+# Authentication
+# -------------------------------------------------------------------------------
+AUTH_TOKEN_CACHE_TIMEOUT = env.int("AUTH_TOKEN_CACHE_TIMEOUT", default=300)
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = env.int("AUTH_TOKEN_LOCAL_CACHE_TIMEOUT", default=10)
+AUTH_TOKEN_LOCAL_CACHE_SIZE = env.int("AUTH_TOKEN_LOCAL_CACHE_SIZE", default=10000)
+
+
 # django-rest-framework
 # -------------------------------------------------------------------------------
 REST_FRAMEWORK = {
@@ -15,6 +15,8 @@ urlpatterns = [
     path("", include("vendor_management_system.core.urls")),
     # Vendor App URL patterns
     path("vendors/", include("vendor_management_system.vendors.urls")),
+    # Historical Performances App URL patterns
+    path("vendors/", include("vendor_management_system.historical_performances.urls")),
     # User App URL patterns
     path("users/", include("vendor_management_system.users.urls")),
     # Purchase Orders App URL patterns
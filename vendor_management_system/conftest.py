@@ -1,5 +1,11 @@
 # Imports
+import contextlib
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from vendor_management_system.core.authentication import local_credentials_cache
 
 from vendor_management_system.historical_performances.tests.factories import (
     HistoricalPerformanceFactory,
@@ -12,6 +18,15 @@ from vendor_management_system.purchase_orders.tests.factories import (
 from vendor_management_system.vendors.tests.factories import VendorFactory
 
 
+# Set the fixture to clear the per process credentials cache between the tests, the
+# database of a test is rolled back but not the cache
+@pytest.fixture(autouse=True)
+def clear_local_credentials_cache():
+    local_credentials_cache.clear()
+    yield
+    local_credentials_cache.clear()
+
+
 # Set the fixture for the VendorFactory
 @pytest.fixture()
 def vendor_factory(db) -> VendorFactory:
@@ -28,3 +43,56 @@ def purchase_order_factory(db) -> PurchaseOrderFactory:
 @pytest.fixture()
 def historical_performance_factory(db) -> HistoricalPerformanceFactory:
     return HistoricalPerformanceFactory
+
+
+# Set the fixture to check that a list does not query per item
+@pytest.fixture()
+def assert_constant_queries(db):
+    # Function to compare the queries of a small and a large page
+    def check(fetch_page, small=1, large=10):
+        # Fetch a page first, so the cached authentication is the same for both
+        fetch_page(small)
+
+        # Count the queries of both page sizes
+        counts = []
+        for page_size in [small, large]:
+            with CaptureQueriesContext(connection) as context:
+                fetch_page(page_size)
+            counts.append(len(context.captured_queries))
+
+        # Check that the number of queries does not grow with the page size
+        assert (
+            counts[0] == counts[1]
+        ), f"{counts[0]} queries for {small} items but {counts[1]} for {large}"
+
+    # Return the check
+    return check
+
+
+# Set the fixture to check the number of queries of a block, the savepoints of the
+# atomic requests are not counted
+@pytest.fixture()
+def assert_num_queries(db):
+    # Function to check the queries run within the block
+    @contextlib.contextmanager
+    def check(expected):
+        # Capture the queries of the block
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        # Get the queries, without the savepoints
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if not query["sql"].startswith(
+                ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+            )
+        ]
+
+        # Check the number of queries
+        assert len(queries) == expected, "\n".join(
+            [f"{expected} queries expected but {len(queries)} were run:", *queries]
+        )
+
+    # Return the check
+    return check
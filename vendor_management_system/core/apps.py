@@ -8,3 +8,8 @@ class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vendor_management_system.core"
     verbose_name = _("Core")
+
+    # Ready method
+    def ready(self):
+        # Import the signals module
+        import vendor_management_system.core.signals
@@ -1,7 +1,83 @@
 # Imports
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from vendor_management_system.core.cache import LocalTTLCache
+
+
+# Per process cache of the authenticated credentials, in front of the shared cache
+# Its short time to live bounds how long other processes see revoked tokens
+local_credentials_cache = LocalTTLCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT,
+)
+
+
+# Marker left in the shared cache for revoked tokens
+REVOKED = "revoked"
+
+
+# Function to get the shared cache key of a token, the token itself is not stored
+def get_token_cache_key(key):
+    return f"auth:token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+# Function to get the cached (user, token) credentials of a token
+def get_cached_credentials(key):
+    # If the credentials are cached in the process, return them
+    credentials = local_credentials_cache.get(key)
+    if credentials is not None:
+        return credentials
+
+    # Get the credentials from the shared cache
+    credentials = cache.get(get_token_cache_key(key))
+
+    # If the credentials are not cached or were revoked
+    if credentials is None or credentials == REVOKED:
+        return None
+
+    # Cache the credentials in the process and return them
+    local_credentials_cache.set(key, credentials)
+    return credentials
+
+
+# Function to cache the (user, token) credentials of a token
+def set_cached_credentials(key, credentials):
+    # Cache the credentials in the process
+    local_credentials_cache.set(key, credentials)
+
+    # Cache the credentials in the shared cache, unless they were revoked while
+    # they were loaded from the database
+    cache.add(
+        get_token_cache_key(key), credentials, timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT
+    )
+
+
+# Function to invalidate the cached credentials of tokens once the changes are committed
+def invalidate_cached_credentials(keys):
+    # Get the keys now, they may not be queryable after the commit
+    keys = list(keys)
+    if not keys:
+        return
+
+    # Function to replace the credentials with the revoked marker in both caches
+    def invalidate():
+        for key in keys:
+            local_credentials_cache.delete(key)
+        cache.set_many(
+            {get_token_cache_key(key): REVOKED for key in keys},
+            timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT,
+        )
+
+    # Invalidate after the current transaction is committed
+    transaction.on_commit(invalidate)
+
 
 # Custom token authentication
 class QueryParameterTokenAuthentication(TokenAuthentication):
@@ -22,3 +98,23 @@ class QueryParameterTokenAuthentication(TokenAuthentication):
 
         # If the token is not set return None
         return None
+
+    # Method to authenticate the credentials, from the caches when possible
+    def authenticate_credentials(self, key):
+        # If the token is empty, it cannot be hashed nor match a token
+        if not key:
+            raise AuthenticationFailed(_("Invalid token."))
+
+        # If the credentials of the token are cached
+        credentials = get_cached_credentials(key)
+        if credentials is not None:
+            return credentials
+
+        # Authenticate the credentials with the database
+        credentials = super().authenticate_credentials(key)
+
+        # Cache the credentials of the active user
+        set_cached_credentials(key, credentials)
+
+        # Return the credentials
+        return credentials
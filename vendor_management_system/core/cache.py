@@ -0,0 +1,126 @@
+# Imports
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Function to get the cache key of the version of an object
+def get_version_key(prefix, pk):
+    return f"{prefix}:version:{pk}"
+
+
+# Function to get the current versions of the (prefix, pk) objects
+def get_versions(objects):
+    # If there are no objects
+    keys = {get_version_key(prefix, pk): (prefix, pk) for prefix, pk in objects}
+    if not keys:
+        return {}
+
+    # Get the stored versions
+    versions = cache.get_many(list(keys))
+
+    # Start the missing versions from the current time, so an evicted version
+    # never comes back to a value that was cached before the eviction
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+
+    # Return the versions by object, None if the cache is unavailable
+    return {keys[key]: versions[key] for key in keys}
+
+
+# Function to get the cached entry of an object, building it if it changed, with
+# the version of the object and of the objects its value is built from
+def get_or_build_entry(prefix, pk, build, dependencies=None):
+    # Get the version of the object
+    version = get_versions([(prefix, pk)])[(prefix, pk)]
+
+    # If the cache is unavailable, build the value
+    if version is None:
+        return {"key": None, "value": build(), "dependencies": {}}
+
+    # If the value of the version is cached and the objects it was built from
+    # did not change, return it
+    key = f"{prefix}:{pk}:{version}"
+    entry = cache.get(key)
+    if (
+        entry is not None
+        and get_versions(entry["dependencies"]) == entry["dependencies"]
+    ):
+        return {"key": key, **entry}
+
+    # Get the versions of the objects the value is built from, before building it
+    dependency_versions = get_versions(dependencies() if dependencies else [])
+
+    # Build the value and cache it with the versions it was built from
+    entry = {"value": build(), "dependencies": dependency_versions}
+    cache.set(key, entry, timeout=settings.RETRIEVE_CACHE_TIMEOUT)
+
+    # Return the entry
+    return {"key": key, **entry}
+
+
+# Function to move an object to a new version
+def _bump_version(prefix, pk):
+    # Try to increment the version
+    try:
+        cache.incr(get_version_key(prefix, pk))
+
+    # If the version is not stored, the next read starts a new one
+    except ValueError:
+        pass
+
+
+# Function to invalidate the cached values of an object once the changes are committed
+def invalidate(prefix, pk):
+    transaction.on_commit(lambda: _bump_version(prefix, pk))
+
+
+# Per process least recently used cache whose entries expire after a time to live
+class LocalTTLCache:
+    # Method to initialize the cache with its size and time to live in seconds
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # Method to get a value, None if it is missing or expired
+    def get(self, key):
+        with self.lock:
+            # If the key is not cached
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            # If the entry expired, remove it
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            # Mark the entry as the most recently used and return its value
+            self.entries.move_to_end(key)
+            return value
+
+    # Method to set a value, evicting the least recently used entries
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    # Method to delete a value
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    # Method to delete all the values
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
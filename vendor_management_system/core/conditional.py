@@ -0,0 +1,55 @@
+# Imports
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+# Function to get a strong ETag from the values a representation is built from
+def make_etag(*values):
+    return hashlib.sha256(repr(values).encode()).hexdigest()
+
+
+# Function to get the query parameters selecting the representation of a request
+def get_representation_params(request):
+    return sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key != "token"
+        for value in values
+    )
+
+
+# Function to get the ETag of a list from the representation actually returned, so
+# it costs no more than the page itself
+def get_list_etag(request, data):
+    return make_etag(get_representation_params(request), data)
+
+
+# Function to get the ETag of a cached entry from the versions it was built from,
+# None if the cache is unavailable
+def get_entry_etag(entry):
+    # If the entry was built without the cache
+    if entry["key"] is None:
+        return None
+
+    # Return the ETag of the versions of the object and of its dependencies
+    return make_etag(entry["key"], sorted(entry["dependencies"].items()))
+
+
+# Function to answer a GET with a response, or not modified if the client already
+# has the representation of the ETag
+def respond_conditionally(request, etag, response):
+    # If there is no ETag, return the response
+    if etag is None:
+        return response
+
+    # Get the not modified response if the ETag matches, the response otherwise
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag, response=response)
+
+    # Set the ETag of the response
+    response.headers.setdefault("ETag", etag)
+
+    # Return the response
+    return response
@@ -0,0 +1,187 @@
+# Imports
+import base64
+import json
+
+from django.db.models import F, Q
+from rest_framework import response
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+
+
+# Keyset pagination over an ordering ending in a unique non null field, only the
+# leading field may be null
+class KeysetPagination(BasePagination):
+    # Set the query parameters and the page sizes
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 100
+    max_page_size = 1000
+
+    # Method to initialize the pagination with the (field, descending) ordering
+    def __init__(self, ordering, page_size=None):
+        self.ordering = ordering
+        if page_size is not None:
+            self.page_size = page_size
+
+    # Method to encode the position after an item as a cursor
+    def encode_cursor(self, item):
+        # Get the values of the ordering fields
+        values = [
+            item[field] if isinstance(item, dict) else getattr(item, field)
+            for field, _ in self.ordering
+        ]
+
+        # Return the values as an url safe string, keeping the full precision of dates
+        return base64.urlsafe_b64encode(
+            json.dumps(values, default=str).encode()
+        ).decode()
+
+    # Method to decode a cursor to the values of the ordering fields
+    def decode_cursor(self, cursor):
+        # Try to decode the cursor
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+        # If the cursor is malformed
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor")
+
+        # If the cursor does not match the ordering
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+
+        # Return the values
+        return values
+
+    # Method to get the filter selecting the items after the given values
+    def get_keyset_filter(self, values):
+        # Build the filter field by field, from the last field to the first
+        keyset_filter = None
+        for (field, descending), value in reversed(list(zip(self.ordering, values))):
+            # Get the filters of the items after the value of the field
+            filters = []
+
+            # If the value is set, the items strictly after it
+            if value is not None:
+                filters.append(Q(**{f"{field}__{'lt' if descending else 'gt'}": value}))
+
+            # Ties on the field are broken by the following fields, None matches null
+            if keyset_filter is not None:
+                filters.append(Q(**{field: value}) & keyset_filter)
+
+            # Combine the filters, matching nothing if no item can come after
+            keyset_filter = Q(pk__in=[])
+            if filters:
+                keyset_filter = filters[0]
+                for item_filter in filters[1:]:
+                    keyset_filter |= item_filter
+
+        # Bound the leading field so the index range scan starts at the cursor, the
+        # null values are fetched separately after the values that are set
+        field, descending = self.ordering[0]
+        if values[0] is None:
+            leading_filter = Q(**{f"{field}__isnull": True})
+        else:
+            leading_filter = Q(
+                **{f"{field}__{'lte' if descending else 'gte'}": values[0]}
+            )
+
+        # Return the filter
+        return leading_filter & keyset_filter
+
+    # Method to get the page size of the request
+    def get_page_size(self, request):
+        # Try to get the requested page size
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+
+        # If the page size is not requested or not a number
+        except (KeyError, ValueError):
+            return self.page_size
+
+        # Return the page size, within the allowed range
+        return max(1, min(page_size, self.max_page_size))
+
+    # Method to get a page of the queryset
+    def paginate_queryset(self, queryset, request, view=None):
+        # Get the nullable fields of the ordering
+        self.nullable_fields = {
+            field
+            for field, _ in self.ordering
+            if queryset.model._meta.get_field(field).null
+        }
+
+        # Order the queryset by the keyset, with the null values last, as in the
+        # indexes of the orderings
+        queryset = queryset.order_by(
+            *(
+                F(field).desc(nulls_last=True) if descending else F(field).asc()
+                for field, descending in self.ordering
+            )
+        )
+
+        # Function to fetch the items after the cursor values, if any
+        def fetch(values, limit):
+            # If no cursor is given, return the first items
+            if values is None:
+                return queryset[:limit]
+
+            # Get the items after the position of the cursor
+            items = list(queryset.filter(self.get_keyset_filter(values))[:limit])
+
+            # If the leading value of the cursor is set, the null values follow
+            field = self.ordering[0][0]
+            if (
+                len(items) < limit
+                and values[0] is not None
+                and field in self.nullable_fields
+            ):
+                items += queryset.filter(**{f"{field}__isnull": True})[
+                    : limit - len(items)
+                ]
+
+            # Return the items
+            return items
+
+        # Return the page
+        return self.paginate_fetched(fetch, request)
+
+    # Method to get a page of the items fetched by a function of the cursor values
+    # and a limit, for items that are not read from a single queryset
+    def paginate_fetched(self, fetch, request):
+        # Save the request
+        self.request = request
+
+        # Get the values of the cursor, if any
+        cursor = request.query_params.get(self.cursor_query_param)
+        values = self.decode_cursor(cursor) if cursor else None
+
+        # Fetch one more item than the page size to know if there is a next page
+        page_size = self.get_page_size(request)
+        page = list(fetch(values, page_size + 1))
+
+        # Save the cursor of the next page
+        self.next_cursor = (
+            self.encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+        )
+
+        # Return the page
+        return page[:page_size]
+
+    # Method to get the link to the next page
+    def get_next_link(self):
+        # If there is no next page
+        if self.next_cursor is None:
+            return None
+
+        # Return the current url with the cursor of the next page
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    # Method to get the paginated response
+    def get_paginated_response(self, data):
+        return response.Response({"next": self.get_next_link(), "results": data})
@@ -1,7 +1,12 @@
 # Imports
+import functools
+
+from django.conf import settings
 from django.contrib.auth import authenticate
-from rest_framework import serializers
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
 from rest_framework.authtoken.serializers import AuthTokenSerializer
+from rest_framework.settings import api_settings
 
 
 # Query Param Auth Token Serializer
@@ -43,3 +48,135 @@ class QueryParamAuthTokenSerializer(AuthTokenSerializer):
 
         # Return the attributes
         return attrs
+
+
+# Converters matching the to_representation of the DRF fields they replace
+CONVERTERS = {
+    serializers.CharField.to_representation: str,
+    serializers.IntegerField.to_representation: int,
+    serializers.FloatField.to_representation: float,
+}
+
+
+# Kinds of the fields of a values serializer, by how their values are converted
+VALUE, CONVERTED, DATETIME, NESTED = range(4)
+
+
+# Function to check if a DateTimeField outputs ISO 8601 in the current timezone, the
+# output of the values serializer can then skip its per value timezone lookup
+def is_iso_datetime_field(field):
+    return (
+        isinstance(field, serializers.DateTimeField)
+        and settings.USE_TZ
+        and not hasattr(field, "timezone")
+        and str(getattr(field, "format", api_settings.DATETIME_FORMAT)).lower()
+        == ISO_8601
+    )
+
+
+# Function to convert a datetime as an ISO 8601 DateTimeField does, in a timezone
+def datetime_to_representation(value, current_timezone):
+    # Convert the datetime to the timezone
+    if timezone.is_aware(value):
+        value = value.astimezone(current_timezone)
+    else:
+        value = timezone.make_aware(value, current_timezone)
+
+    # Return the ISO 8601 string, in UTC with the Z suffix
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+# Read only serializer for QuerySet.values() rows, matching the output of a serializer
+class ValuesSerializer:
+    # Method to precompile the columns and the converters of the serializer fields
+    def __init__(self, serializer_class, fields=None, prefix=""):
+        # Set the columns to select and the (name, column, kind, converter) fields
+        self.columns = []
+        self.converters = []
+
+        # Traverse over the fields of the serializer, in their output order
+        for name, field in serializer_class().fields.items():
+            # If the field is write only or not requested, skip it
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+
+            # Get the column of the field
+            column = prefix + field.source.replace(".", "__")
+
+            # If the field is a nested serializer, it is serialized from the same row
+            if isinstance(field, serializers.BaseSerializer):
+                nested = ValuesSerializer(type(field), prefix=f"{column}__")
+                self.columns += [column, *nested.columns]
+                self.converters.append((name, column, NESTED, nested.to_representation))
+                continue
+
+            # Get the kind and the converter of the field
+            if isinstance(field, serializers.JSONField) and not field.binary:
+                kind, converter = VALUE, None
+            elif is_iso_datetime_field(field):
+                kind, converter = DATETIME, datetime_to_representation
+            else:
+                kind, converter = CONVERTED, CONVERTERS.get(
+                    type(field).to_representation, field.to_representation
+                )
+
+            # Add the field
+            self.columns.append(column)
+            self.converters.append((name, column, kind, converter))
+
+    # Method to serialize a row, with the datetimes in the given timezone
+    def to_representation(self, row, current_timezone):
+        # Convert every field, None values are kept as the serializers do
+        representation = {}
+        for name, column, kind, converter in self.converters:
+            value = row[column]
+            if value is None or kind == VALUE:
+                representation[name] = value
+            elif kind == CONVERTED:
+                representation[name] = converter(value)
+            else:
+                representation[name] = converter(
+                    row if kind == NESTED else value, current_timezone
+                )
+
+        # Return the representation
+        return representation
+
+    # Method to serialize the rows, the current timezone is looked up once
+    def serialize(self, rows):
+        current_timezone = timezone.get_current_timezone()
+        return [self.to_representation(row, current_timezone) for row in rows]
+
+
+# Function to get the compiled values serializer of a serializer and its fields
+@functools.lru_cache(maxsize=128)
+def get_values_serializer(serializer_class, fields=None):
+    return ValuesSerializer(serializer_class, fields)
+
+
+# Function to get the fields requested with the fields query parameter
+def get_requested_fields(request, serializer_class):
+    # If no fields are requested, all the fields are returned
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+
+    # Get the requested fields, without duplicates
+    requested_fields = tuple(
+        dict.fromkeys(field.strip() for field in fields.split(",") if field.strip())
+    )
+
+    # If some of the fields are unknown, raise a validation error
+    unknown_fields = [
+        field for field in requested_fields if field not in serializer_class.Meta.fields
+    ]
+    if unknown_fields:
+        raise serializers.ValidationError(
+            {"fields": [f"Unknown field: {field}" for field in unknown_fields]}
+        )
+
+    # Return the requested fields
+    return requested_fields
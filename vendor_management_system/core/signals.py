@@ -0,0 +1,27 @@
+# Imports
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from vendor_management_system.core.authentication import invalidate_cached_credentials
+
+
+# Create a signal to invalidate the cached credentials of a deleted Token
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_cached_credentials([instance.key])
+
+
+# Create a signal to invalidate the cached credentials of a User when it is saved,
+# such as when it is deactivated
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # If only the last login is saved, the credentials did not change
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+
+    # Invalidate the credentials of the tokens of the user
+    invalidate_cached_credentials(
+        Token.objects.filter(user=instance).values_list("key", flat=True)
+    )
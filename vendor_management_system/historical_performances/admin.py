@@ -2,7 +2,11 @@
 from django.contrib import admin
 
 from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
     HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    MonthlyPerformanceSeries,
+    WeeklyPerformanceRollup,
 )
 
 
@@ -47,3 +51,53 @@ class HistoricalPerformanceAdmin(admin.ModelAdmin):
     ]
     ordering = ["date"]
     list_filter = ["vendor"]
+
+
+# Register the performance rollup models in admin
+@admin.register(
+    DailyPerformanceRollup, WeeklyPerformanceRollup, MonthlyPerformanceRollup
+)
+class PerformanceRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "vendor",
+        "period_start",
+        "on_time_delivery_rate_mean",
+        "quality_rating_avg_mean",
+        "average_response_time_mean",
+        "fulfillment_rate_mean",
+    ]
+    search_fields = ["vendor__name"]
+    ordering = ["-period_start"]
+    list_filter = ["vendor"]
+
+    # The rollups are maintained by the snapshot task
+    def has_add_permission(self, request):
+        return False
+
+    # The rollups are maintained by the snapshot task
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# Register MonthlyPerformanceSeries model in admin
+@admin.register(MonthlyPerformanceSeries)
+class MonthlyPerformanceSeriesAdmin(admin.ModelAdmin):
+    list_display = ["vendor", "month", "point_count"]
+    search_fields = ["vendor__name"]
+    ordering = ["-month"]
+    list_filter = ["vendor"]
+    exclude = [
+        "timestamps",
+        "on_time_delivery_rate",
+        "quality_rating_avg",
+        "average_response_time",
+        "fulfillment_rate",
+    ]
+
+    # The series are maintained by the compaction task
+    def has_add_permission(self, request):
+        return False
+
+    # The series are maintained by the compaction task
+    def has_change_permission(self, request, obj=None):
+        return False
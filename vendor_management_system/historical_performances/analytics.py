@@ -0,0 +1,223 @@
+# Imports
+import datetime
+
+import numpy as np
+from django.db import models
+from django.db.models.functions import ExtractDay, TruncDate
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Direction of every metric, 1 if higher is better and -1 if lower is better
+METRIC_DIRECTIONS = np.array([1.0, 1.0, -1.0, 1.0])
+
+
+# Function to load the daily series of the vendors into a (vendor, day, metric) grid
+def load_daily_series(days, vendor_codes=None):
+    # Get the first day of the range
+    first_day = timezone.localdate() - datetime.timedelta(days=days - 1)
+
+    # Get the daily means of the range in a single query
+    rollups = DailyPerformanceRollup.objects.filter(
+        period_start__gte=timezone.make_aware(
+            datetime.datetime.combine(first_day, datetime.time())
+        )
+    )
+    if vendor_codes is not None:
+        rollups = rollups.filter(vendor_id__in=vendor_codes)
+
+    # Get the day of every row from the first day in the database, on the local date
+    # of its period
+    rollups = rollups.annotate(
+        day_index=ExtractDay(
+            models.ExpressionWrapper(
+                TruncDate("period_start")
+                - models.Value(first_day, output_field=models.DateField()),
+                output_field=models.DurationField(),
+            )
+        )
+    )
+    rows = list(
+        rollups.order_by("vendor_id", "period_start").values_list(
+            "vendor_id", "day_index", *(f"{field}_mean" for field in METRIC_FIELDS)
+        )
+    )
+
+    # Get the vendor and the day of every row
+    vendors, vendor_index = np.unique(
+        np.array([row[0] for row in rows], dtype=object), return_inverse=True
+    )
+    day_index = np.fromiter((row[1] for row in rows), dtype=int, count=len(rows))
+
+    # Scatter the values into the grid, missing days are undefined
+    grid = np.full((len(vendors), days, len(METRIC_FIELDS)), np.nan)
+    if rows:
+        grid[vendor_index, day_index] = np.array([row[2:] for row in rows], dtype="<f8")
+
+    # Return the first day, the vendor codes and the grid
+    return first_day, list(vendors), grid
+
+
+# Function to get the rolling mean over the days of the grid, ignoring gaps
+def rolling_mean(grid, window):
+    # Get the cumulative sums and counts of the defined values
+    defined = ~np.isnan(grid)
+    sums = np.cumsum(np.where(defined, grid, 0), axis=1)
+    counts = np.cumsum(defined, axis=1)
+
+    # Subtract the cumulative values leaving the window
+    sums[:, window:] -= sums[:, :-window].copy()
+    counts[:, window:] -= counts[:, :-window].copy()
+
+    # Return the means, undefined where the window has no values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+# Function to get the exponentially weighted moving average over the days of the grid
+def ewma(grid, alpha):
+    # Start with the first day
+    averages = np.empty_like(grid)
+    averages[:, 0] = grid[:, 0]
+
+    # Traverse over the days, carrying the average over the gaps
+    for day in range(1, grid.shape[1]):
+        previous = averages[:, day - 1]
+        current = grid[:, day]
+        averages[:, day] = np.where(
+            np.isnan(previous),
+            current,
+            np.where(
+                np.isnan(current), previous, alpha * current + (1 - alpha) * previous
+            ),
+        )
+
+    # Return the averages
+    return averages
+
+
+# Function to get the least squares slope per day of the grid, ignoring gaps
+def trend_slope(grid):
+    # Get the days and the mask of the defined values
+    days = np.arange(grid.shape[1], dtype="<f8")[None, :, None]
+    defined = ~np.isnan(grid)
+    counts = defined.sum(axis=1, keepdims=True)
+
+    # Center the days and the values on their means
+    with np.errstate(divide="ignore", invalid="ignore"):
+        day_mean = np.where(defined, days, 0).sum(axis=1, keepdims=True) / counts
+        value_mean = np.nansum(grid, axis=1, keepdims=True) / counts
+        centered_days = np.where(defined, days - day_mean, 0)
+        centered_values = np.where(defined, grid - value_mean, 0)
+
+        # Return the slopes, undefined with less than two days
+        slopes = (centered_days * centered_values).sum(axis=1) / (
+            centered_days**2
+        ).sum(axis=1)
+    return np.where(counts[:, 0] > 1, slopes, np.nan)
+
+
+# Function to get the mean and standard deviation over the days of the grid
+def _nan_mean_std(grid):
+    # Get the number of defined values
+    counts = (~np.isnan(grid)).sum(axis=1)
+
+    # Return the statistics, undefined without values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(grid, axis=1) / counts
+        std = np.sqrt(np.nansum((grid - mean[:, None]) ** 2, axis=1) / counts)
+    return mean, std
+
+
+# Function to get the z-score of the latest value against the previous values
+def latest_z_score(grid):
+    # Get the statistics of the previous values
+    mean, std = _nan_mean_std(grid[:, :-1])
+
+    # Return the z-scores, zero where the previous values do not vary
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (grid[:, -1] - mean) / std, 0.0)
+
+
+# Function to analyze the series of the vendors
+def analyze_vendors(
+    days=90,
+    window=7,
+    alpha=0.3,
+    threshold=3.0,
+    vendor_codes=None,
+    include_series=False,
+):
+    # Load the series of the vendors
+    first_day, vendors, grid = load_daily_series(days, vendor_codes=vendor_codes)
+
+    # Compute the indicators of every vendor and metric in batch
+    rolling = rolling_mean(grid, window)
+    averages = ewma(grid, alpha)
+    slopes = trend_slope(grid)
+    z_scores = latest_z_score(grid)
+
+    # Get the deterioration over the range relative to the level of every metric
+    levels = np.abs(_nan_mean_std(grid)[0])
+    levels = np.where(levels > 0, levels, 1)
+    deterioration = np.nan_to_num(-METRIC_DIRECTIONS * slopes * days / levels)
+    deterioration = deterioration.sum(axis=1)
+
+    # Get the analytics of every vendor
+    analytics = [
+        {
+            "vendor_code": vendor_code,
+            "deterioration_score": round(float(deterioration[index]), 4),
+            "metrics": {
+                field: {
+                    "latest": _to_float(grid[index, -1, metric]),
+                    "rolling_mean": _to_float(rolling[index, -1, metric]),
+                    "ewma": _to_float(averages[index, -1, metric]),
+                    "slope": _to_float(slopes[index, metric]),
+                    "z_score": _to_float(z_scores[index, metric]),
+                    "anomaly": bool(abs(z_scores[index, metric]) >= threshold),
+                }
+                for metric, field in enumerate(METRIC_FIELDS)
+            },
+        }
+        for index, vendor_code in enumerate(vendors)
+    ]
+
+    # If the daily series are requested, add them to the analytics
+    if include_series:
+        dates = [first_day + datetime.timedelta(days=day) for day in range(days)]
+        for index, vendor in enumerate(analytics):
+            vendor["series"] = {
+                "date": dates,
+                **{
+                    field: {
+                        "value": [_to_float(value) for value in grid[index, :, metric]],
+                        "rolling_mean": [
+                            _to_float(value) for value in rolling[index, :, metric]
+                        ],
+                        "ewma": [
+                            _to_float(value) for value in averages[index, :, metric]
+                        ],
+                    }
+                    for metric, field in enumerate(METRIC_FIELDS)
+                },
+            }
+
+    # Return the analytics
+    return analytics
+
+
+# Function to rank the vendors by deterioration, the most deteriorated first
+def rank_vendors(analytics, limit=None):
+    return sorted(
+        analytics, key=lambda vendor: vendor["deterioration_score"], reverse=True
+    )[:limit]
+
+
+# Function to convert a NumPy value to a rounded float, None if undefined
+def _to_float(value):
+    return None if np.isnan(value) else round(float(value), 4)
@@ -8,3 +8,8 @@ class HistoricalPerformancesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "vendor_management_system.historical_performances"
     verbose_name = _("Historical Performances")
+
+    # Ready method
+    def ready(self):
+        # Import the signals module
+        import vendor_management_system.historical_performances.signals
@@ -0,0 +1,297 @@
+# Imports
+import datetime
+import itertools
+
+import numpy as np
+from django.conf import settings
+
+from vendor_management_system.historical_performances.columnar import (
+    get_first_packed_dates,
+)
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+    generate_historical_performance_ids,
+)
+from vendor_management_system.historical_performances.partitions import (
+    create_partitions,
+)
+from vendor_management_system.historical_performances.retention import (
+    downsample_day,
+    get_next_day_start,
+)
+from vendor_management_system.historical_performances.rollups import get_period_start
+from vendor_management_system.historical_performances.series import EPOCH, floor_date
+from vendor_management_system.historical_performances.snapshots import SNAPSHOT_INTERVAL
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderEvent,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Fields of the PurchaseOrder needed to rebuild the metrics
+ORDER_FIELDS = (
+    "po_number",
+    "vendor_id",
+    "status",
+    "issue_date",
+    "acknowledgment_date",
+    "expected_delivery_date",
+    "actual_delivery_date",
+    "quality_rating",
+)
+
+
+# Date fields of the PurchaseOrder set by the status change to each status
+EVENT_DATE_FIELDS = {
+    "ISSUED": "issue_date",
+    "ACKNOWLEDGED": "acknowledgment_date",
+    "DELIVERED": "actual_delivery_date",
+}
+
+
+# Function to convert aware datetimes to microseconds since the epoch
+def _to_microseconds(dates):
+    return np.array(
+        [(date - EPOCH) // datetime.timedelta(microseconds=1) for date in dates],
+        dtype="<i8",
+    )
+
+
+# Function to get the cumulative sum of weighted events at every boundary
+def _cumulative_at(times, weights, boundaries):
+    # Sort the events by time
+    order = np.argsort(times, kind="stable")
+
+    # Get the running sums, starting with zero before the first event
+    sums = np.concatenate(([0.0], np.cumsum(weights[order], dtype="<f8")))
+
+    # Return the sum of the events at or before every boundary
+    return sums[np.searchsorted(times[order], boundaries, side="right")]
+
+
+# Function to get a rounded ratio, undefined where the denominator is zero
+def _ratio_at(numerator, denominator, scale):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.round(
+            np.where(denominator > 0, numerator * scale / denominator, np.nan), 4
+        )
+
+
+# Function to get the times of the status changes of the orders of the vendors
+def get_event_times(vendor_codes):
+    # Get the status changes in order, orders created in a later status carry
+    # their dates from the import, so only the changes of a stored order count
+    events = (
+        PurchaseOrderEvent.objects.filter(
+            vendor_id__in=vendor_codes,
+            from_status__isnull=False,
+            to_status__in=EVENT_DATE_FIELDS,
+        )
+        .order_by("timestamp", "id")
+        .values("purchase_order_id", "to_status", "timestamp")
+    )
+
+    # Keep the last change to every status, the one that set the date of the order
+    times = {}
+    for event in events.iterator():
+        times.setdefault(event["purchase_order_id"], {})[
+            EVENT_DATE_FIELDS[event["to_status"]]
+        ] = event["timestamp"]
+
+    # Return the times by order
+    return times
+
+
+# Function to get the times an order entered the counters, from its status changes
+# when they are logged, as the dates set by the changes are truncated to the day
+def get_order_times(order, event_times):
+    return {
+        field: event_times.get(field, order[field])
+        for field in EVENT_DATE_FIELDS.values()
+        if order[field] is not None
+    }
+
+
+# Function to get the metrics of a vendor at every boundary from its orders
+def get_backfill_metrics(orders, boundaries):
+    # Get the issued and the acknowledged orders
+    issued = [order for order in orders if order["issue_date"] is not None]
+    acknowledged = [
+        order for order in issued if order["acknowledgment_date"] is not None
+    ]
+
+    # Get the delivered orders with a known delivery date
+    delivered = [
+        order
+        for order in orders
+        if order["status"] == "DELIVERED" and order["actual_delivery_date"] is not None
+    ]
+    delivery_times = _to_microseconds(
+        [order["times"]["actual_delivery_date"] for order in delivered]
+    )
+
+    # Get the counters at every boundary
+    issued_count = _cumulative_at(
+        _to_microseconds([order["times"]["issue_date"] for order in issued]),
+        np.ones(len(issued)),
+        boundaries,
+    )
+    acknowledgment_times = _to_microseconds(
+        [order["times"]["acknowledgment_date"] for order in acknowledged]
+    )
+    acknowledged_count = _cumulative_at(
+        acknowledgment_times, np.ones(len(acknowledged)), boundaries
+    )
+    response_time_sum = _cumulative_at(
+        acknowledgment_times,
+        np.array(
+            [
+                (order["acknowledgment_date"] - order["issue_date"]).total_seconds()
+                / 3600
+                for order in acknowledged
+            ]
+        ),
+        boundaries,
+    )
+    delivered_count = _cumulative_at(
+        delivery_times, np.ones(len(delivered)), boundaries
+    )
+    on_time_count = _cumulative_at(
+        delivery_times,
+        np.array(
+            [
+                order["expected_delivery_date"] is not None
+                and order["actual_delivery_date"] <= order["expected_delivery_date"]
+                for order in delivered
+            ],
+            dtype="<f8",
+        ),
+        boundaries,
+    )
+    ratings = np.array([order["quality_rating"] for order in delivered], dtype="<f8")
+    rated_count = _cumulative_at(delivery_times, ~np.isnan(ratings), boundaries)
+    quality_rating_sum = _cumulative_at(
+        delivery_times, np.nan_to_num(ratings), boundaries
+    )
+
+    # Return the metrics derived from the counters like the metrics engine does
+    return {
+        "on_time_delivery_rate": _ratio_at(on_time_count, delivered_count, 100),
+        "quality_rating_avg": _ratio_at(quality_rating_sum, rated_count, 1),
+        "average_response_time": _ratio_at(response_time_sum, acknowledged_count, 1),
+        "fulfillment_rate": _ratio_at(delivered_count, issued_count, 100),
+    }
+
+
+# Function to get the boundaries between the first order event and a date
+def get_backfill_boundaries(orders, until):
+    # Get the times of all the order events
+    dates = [date for order in orders for date in order["times"].values()]
+
+    # If the vendor has no order events, or none before the date
+    if not dates or min(dates) >= until:
+        return []
+
+    # Return every snapshot boundary from the first event to the date
+    boundaries = []
+    boundary = floor_date(min(dates)) + SNAPSHOT_INTERVAL
+    while boundary < until:
+        boundaries.append(boundary)
+        boundary += SNAPSHOT_INTERVAL
+    return boundaries
+
+
+# Function to backfill the historical performance of a batch of vendors
+def backfill_vendors(vendor_codes, until):
+    # Get the first record of every vendor, the backfill stops at its day
+    first_records = dict(
+        HistoricalPerformance.objects.filter(vendor_id__in=vendor_codes)
+        .order_by("vendor_id", "date")
+        .distinct("vendor_id")
+        .values_list("vendor_id", "date")
+    )
+
+    # In the columnar storage, the first records may only be kept packed
+    if settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE:
+        for vendor_code, date in get_first_packed_dates(vendor_codes).items():
+            first_records[vendor_code] = min(first_records.get(vendor_code, date), date)
+
+    # Get the times of the status changes of the orders of the vendors
+    event_times = get_event_times(vendor_codes)
+
+    # Get the orders of the vendors in a single pass, ordered by vendor
+    orders = (
+        PurchaseOrder.objects.filter(vendor_id__in=vendor_codes)
+        .order_by("vendor_id")
+        .values(*ORDER_FIELDS)
+    )
+
+    # Traverse over the orders of every vendor
+    backfilled = {}
+    for vendor_code, vendor_orders in itertools.groupby(
+        orders.iterator(), key=lambda order: order["vendor_id"]
+    ):
+        # Get the times the orders entered the counters
+        vendor_orders = list(vendor_orders)
+        for order in vendor_orders:
+            order["times"] = get_order_times(
+                order, event_times.get(order["po_number"], {})
+            )
+
+        # Get the boundaries to backfill, up to the day of the first record
+        vendor_until = until
+        if vendor_code in first_records:
+            vendor_until = min(
+                until, get_period_start(first_records[vendor_code], "daily")
+            )
+        boundaries = get_backfill_boundaries(vendor_orders, vendor_until)
+
+        # If there is nothing to backfill
+        if not boundaries:
+            continue
+
+        # Get the metrics at every boundary
+        metrics = get_backfill_metrics(vendor_orders, _to_microseconds(boundaries))
+
+        # Build a record for every boundary with a defined metric
+        records = [
+            HistoricalPerformance(
+                vendor_id=vendor_code,
+                date=boundary,
+                **{
+                    field: None if np.isnan(values[index]) else float(values[index])
+                    for field, values in metrics.items()
+                },
+            )
+            for index, boundary in enumerate(boundaries)
+            if not all(np.isnan(metrics[field][index]) for field in METRIC_FIELDS)
+        ]
+
+        # Set the ids of the records, unique across the partitions of their months
+        ids = generate_historical_performance_ids([record.date for record in records])
+        for record, record_id in zip(records, ids):
+            record.id = record_id
+
+        # Insert the records, into the partitions of their months
+        create_partitions(boundaries[0], boundaries[-1])
+        HistoricalPerformance.objects.bulk_create(records, batch_size=5000)
+
+        # Save the backfilled range and number of records of the vendor
+        backfilled[vendor_code] = (boundaries[0], boundaries[-1], len(records))
+
+    # Return the backfilled range and number of records of every vendor
+    return backfilled
+
+
+# Function to fold the backfilled days into the rollups
+def downsample_range(start, end, batch_size=1000):
+    # Traverse over the days of the range
+    downsampled = 0
+    day_start = get_period_start(start, "daily")
+    while day_start <= end:
+        downsampled += downsample_day(day_start, batch_size=batch_size)
+        day_start = get_next_day_start(day_start)
+
+    # Return the number of records folded into the rollups
+    return downsampled
@@ -0,0 +1,253 @@
+# Imports
+import datetime
+import itertools
+
+import numpy as np
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+    MonthlyPerformanceSeries,
+)
+from vendor_management_system.historical_performances.partitions import (
+    drop_partition,
+    get_month_range,
+    get_next_month,
+    get_partition_months,
+)
+from vendor_management_system.historical_performances.snapshots import EPOCH
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+from vendor_management_system.vendors.models import Vendor
+
+
+# Packed fields of the monthly series
+SERIES_FIELDS = ("timestamps", *METRIC_FIELDS)
+
+
+# Function to pack the date ordered records of a vendor month
+def pack_series(records):
+    return {
+        "point_count": len(records),
+        "timestamps": np.array(
+            [
+                (record["date"] - EPOCH) // datetime.timedelta(microseconds=1)
+                for record in records
+            ],
+            dtype="<i8",
+        ).tobytes(),
+        **{
+            field: np.array(
+                [record[field] for record in records], dtype="<f8"
+            ).tobytes()
+            for field in METRIC_FIELDS
+        },
+    }
+
+
+# Function to unpack a monthly series into NumPy arrays
+def unpack_series(series):
+    return {
+        "date": np.frombuffer(bytes(series.timestamps), dtype="<i8").view(
+            "datetime64[us]"
+        ),
+        **{
+            field: np.frombuffer(bytes(getattr(series, field)), dtype="<f8")
+            for field in METRIC_FIELDS
+        },
+    }
+
+
+# Function to compact the records of a month into one series per vendor, dropping
+# the partition of the records once the month is compacted if requested
+def compact_month(month, batch_size=1000, drop_records=False):
+    # Get the range of the month
+    start, end = get_month_range(month)
+
+    # Get the vendor codes ordered by vendor code
+    vendor_codes = Vendor.objects.order_by("vendor_code").values_list(
+        "vendor_code", flat=True
+    )
+
+    # Compact the vendors batch by batch using the vendor code as a keyset
+    compacted = 0
+    last_vendor_code = None
+    while True:
+        # Get the next batch of vendor codes
+        batch_codes = vendor_codes
+        if last_vendor_code is not None:
+            batch_codes = batch_codes.filter(vendor_code__gt=last_vendor_code)
+        batch = list(batch_codes[:batch_size])
+
+        # If there are no more vendors
+        if not batch:
+            break
+
+        # Continue after the last vendor of the batch
+        last_vendor_code = batch[-1]
+
+        # Get the records of the batch for the month, using the (vendor, date) index
+        records = (
+            HistoricalPerformance.objects.filter(
+                vendor_id__in=batch, date__gte=start, date__lt=end
+            )
+            .order_by("vendor_id", "date")
+            .values("vendor_id", "date", *METRIC_FIELDS)
+        )
+
+        # Pack the records of every vendor
+        series = [
+            MonthlyPerformanceSeries(
+                vendor_id=vendor_code, month=month, **pack_series(list(group))
+            )
+            for vendor_code, group in itertools.groupby(
+                records, key=lambda record: record["vendor_id"]
+            )
+        ]
+
+        # Write the series, replacing the ones of a previous compaction
+        MonthlyPerformanceSeries.objects.bulk_create(
+            series,
+            update_conflicts=True,
+            unique_fields=["vendor", "month"],
+            update_fields=["point_count", *SERIES_FIELDS],
+        )
+        compacted += len(series)
+
+    # Drop the records of the month, the packed series replace them
+    if drop_records and month in get_partition_months():
+        drop_partition(month)
+
+    # Return the number of vendor series
+    return compacted
+
+
+# Function to get the date of the first packed point of every vendor
+def get_first_packed_dates(vendor_codes):
+    return {
+        series.vendor_id: EPOCH
+        + datetime.timedelta(
+            microseconds=int(np.frombuffer(bytes(series.timestamps), dtype="<i8")[0])
+        )
+        for series in MonthlyPerformanceSeries.objects.filter(
+            vendor_id__in=vendor_codes, point_count__gt=0
+        )
+        .order_by("vendor_id", "month")
+        .distinct("vendor_id")
+        .only("vendor_id", "timestamps")
+    }
+
+
+# Function to convert an aware datetime to a naive UTC datetime
+def _to_naive_utc(date):
+    return date.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+# Function to read the series of a vendor over a range as NumPy arrays
+def get_series_arrays(vendor_code, start, end):
+    # Get the months overlapping the range
+    month = timezone.localtime(start).date().replace(day=1)
+    last_month = timezone.localtime(end).date().replace(day=1)
+    months = []
+    while month <= last_month:
+        months.append(month)
+        month = get_next_month(month)
+
+    # Get the packed series of the months
+    packed = {
+        series.month: series
+        for series in MonthlyPerformanceSeries.objects.filter(
+            vendor_id=vendor_code, month__in=months
+        )
+    }
+
+    # Unpack the series, reading the months not compacted yet from the records
+    parts = []
+    for month in months:
+        # If the month is compacted
+        if month in packed:
+            parts.append(unpack_series(packed[month]))
+            continue
+
+        # Otherwise pack the records of the month on the fly
+        month_start, month_end = get_month_range(month)
+        records = list(
+            HistoricalPerformance.objects.filter(
+                vendor_id=vendor_code, date__gte=month_start, date__lt=month_end
+            )
+            .order_by("date")
+            .values("date", *METRIC_FIELDS)
+        )
+        parts.append(unpack_series(MonthlyPerformanceSeries(**pack_series(records))))
+
+    # Concatenate the months
+    arrays = {
+        field: np.concatenate([part[field] for part in parts])
+        for field in ("date", *METRIC_FIELDS)
+    }
+
+    # Return the points within the range
+    mask = (arrays["date"] >= np.datetime64(_to_naive_utc(start), "us")) & (
+        arrays["date"] <= np.datetime64(_to_naive_utc(end), "us")
+    )
+    return {field: values[mask] for field, values in arrays.items()}
+
+
+# Function to convert the points of NumPy arrays to records, oldest first
+def _to_records(arrays):
+    return [
+        {
+            "date": EPOCH + datetime.timedelta(microseconds=int(timestamp)),
+            **{
+                field: None if np.isnan(value) else float(value)
+                for field, value in zip(METRIC_FIELDS, values)
+            },
+        }
+        for timestamp, *values in zip(
+            arrays["date"].astype("<i8"),
+            *(arrays[field] for field in METRIC_FIELDS),
+        )
+    ]
+
+
+# Function to get the records of a vendor over a range from the series, oldest first
+def get_series_points(vendor_code, start, end):
+    return _to_records(get_series_arrays(vendor_code, start, end))
+
+
+# Function to get the latest record of a vendor before a date from the series
+def get_latest_point(vendor_code, before):
+    # Get the latest record of the months not compacted yet
+    latest = (
+        HistoricalPerformance.objects.filter(vendor_id=vendor_code, date__lt=before)
+        .order_by("-date")
+        .values("date", *METRIC_FIELDS)
+        .first()
+    )
+
+    # Traverse over the packed series up to the month of the date, latest first
+    for series in (
+        MonthlyPerformanceSeries.objects.filter(
+            vendor_id=vendor_code, month__lte=timezone.localtime(before).date()
+        )
+        .order_by("-month")
+        .iterator()
+    ):
+        # If the latest record is after the month, the older months are too
+        if latest is not None and latest["date"] >= get_month_range(series.month)[1]:
+            break
+
+        # Get the points of the month before the date
+        arrays = unpack_series(series)
+        mask = arrays["date"] < np.datetime64(_to_naive_utc(before), "us")
+
+        # If the month has a point before the date, the latest one is the last one
+        if mask.any():
+            point = _to_records(
+                {field: values[mask] for field, values in arrays.items()}
+            )[-1]
+            if latest is None or point["date"] > latest["date"]:
+                latest = point
+            break
+
+    # Return the latest record
+    return latest
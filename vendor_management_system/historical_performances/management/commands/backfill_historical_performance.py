@@ -0,0 +1,87 @@
+# Imports
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.backfill import (
+    backfill_vendors,
+    downsample_range,
+)
+from vendor_management_system.historical_performances.series import floor_date
+from vendor_management_system.vendors.models import Vendor
+
+
+# Command to backfill the historical performance from the purchase orders
+class Command(BaseCommand):
+    help = "Rebuild the historical performance before the first snapshot of vendors"
+
+    # Method to add the command arguments
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            dest="vendor_codes",
+            help="Vendor code to backfill, can be given multiple times",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of vendors whose orders are read per query",
+        )
+
+    # Method to handle the command
+    def handle(self, *args, **options):
+        # Get the start time and the date the backfill runs up to
+        start = time.monotonic()
+        until = floor_date(timezone.now())
+
+        # Get the vendor codes ordered by vendor code
+        vendor_codes = Vendor.objects.order_by("vendor_code").values_list(
+            "vendor_code", flat=True
+        )
+        if options["vendor_codes"] is not None:
+            vendor_codes = vendor_codes.filter(vendor_code__in=options["vendor_codes"])
+
+        # Backfill the vendors batch by batch using the vendor code as a keyset
+        backfilled = {}
+        last_vendor_code = None
+        while True:
+            # Get the next batch of vendor codes
+            batch_codes = vendor_codes
+            if last_vendor_code is not None:
+                batch_codes = batch_codes.filter(vendor_code__gt=last_vendor_code)
+            batch = list(batch_codes[: options["batch_size"]])
+
+            # If there are no more vendors
+            if not batch:
+                break
+
+            # Backfill the batch
+            backfilled.update(backfill_vendors(batch, until))
+            last_vendor_code = batch[-1]
+
+            # Report the progress
+            self.stdout.write(f"Backfilled {len(backfilled)} vendors up to {batch[-1]}")
+
+        # If nothing was backfilled
+        if not backfilled:
+            self.stdout.write(self.style.SUCCESS("Nothing to backfill."))
+            return
+
+        # Fold the backfilled days into the rollups
+        downsample_range(
+            min(first for first, _, _ in backfilled.values()),
+            max(last for _, last, _ in backfilled.values()),
+        )
+
+        # Report the result
+        duration = time.monotonic() - start
+        recorded = sum(count for _, _, count in backfilled.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfilled {recorded} records of {len(backfilled)} vendors "
+                f"in {duration:.2f}s."
+            )
+        )
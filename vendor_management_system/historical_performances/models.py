@@ -1,13 +1,70 @@
 # Imports
-import uuid
+import datetime
+import string
 
+from django.contrib.postgres.indexes import BrinIndex
 from django.core import validators
-from django.db import models
+from django.db import connection, models
 
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+# Alphabet of the HistoricalPerformance record IDs, in the order of their collation
+ID_ALPHABET = string.digits + string.ascii_uppercase
+
+
+# Sequence numbering the HistoricalPerformance records
+ID_SEQUENCE = "historical_performances_id_seq"
+
+
+# Function to encode a number in base 36 on a fixed width
+def encode_base36(number, width):
+    digits = []
+    for _ in range(width):
+        number, digit = divmod(number, len(ID_ALPHABET))
+        digits.append(ID_ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+# Function to get the code of the month of a date, the prefix of the IDs of its
+# records, the codes sort as the months
+def get_month_code(date):
+    # Get the local date of an aware datetime
+    if isinstance(date, datetime.datetime) and timezone.is_aware(date):
+        date = timezone.localtime(date)
+
+    # Return the number of months since 2000 in base 36
+    return encode_base36((date.year - 2000) * 12 + date.month - 1, 2)
+
+
+# Function to generate the IDs of new HistoricalPerformance records from their dates,
+# the code of the month followed by a sequence number, so an ID is unique and
+# belongs to the monthly partition of its record
+def generate_historical_performance_ids(dates):
+    # If there are no records
+    if not dates:
+        return []
+
+    # Get a sequence number for every record
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)", [ID_SEQUENCE, len(dates)]
+        )
+        numbers = [number for (number,) in cursor.fetchall()]
+
+    # Return the IDs
+    return [
+        get_month_code(date) + encode_base36(number, 8)
+        for date, number in zip(dates, numbers)
+    ]
+
+
+# Function to generate the ID of a new HistoricalPerformance record from its date
+def generate_historical_performance_id(date):
+    return generate_historical_performance_ids([date])[0]
+
+
 # Model for HistoricalPerformance
 class HistoricalPerformance(models.Model):
     # Fields
@@ -17,6 +74,7 @@ class HistoricalPerformance(models.Model):
         unique=True,
         primary_key=True,
         editable=False,
+        db_collation="C",
         help_text=_("Unique ID for Historical Performance Record"),
         validators=[
             validators.RegexValidator(
@@ -30,6 +88,7 @@ class HistoricalPerformance(models.Model):
         on_delete=models.CASCADE,
         verbose_name=_("Vendor"),
         help_text=_("Vendor associated with Purchase Order"),
+        db_index=False,
     )
     date = models.DateTimeField(
         _("Date"),
@@ -70,6 +129,10 @@ class HistoricalPerformance(models.Model):
         verbose_name = _("Historical Performance")
         verbose_name_plural = _("Historical Performances")
         ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["vendor", "date"], name="hist_perf_vendor_date_idx"),
+            BrinIndex(fields=["date"], name="hist_perf_date_brin"),
+        ]
 
     # String representation
     def __str__(self):
@@ -80,7 +143,141 @@ class HistoricalPerformance(models.Model):
         # If id is not specified
         if not self.id:
             # Generate a new id
-            self.id = str(uuid.uuid4()).replace("-", "")[:10].upper()
+            self.id = generate_historical_performance_id(self.date)
 
         # Save the model
         super(HistoricalPerformance, self).save(*args, **kwargs)
+
+
+# Function to create a field of a performance rollup
+def _rollup_field(verbose_name):
+    return models.FloatField(
+        _(verbose_name), help_text=_(verbose_name), null=True, blank=True
+    )
+
+
+# Function to create a sample count field of a performance rollup
+def _rollup_count_field(verbose_name):
+    return models.PositiveIntegerField(
+        _(verbose_name), help_text=_(verbose_name), default=0
+    )
+
+
+# Abstract model for the HistoricalPerformance rollups
+class PerformanceRollup(models.Model):
+    # Fields
+    vendor = models.ForeignKey(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor associated with the rollup"),
+        db_index=False,
+    )
+    period_start = models.DateTimeField(
+        _("Period Start"), help_text=_("Start of the rollup period")
+    )
+    on_time_delivery_rate_min = _rollup_field("Minimum On-time Delivery Rate")
+    on_time_delivery_rate_max = _rollup_field("Maximum On-time Delivery Rate")
+    on_time_delivery_rate_mean = _rollup_field("Mean On-time Delivery Rate")
+    on_time_delivery_rate_last = _rollup_field("Last On-time Delivery Rate")
+    on_time_delivery_rate_count = _rollup_count_field("On-time Delivery Rate Samples")
+    quality_rating_avg_min = _rollup_field("Minimum Quality Rating Average")
+    quality_rating_avg_max = _rollup_field("Maximum Quality Rating Average")
+    quality_rating_avg_mean = _rollup_field("Mean Quality Rating Average")
+    quality_rating_avg_last = _rollup_field("Last Quality Rating Average")
+    quality_rating_avg_count = _rollup_count_field("Quality Rating Average Samples")
+    average_response_time_min = _rollup_field("Minimum Average Response Time")
+    average_response_time_max = _rollup_field("Maximum Average Response Time")
+    average_response_time_mean = _rollup_field("Mean Average Response Time")
+    average_response_time_last = _rollup_field("Last Average Response Time")
+    average_response_time_count = _rollup_count_field("Average Response Time Samples")
+    fulfillment_rate_min = _rollup_field("Minimum Fulfillment Rate")
+    fulfillment_rate_max = _rollup_field("Maximum Fulfillment Rate")
+    fulfillment_rate_mean = _rollup_field("Mean Fulfillment Rate")
+    fulfillment_rate_last = _rollup_field("Last Fulfillment Rate")
+    fulfillment_rate_count = _rollup_count_field("Fulfillment Rate Samples")
+
+    # Metadata
+    class Meta:
+        abstract = True
+        ordering = ["-period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "period_start"],
+                name="%(app_label)s_%(class)s_vendor_period_unique",
+            ),
+        ]
+
+    # String representation
+    def __str__(self):
+        return f"{self.vendor} - {self.period_start}"
+
+
+# Model for the daily HistoricalPerformance rollup
+class DailyPerformanceRollup(PerformanceRollup):
+    # Metadata
+    class Meta(PerformanceRollup.Meta):
+        verbose_name = _("Daily Performance Rollup")
+        verbose_name_plural = _("Daily Performance Rollups")
+
+
+# Model for the weekly HistoricalPerformance rollup
+class WeeklyPerformanceRollup(PerformanceRollup):
+    # Metadata
+    class Meta(PerformanceRollup.Meta):
+        verbose_name = _("Weekly Performance Rollup")
+        verbose_name_plural = _("Weekly Performance Rollups")
+
+
+# Model for the monthly HistoricalPerformance rollup
+class MonthlyPerformanceRollup(PerformanceRollup):
+    # Metadata
+    class Meta(PerformanceRollup.Meta):
+        verbose_name = _("Monthly Performance Rollup")
+        verbose_name_plural = _("Monthly Performance Rollups")
+
+
+# Model for the packed monthly HistoricalPerformance series of a vendor
+class MonthlyPerformanceSeries(models.Model):
+    # Fields
+    vendor = models.ForeignKey(
+        "vendors.Vendor",
+        on_delete=models.CASCADE,
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor associated with the series"),
+        db_index=False,
+    )
+    month = models.DateField(_("Month"), help_text=_("First day of the month"))
+    point_count = models.PositiveIntegerField(
+        _("Point Count"), help_text=_("Number of points in the series"), default=0
+    )
+    timestamps = models.BinaryField(
+        _("Timestamps"), help_text=_("Packed int64 microseconds since the epoch")
+    )
+    on_time_delivery_rate = models.BinaryField(
+        _("On-time Delivery Rate"), help_text=_("Packed float64 values")
+    )
+    quality_rating_avg = models.BinaryField(
+        _("Quality Rating Average"), help_text=_("Packed float64 values")
+    )
+    average_response_time = models.BinaryField(
+        _("Average Response Time"), help_text=_("Packed float64 values")
+    )
+    fulfillment_rate = models.BinaryField(
+        _("Fulfillment Rate"), help_text=_("Packed float64 values")
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Monthly Performance Series")
+        verbose_name_plural = _("Monthly Performance Series")
+        ordering = ["-month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "month"], name="monthly_series_vendor_month_unique"
+            ),
+        ]
+
+    # String representation
+    def __str__(self):
+        return f"{self.vendor} - {self.month:%Y-%m}"
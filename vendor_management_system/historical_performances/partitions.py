@@ -0,0 +1,262 @@
+# Imports
+import datetime
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    ID_ALPHABET,
+    ID_SEQUENCE,
+    HistoricalPerformance,
+    get_month_code,
+)
+
+
+# Table of the HistoricalPerformance records, partitioned by month on the month code
+# prefixing their IDs, so the primary key on the ID alone stays unique
+TABLE = HistoricalPerformance._meta.db_table
+
+
+# Partition of the records whose ID has no month code, such as the IDs set by hand
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+# Pattern of the name of a monthly partition
+PARTITION_NAME = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+# Function to get the first day of the month following a month
+def get_next_month(month):
+    return (month.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+
+
+# Function to get the aware datetime range of a month
+def get_month_range(month):
+    return (
+        timezone.make_aware(datetime.datetime.combine(month, datetime.time())),
+        timezone.make_aware(
+            datetime.datetime.combine(get_next_month(month), datetime.time())
+        ),
+    )
+
+
+# Function to get the name of the partition of a month
+def get_partition_name(month):
+    return f"{TABLE}_y{month:%Y}m{month:%m}"
+
+
+# Function to check if the HistoricalPerformance table is partitioned
+def is_partitioned():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE]
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+# Function to get the months of the existing partitions, oldest first
+def get_partition_months():
+    # Get the names of the partitions of the table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    # Return the months of the partitions
+    return sorted(
+        datetime.date(int(match[1]), int(match[2]), 1)
+        for match in map(PARTITION_NAME.match, names)
+        if match is not None
+    )
+
+
+# Function to create the partition of a month, over the IDs of its month code
+def create_partition(month):
+    # Get the names and the ID range of the partition
+    table = connection.ops.quote_name(TABLE)
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    name = connection.ops.quote_name(get_partition_name(month))
+    id_range = [get_month_code(month), get_month_code(get_next_month(month))]
+
+    # Create the partition, moving the records of its range out of the default
+    # partition, a partition cannot be created over them
+    with transaction.atomic(), connection.cursor() as cursor:
+        # If the default partition has no record of the range, create the partition
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {default} WHERE id >= %s AND id < %s)",
+            id_range,
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                id_range,
+            )
+            return
+
+        # Detach the default partition, create the partition and move the records
+        cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+            id_range,
+        )
+        cursor.execute(
+            f"INSERT INTO {table} SELECT * FROM {default} WHERE id >= %s AND id < %s",
+            id_range,
+        )
+        cursor.execute(f"DELETE FROM {default} WHERE id >= %s AND id < %s", id_range)
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+
+
+# Function to create the missing partitions of the months between two dates
+def create_partitions(start, end):
+    # Get the first and the last month
+    month = timezone.localtime(start).date().replace(day=1)
+    last_month = timezone.localtime(end).date().replace(day=1)
+
+    # Create the partitions of the months that do not have one yet
+    existing = set(get_partition_months())
+    created = 0
+    while month <= last_month:
+        # If the month has no partition
+        if month not in existing:
+            create_partition(month)
+            created += 1
+
+        # Move to the next month
+        month = get_next_month(month)
+
+    # Return the number of partitions created
+    return created
+
+
+# Function to drop the partition of a month, in constant time whatever its size
+def drop_partition(month):
+    # Get the name of the partition
+    name = connection.ops.quote_name(get_partition_name(month))
+
+    # Detach and drop the partition
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {connection.ops.quote_name(TABLE)} DETACH PARTITION {name}"
+        )
+        cursor.execute(f"DROP TABLE {name}")
+
+
+# Function to drop the partitions of the months ending before a date
+def drop_partitions(before):
+    # Traverse over the partitions, oldest first
+    dropped = 0
+    for month in get_partition_months():
+        # If the month ends after the date, the newer months do too
+        if get_month_range(month)[1] > before:
+            break
+
+        # Drop the partition
+        drop_partition(month)
+        dropped += 1
+
+    # Return the number of partitions dropped
+    return dropped
+
+
+# Function to create the sequence numbering the HistoricalPerformance records
+def create_id_sequence():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE SEQUENCE IF NOT EXISTS {connection.ops.quote_name(ID_SEQUENCE)}"
+        )
+
+
+# Function to get the SQL expression of a number in base 36 on a fixed width, as
+# encoded by encode_base36
+def _get_base36_sql(number, width):
+    return " || ".join(
+        f"substr('{ID_ALPHABET}', (({number}) / {36 ** power} %% 36)::int + 1, 1)"
+        for power in reversed(range(width))
+    )
+
+
+# Function to convert the HistoricalPerformance table to monthly range partitions
+def partition_table():
+    # If the table is already partitioned or is not created yet
+    if is_partitioned() or TABLE not in connection.introspection.table_names():
+        return False
+
+    # Replace the table by a partitioned copy in a single transaction
+    table = connection.ops.quote_name(TABLE)
+    old_table = connection.ops.quote_name(f"{TABLE}_old")
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Get the range of the existing records
+            cursor.execute(f"SELECT MIN(date), MAX(date) FROM {table}")
+            first, last = cursor.fetchone()
+
+            # Get the foreign keys of the table, to add them back under the same names
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+                [TABLE],
+            )
+            foreign_keys = cursor.fetchall()
+
+            # Create the partitioned table with the columns of the table, and the
+            # default partition
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS) "
+                f"PARTITION BY RANGE (id)"
+            )
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(DEFAULT_PARTITION)} "
+                f"PARTITION OF {table} DEFAULT"
+            )
+
+            # Copy the records month by month, with new IDs prefixed by the code of
+            # their month
+            columns = ", ".join(
+                connection.ops.quote_name(field.column)
+                for field in HistoricalPerformance._meta.concrete_fields
+                if not field.primary_key
+            )
+            month = None if first is None else timezone.localtime(first).date()
+            while month is not None and month <= timezone.localtime(last).date():
+                # Create the partition of the month
+                month = month.replace(day=1)
+                create_partition(month)
+
+                # Copy the records of the month
+                month_start, month_end = get_month_range(month)
+                cursor.execute(
+                    f"INSERT INTO {table} (id, {columns}) "
+                    f"SELECT %s || {_get_base36_sql('number', 8)}, {columns} "
+                    f"FROM (SELECT nextval(%s) AS number, * FROM {old_table} "
+                    f"WHERE date >= %s AND date < %s) AS records",
+                    [get_month_code(month), ID_SEQUENCE, month_start, month_end],
+                )
+
+                # Move to the next month
+                month = get_next_month(month)
+            cursor.execute(f"DROP TABLE {old_table}")
+
+            # Add the primary key and the foreign keys
+            cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+            for name, definition in foreign_keys:
+                cursor.execute(
+                    f"ALTER TABLE {table} "
+                    f"ADD CONSTRAINT {connection.ops.quote_name(name)} {definition}"
+                )
+
+        # Create the indexes of the model on the partitioned table
+        with connection.schema_editor() as schema_editor:
+            for index in HistoricalPerformance._meta.indexes:
+                schema_editor.add_index(HistoricalPerformance, index)
+
+    # Return that the table was converted
+    return True
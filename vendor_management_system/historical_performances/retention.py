@@ -0,0 +1,113 @@
+# Imports
+import datetime
+import itertools
+
+from django.db import transaction
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+)
+from vendor_management_system.historical_performances.partitions import (
+    drop_partitions,
+)
+from vendor_management_system.historical_performances.rollups import (
+    get_period_start,
+    update_rollups,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Function to get the start of the day following a day
+def get_next_day_start(day_start):
+    return timezone.make_aware(
+        datetime.datetime.combine(
+            timezone.localtime(day_start).date() + datetime.timedelta(days=1),
+            datetime.time(),
+        )
+    )
+
+
+# Function to fold the records of a day that are missing from the rollups
+def downsample_day(day_start, batch_size=1000):
+    # Get the end of the day
+    day_end = get_next_day_start(day_start)
+
+    # Get the records of the day, a daily rollup means the day is already folded
+    records = (
+        HistoricalPerformance.objects.filter(date__gte=day_start, date__lt=day_end)
+        .exclude(
+            vendor_id__in=DailyPerformanceRollup.objects.filter(
+                period_start=day_start
+            ).values("vendor_id")
+        )
+        .order_by("date", "vendor_id")
+        .values("vendor_id", "date", *METRIC_FIELDS)
+    )
+
+    # Fold the records into the rollups snapshot by snapshot, in date order
+    downsampled = 0
+    with transaction.atomic():
+        for date, snapshot in itertools.groupby(
+            records.iterator(chunk_size=batch_size), key=lambda record: record["date"]
+        ):
+            # Traverse over the vendors of the snapshot in batches
+            while True:
+                # Get the next batch of the snapshot
+                batch = list(itertools.islice(snapshot, batch_size))
+                if not batch:
+                    break
+
+                # Fold the batch into the rollups
+                update_rollups(
+                    [
+                        {"vendor_code": record["vendor_id"], **record}
+                        for record in batch
+                    ],
+                    date,
+                )
+                downsampled += len(batch)
+
+    # Return the number of records folded into the rollups
+    return downsampled
+
+
+# Function to get the start of the first month kept by the retention period, the
+# months are dropped whole
+def get_retention_cutoff(retention):
+    return get_period_start(timezone.now() - retention, "monthly")
+
+
+# Function to expire the records older than the retention period
+def expire_records(retention, batch_size=1000):
+    # Get the start of the first month to keep
+    cutoff = get_retention_cutoff(retention)
+
+    # Fold the days of the expired months into the rollups, day by day
+    downsampled = 0
+    day_start = None
+    while True:
+        # Get the date of the oldest record to expire after the folded days
+        records = HistoricalPerformance.objects.filter(date__lt=cutoff)
+        if day_start is not None:
+            records = records.filter(date__gte=get_next_day_start(day_start))
+        oldest = records.order_by("date").values_list("date", flat=True).first()
+
+        # If every expired day is folded
+        if oldest is None:
+            break
+
+        # Fold the day into the rollups
+        day_start = get_period_start(oldest, "daily")
+        downsampled += downsample_day(day_start, batch_size=batch_size)
+
+    # Drop the partitions of the expired months
+    dropped = drop_partitions(cutoff)
+
+    # Delete the expired records left in the default partition, the records whose ID
+    # has no month code or whose month has no partition
+    HistoricalPerformance.objects.filter(date__lt=cutoff).delete()
+
+    # Return the number of records folded and of partitions dropped
+    return downsampled, dropped
@@ -0,0 +1,103 @@
+# Imports
+import datetime
+
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    MonthlyPerformanceRollup,
+    WeeklyPerformanceRollup,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Rollup models and their nominal period length, from the finest to the coarsest
+ROLLUPS = {
+    "daily": (DailyPerformanceRollup, datetime.timedelta(days=1)),
+    "weekly": (WeeklyPerformanceRollup, datetime.timedelta(days=7)),
+    "monthly": (MonthlyPerformanceRollup, datetime.timedelta(days=30.44)),
+}
+
+
+# Statistics kept per metric in the rollups
+ROLLUP_STATISTICS = ("min", "max", "mean", "last", "count")
+
+
+# Fields of the rollups holding the statistics of the metrics
+ROLLUP_FIELDS = tuple(
+    f"{field}_{statistic}" for field in METRIC_FIELDS for statistic in ROLLUP_STATISTICS
+)
+
+
+# Function to get the start of the rollup period containing a date
+def get_period_start(date, resolution):
+    # Get the day of the date in the current timezone
+    day = timezone.localtime(date).date()
+
+    # Move back to the first day of the week or the month
+    if resolution == "weekly":
+        day -= datetime.timedelta(days=day.weekday())
+    elif resolution == "monthly":
+        day = day.replace(day=1)
+
+    # Return the midnight of the day
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+
+
+# Function to add a sample of the vendor metrics to a rollup
+def add_rollup_sample(rollup, metrics):
+    # Traverse over the metrics
+    for field in METRIC_FIELDS:
+        # If the metric is not defined, there is no sample
+        value = metrics[field]
+        if value is None:
+            continue
+
+        # Get the current statistics of the metric
+        count = getattr(rollup, f"{field}_count")
+        mean = getattr(rollup, f"{field}_mean")
+        minimum = getattr(rollup, f"{field}_min")
+        maximum = getattr(rollup, f"{field}_max")
+
+        # Update the statistics with the sample
+        setattr(rollup, f"{field}_min", value if count == 0 else min(minimum, value))
+        setattr(rollup, f"{field}_max", value if count == 0 else max(maximum, value))
+        setattr(
+            rollup,
+            f"{field}_mean",
+            value if count == 0 else mean + (value - mean) / (count + 1),
+        )
+        setattr(rollup, f"{field}_last", value)
+        setattr(rollup, f"{field}_count", count + 1)
+
+
+# Function to add a snapshot of a batch of vendors to every rollup
+def update_rollups(vendors, date):
+    # Get the vendor codes of the batch
+    vendor_codes = [vendor["vendor_code"] for vendor in vendors]
+
+    # Traverse over the resolutions
+    for resolution, (model, _) in ROLLUPS.items():
+        # Get the existing rollups of the period
+        period_start = get_period_start(date, resolution)
+        rollups = {
+            rollup.vendor_id: rollup
+            for rollup in model.objects.filter(
+                vendor_id__in=vendor_codes, period_start=period_start
+            )
+        }
+
+        # Add the sample of every vendor, creating the missing rollups
+        created = []
+        for vendor in vendors:
+            rollup = rollups.get(vendor["vendor_code"])
+            if rollup is None:
+                rollup = model(
+                    vendor_id=vendor["vendor_code"], period_start=period_start
+                )
+                created.append(rollup)
+            add_rollup_sample(rollup, vendor)
+
+        # Write the rollups with one insert and one update
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(list(rollups.values()), ROLLUP_FIELDS)
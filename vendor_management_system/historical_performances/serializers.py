@@ -1,9 +1,14 @@
 # Imports
+from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 
 from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
     HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    WeeklyPerformanceRollup,
 )
+from vendor_management_system.historical_performances.rollups import ROLLUP_FIELDS
 from vendor_management_system.vendors.models import Vendor
 
 
@@ -32,3 +37,78 @@ class HistoricalPerformanceSerializer(ModelSerializer):
             "average_response_time",
             "fulfillment_rate",
         ]
+
+
+# Serializer for a point of the dense HistoricalPerformance series
+class HistoricalPerformancePointSerializer(serializers.Serializer):
+    date = serializers.DateTimeField()
+    on_time_delivery_rate = serializers.FloatField(allow_null=True)
+    quality_rating_avg = serializers.FloatField(allow_null=True)
+    average_response_time = serializers.FloatField(allow_null=True)
+    fulfillment_rate = serializers.FloatField(allow_null=True)
+
+
+# Serializer for the daily HistoricalPerformance rollup
+class DailyPerformanceRollupSerializer(ModelSerializer):
+    class Meta:
+        model = DailyPerformanceRollup
+        fields = ["period_start", *ROLLUP_FIELDS]
+
+
+# Serializer for the weekly HistoricalPerformance rollup
+class WeeklyPerformanceRollupSerializer(ModelSerializer):
+    class Meta:
+        model = WeeklyPerformanceRollup
+        fields = ["period_start", *ROLLUP_FIELDS]
+
+
+# Serializer for the monthly HistoricalPerformance rollup
+class MonthlyPerformanceRollupSerializer(ModelSerializer):
+    class Meta:
+        model = MonthlyPerformanceRollup
+        fields = ["period_start", *ROLLUP_FIELDS]
+
+
+# Serializer for the HistoricalPerformance range query parameters
+class HistoricalPerformanceQuerySerializer(serializers.Serializer):
+    # Method to get the fields, "from" cannot be declared as an attribute
+    def get_fields(self):
+        return {
+            "from": serializers.DateTimeField(required=False),
+            "to": serializers.DateTimeField(required=False),
+            "resolution": serializers.ChoiceField(
+                choices=["raw", "daily", "weekly", "monthly"],
+                required=False,
+            ),
+            "max_points": serializers.IntegerField(
+                min_value=1, max_value=5000, required=False, default=500
+            ),
+        }
+
+    # Method to validate the range
+    def validate(self, attrs):
+        # If the range ends before it starts
+        if "from" in attrs and "to" in attrs and attrs["from"] > attrs["to"]:
+            raise serializers.ValidationError("'from' must not be after 'to'")
+
+        # Return the validated data
+        return attrs
+
+
+# Serializer for the HistoricalPerformance analytics query parameters
+class HistoricalPerformanceAnalyticsQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(
+        min_value=2, max_value=366, default=90, help_text="Number of days analyzed"
+    )
+    window = serializers.IntegerField(
+        min_value=1, max_value=366, default=7, help_text="Days of the rolling mean"
+    )
+    alpha = serializers.FloatField(
+        min_value=0.01, max_value=1, default=0.3, help_text="Smoothing of the EWMA"
+    )
+    threshold = serializers.FloatField(
+        min_value=0, default=3.0, help_text="Z-score flagging an anomaly"
+    )
+    limit = serializers.IntegerField(
+        min_value=1, default=50, help_text="Number of vendors in the ranking"
+    )
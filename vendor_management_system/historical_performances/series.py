@@ -0,0 +1,161 @@
+# Imports
+import datetime
+
+from django.conf import settings
+
+from vendor_management_system.historical_performances.columnar import (
+    get_latest_point,
+    get_series_points,
+)
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+)
+from vendor_management_system.historical_performances.retention import (
+    get_retention_cutoff,
+)
+from vendor_management_system.historical_performances.rollups import (
+    ROLLUP_FIELDS,
+    ROLLUPS,
+    get_period_start,
+)
+from vendor_management_system.historical_performances.snapshots import (
+    EPOCH,
+    SNAPSHOT_INTERVAL,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Function to floor a date to the start of its interval
+def floor_date(date, interval=SNAPSHOT_INTERVAL):
+    return EPOCH + ((date - EPOCH) // interval) * interval
+
+
+# Function to get a dense series of a vendor by carrying the last record forward
+def get_dense_series(vendor_code, start, end, interval=SNAPSHOT_INTERVAL):
+    # Get the first interval
+    point = floor_date(start, interval)
+
+    # If the compacted months are only kept as packed series, read the records
+    # from the packed series and the records of the months not compacted yet
+    if settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE:
+        current = get_latest_point(vendor_code, point)
+        range_records = iter(get_series_points(vendor_code, point, end))
+
+    # Otherwise read the records of the vendor ordered by date
+    else:
+        records = (
+            HistoricalPerformance.objects.filter(vendor_id=vendor_code)
+            .order_by("date")
+            .values("date", *METRIC_FIELDS)
+        )
+        current = records.filter(date__lt=point).order_by("-date").first()
+        range_records = iter(records.filter(date__gte=point, date__lte=end))
+
+    # Get the first record within the range
+    next_record = next(range_records, None)
+
+    # Traverse over the intervals of the range
+    series = []
+    while point <= end:
+        # Take the latest record within the interval
+        while next_record is not None and next_record["date"] < point + interval:
+            current = next_record
+            next_record = next(range_records, None)
+
+        # If there is a record to carry forward, add the point
+        if current is not None:
+            series.append(
+                {"date": point, **{field: current[field] for field in METRIC_FIELDS}}
+            )
+
+        # Move to the next interval
+        point += interval
+
+    # Return the dense series
+    return series
+
+
+# Function to get the points of the dense series of a vendor before a point, latest
+# first, for the keyset pagination of the series
+def get_dense_series_page(vendor_code, start, end, before=None, limit=100):
+    # Get the latest point of the page, before the given point
+    last = floor_date(end)
+    if before is not None:
+        last = min(last, before - SNAPSHOT_INTERVAL)
+
+    # Get the earliest point of the page, within the range
+    first = max(floor_date(start), last - (limit - 1) * SNAPSHOT_INTERVAL)
+
+    # If the page is past the start of the range
+    if last < first:
+        return []
+
+    # Return the points of the page, the series ends before the first record
+    return get_dense_series(vendor_code, first, last)[::-1]
+
+
+# Function to get the date of the oldest raw records kept, None if they are kept
+# forever or as packed series
+def get_raw_records_start():
+    # If the raw records are never expired, or are read from the packed series
+    if (
+        not settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS
+        or settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE
+    ):
+        return None
+
+    # Return the start of the first month kept by the retention period
+    return get_retention_cutoff(
+        datetime.timedelta(days=settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS)
+    )
+
+
+# Function to select the finest resolution whose points fit the point budget
+def select_resolution(start, end, max_points):
+    # Get the date of the oldest raw records kept
+    raw_records_start = get_raw_records_start()
+
+    # Traverse over the resolutions from the finest to the coarsest
+    for resolution, interval in [
+        ("raw", SNAPSHOT_INTERVAL),
+        *((name, period) for name, (_, period) in ROLLUPS.items()),
+    ]:
+        # If the range starts before the oldest raw records, only the rollups have it
+        if (
+            resolution == "raw"
+            and raw_records_start is not None
+            and start < raw_records_start
+        ):
+            continue
+
+        # If the points of the range fit the budget
+        if (end - start) / interval + 1 <= max_points:
+            return resolution
+
+    # Otherwise use the coarsest resolution
+    return "monthly"
+
+
+# Function to get the series of a vendor at the best resolution for a point budget
+def get_performance_series(vendor_code, start, end, max_points=500):
+    # Select the resolution
+    resolution = select_resolution(start, end, max_points)
+
+    # If the raw records fit the budget, return the dense series
+    if resolution == "raw":
+        return resolution, get_dense_series(vendor_code, start, end)
+
+    # Get the rollups of the periods overlapping the range
+    model, _ = ROLLUPS[resolution]
+    rollups = (
+        model.objects.filter(
+            vendor_id=vendor_code,
+            period_start__gte=get_period_start(start, resolution),
+            period_start__lte=end,
+        )
+        .order_by("period_start")
+        .values("period_start", *ROLLUP_FIELDS)
+    )
+
+    # Return the resolution and the series
+    return resolution, list(rollups)
@@ -0,0 +1,25 @@
+# Imports
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from vendor_management_system.historical_performances.partitions import (
+    create_id_sequence,
+    partition_table,
+)
+from vendor_management_system.historical_performances.tasks import (
+    create_historical_performance_partitions,
+)
+
+
+# Create a signal to partition the HistoricalPerformance table after the migrations
+@receiver(post_migrate)
+def partition_historical_performance(sender, app_config, **kwargs):
+    # If the migrations are not of the historical performances app
+    if app_config.label != "historical_performances":
+        return
+
+    # Create the sequence of the record IDs, convert the table to monthly partitions
+    # and create the retained months
+    create_id_sequence()
+    partition_table()
+    create_historical_performance_partitions()
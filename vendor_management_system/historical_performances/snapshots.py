@@ -0,0 +1,143 @@
+# Imports
+import datetime
+
+from django.db import transaction
+
+from vendor_management_system.historical_performances.models import (
+    HistoricalPerformance,
+    generate_historical_performance_ids,
+)
+from vendor_management_system.historical_performances.rollups import update_rollups
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+from vendor_management_system.vendors.models import Vendor
+
+
+# Epoch the snapshot intervals are aligned to
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+# Interval between two historical performance snapshots
+SNAPSHOT_INTERVAL = datetime.timedelta(hours=6)
+
+
+# Function to get the latest historical performance record of the given vendors
+def get_latest_records(vendor_codes, before=None):
+    # Get the records of the vendors
+    records = HistoricalPerformance.objects.filter(vendor_id__in=vendor_codes)
+
+    # If the records are limited to an upper date
+    if before is not None:
+        records = records.filter(date__lte=before)
+
+    # Return the latest record per vendor using the (vendor, date) index
+    return {
+        record["vendor_id"]: record
+        for record in records.order_by("vendor_id", "-date")
+        .distinct("vendor_id")
+        .values("vendor_id", "date", *METRIC_FIELDS)
+    }
+
+
+# Function to check if a vendor needs a new record in delta mode
+def _needs_record(vendor, latest_record, date, heartbeat):
+    # If the vendor has no record yet
+    if latest_record is None:
+        return True
+
+    # If the heartbeat interval has passed since the latest record
+    if heartbeat is not None and date - latest_record["date"] >= heartbeat:
+        return True
+
+    # Check if any of the metrics changed since the latest record
+    return any(vendor[field] != latest_record[field] for field in METRIC_FIELDS)
+
+
+# Function to record the historical performance of the vendors batch by batch
+def record_snapshot_batches(
+    date, after=None, until=None, batch_size=1000, delta=False, heartbeat=None
+):
+    # Get the metrics of the vendors ordered by vendor code
+    vendors = Vendor.objects.order_by("vendor_code").values(
+        "vendor_code", *METRIC_FIELDS
+    )
+
+    # If the vendors are limited to an upper vendor code
+    if until is not None:
+        vendors = vendors.filter(vendor_code__lte=until)
+
+    # Record the batches using the vendor code as a keyset
+    while True:
+        # Get the next batch of vendors
+        batch_vendors = vendors
+        if after is not None:
+            batch_vendors = batch_vendors.filter(vendor_code__gt=after)
+        batch = list(batch_vendors[:batch_size])
+
+        # If there are no more vendors
+        if not batch:
+            return
+
+        # Continue after the last vendor of the batch
+        after = batch[-1]["vendor_code"]
+
+        # In delta mode, only record the vendors whose metrics changed
+        records = batch
+        if delta:
+            latest_records = get_latest_records(
+                [vendor["vendor_code"] for vendor in batch], before=date
+            )
+            records = [
+                vendor
+                for vendor in batch
+                if _needs_record(
+                    vendor, latest_records.get(vendor["vendor_code"]), date, heartbeat
+                )
+            ]
+
+        # Insert the records of the batch, update the rollups and commit them
+        with transaction.atomic():
+            ids = generate_historical_performance_ids([date] * len(records))
+            HistoricalPerformance.objects.bulk_create(
+                [
+                    HistoricalPerformance(
+                        id=record_id,
+                        vendor_id=vendor["vendor_code"],
+                        date=date,
+                        **{field: vendor[field] for field in METRIC_FIELDS},
+                    )
+                    for vendor, record_id in zip(records, ids)
+                ]
+            )
+            update_rollups(batch, date)
+
+        # Yield the last committed vendor and the number of records
+        yield after, len(records)
+
+
+# Function to split the vendors into contiguous vendor code ranges
+def get_shard_ranges(shards):
+    # Get the number of vendors per shard
+    vendors = Vendor.objects.order_by("vendor_code").values_list(
+        "vendor_code", flat=True
+    )
+    shard_size = -(-vendors.count() // max(shards, 1))
+
+    # If there are no vendors, a single open range is enough
+    if shard_size == 0:
+        return [(None, None)]
+
+    # Get the last vendor code of every shard but the last one
+    boundaries = []
+    for shard in range(1, shards):
+        # Get the last vendor code of the shard using the vendor code index
+        boundary = vendors[shard * shard_size - 1 : shard * shard_size].first()
+
+        # If there are no vendors left for the next shards
+        if boundary is None:
+            break
+
+        # Add the boundary
+        boundaries.append(boundary)
+
+    # Return the ranges as (after, until) pairs, open at both ends
+    return list(zip([None, *boundaries], [*boundaries, None]))
@@ -1,40 +1,192 @@
 # Imports
+import datetime
+import logging
 import time
 import warnings
 
-from celery import shared_task
-from django.db import transaction
+from celery import chord, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
-from vendor_management_system.historical_performances.models import (
-    HistoricalPerformance,
+from vendor_management_system.historical_performances.columnar import compact_month
+from vendor_management_system.historical_performances.partitions import (
+    create_partitions,
+    get_month_range,
+    get_next_month,
 )
+from vendor_management_system.historical_performances.retention import expire_records
+from vendor_management_system.historical_performances.snapshots import (
+    get_shard_ranges,
+    record_snapshot_batches,
+)
+
 
-from vendor_management_system.vendors.models import Vendor
+# Get the logger
+logger = logging.getLogger(__name__)
 
 
 # Task to add a new record for the historical performance
 @shared_task
 def record_historical_performance(*args):
+    # Get the date of the snapshot, shared by all the records of a run
+    date = timezone.now()
+
+    # Split the vendors into vendor code ranges, one subtask per range
+    shards = get_shard_ranges(settings.HISTORICAL_PERFORMANCE_SHARDS)
+
+    # Run the shards in parallel and summarize the run once all are done
+    chord(
+        record_historical_performance_shard.s(
+            date.isoformat(), after=after, until=until
+        )
+        for after, until in shards
+    )(record_historical_performance_summary.s(date.isoformat(), time.time()))
+
+    # Return the number of shards dispatched
+    return len(shards)
+
+
+# Task to record the historical performance of a vendor code range
+@shared_task(bind=True, max_retries=None)
+def record_historical_performance_shard(self, date, after=None, until=None, recorded=0):
     # Ignore all the warnings
     warnings.filterwarnings("ignore")
 
-    # Run the code and rollback the transaction if an exception occurs
-    with transaction.atomic():
-        # Get all the vendors
-        vendors = Vendor.objects.all()
-
-        # Loop through all the vendors
-        for vendor in vendors:
-            # Create a new historical performance record
-            historical_performance = HistoricalPerformance(
-                vendor=vendor,
-                date=timezone.now(),
-                on_time_delivery_rate=vendor.on_time_delivery_rate,
-                quality_rating_avg=vendor.quality_rating_avg,
-                average_response_time=vendor.average_response_time,
-                fulfillment_rate=vendor.fulfillment_rate,
-            )
-
-            # Save the historical performance record
-            historical_performance.save()
+    # Record the vendors of the range batch by batch, committing every batch
+    resume_after = after
+    try:
+        for resume_after, count in record_snapshot_batches(
+            parse_datetime(date),
+            after=after,
+            until=until,
+            batch_size=settings.HISTORICAL_PERFORMANCE_BATCH_SIZE,
+            delta=settings.HISTORICAL_PERFORMANCE_DELTA_MODE,
+            heartbeat=datetime.timedelta(
+                hours=settings.HISTORICAL_PERFORMANCE_HEARTBEAT_HOURS
+            ),
+        ):
+            recorded += count
+
+    # If the task runs out of time, resume after the last committed vendor
+    except SoftTimeLimitExceeded:
+        # If no batch could be committed, retrying would not make progress
+        if resume_after == after:
+            raise
+
+        # Retry the shard from the last committed vendor, replacing both the
+        # arguments and the keyword arguments the shard was dispatched with
+        logger.warning(
+            "Historical performance shard timed out after vendor %s, resuming",
+            resume_after,
+        )
+        raise self.retry(
+            args=[date],
+            kwargs={"after": resume_after, "until": until, "recorded": recorded},
+            countdown=0,
+        )
+
+    # Return the number of records
+    return recorded
+
+
+# Task to summarize a historical performance run
+@shared_task
+def record_historical_performance_summary(results, date, started_at):
+    # Get the totals of the run
+    recorded = sum(results)
+    duration = time.time() - started_at
+
+    # Log the totals
+    logger.info(
+        "Recorded %d historical performance records for %s in %.2fs over %d shards",
+        recorded,
+        date,
+        duration,
+        len(results),
+    )
+
+    # Return the totals
+    return {"date": date, "recorded": recorded, "duration": duration}
+
+
+# Task to expire the historical performance records older than the retention period
+@shared_task
+def expire_historical_performance(*args):
+    # If the raw records are kept forever
+    if not settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS:
+        return {"downsampled": 0, "dropped": 0}
+
+    # Downsample the expired records day by day and drop their months
+    downsampled, dropped = expire_records(
+        datetime.timedelta(days=settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS),
+        batch_size=settings.HISTORICAL_PERFORMANCE_BATCH_SIZE,
+    )
+
+    # Log the totals
+    logger.info(
+        "Dropped %d historical performance partitions, %d records folded into the "
+        "rollups",
+        dropped,
+        downsampled,
+    )
+
+    # Return the totals
+    return {"downsampled": downsampled, "dropped": dropped}
+
+
+# Task to create the partitions of the retained and the coming months
+@shared_task
+def create_historical_performance_partitions(*args):
+    # Get the first month, the first retained month if the records expire
+    start = timezone.now()
+    if settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS:
+        start -= datetime.timedelta(days=settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS)
+
+    # Get the last month, the months ahead exist before the snapshots reach them
+    month = timezone.localdate().replace(day=1)
+    for _ in range(settings.HISTORICAL_PERFORMANCE_PARTITIONS_AHEAD):
+        month = get_next_month(month)
+
+    # Create the missing partitions
+    created = create_partitions(start, get_month_range(month)[0])
+
+    # Log the total
+    logger.info("Created %d historical performance partitions", created)
+
+    # Return the number of partitions created
+    return created
+
+
+# Task to compact a month of historical performance into packed series
+@shared_task
+def compact_historical_performance(month=None):
+    # If the series are read from the records, the packed series would only be
+    # another copy of them
+    if not settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE:
+        return 0
+
+    # Get the month to compact, the previous month by default
+    if month is None:
+        month = timezone.localdate().replace(day=1) - datetime.timedelta(days=1)
+    else:
+        month = parse_date(month)
+    month = month.replace(day=1)
+
+    # Compact the records of the month, dropping them once the month is over
+    compacted = compact_month(
+        month,
+        batch_size=settings.HISTORICAL_PERFORMANCE_BATCH_SIZE,
+        drop_records=get_month_range(month)[1] <= timezone.now(),
+    )
+
+    # Log the total
+    logger.info(
+        "Compacted the historical performance of %d vendors for %s",
+        compacted,
+        f"{month:%Y-%m}",
+    )
+
+    # Return the number of vendor series
+    return compacted
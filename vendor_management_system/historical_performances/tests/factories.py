@@ -1,11 +1,10 @@
 # Imports
-import uuid
-
 import factory
 from faker import Faker
 
 from vendor_management_system.historical_performances.models import (
     HistoricalPerformance,
+    generate_historical_performance_id,
 )
 from vendor_management_system.vendors.tests.factories import VendorFactory
 
@@ -21,9 +20,9 @@ class HistoricalPerformanceFactory(factory.django.DjangoModelFactory):
         model = HistoricalPerformance
 
     # Set the fields for the HistoricalPerformance model
-    id = factory.LazyFunction(lambda: str(uuid.uuid4()).replace("-", "")[:10].upper())
     vendor = factory.SubFactory(VendorFactory)
     date = factory.LazyFunction(faker.date_time_this_year)
+    id = factory.LazyAttribute(lambda obj: generate_historical_performance_id(obj.date))
     on_time_delivery_rate = factory.LazyFunction(
         lambda: faker.random_int(min=0, max=100)
     )
@@ -0,0 +1,99 @@
+# Imports
+import datetime
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vendor_management_system.historical_performances.analytics import (
+    ewma,
+    latest_z_score,
+    rolling_mean,
+    trend_slope,
+)
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+)
+from vendor_management_system.historical_performances.rollups import get_period_start
+
+
+# Test the indicators computed over a (vendor, day, metric) grid
+def test_historical_performance_indicators():
+    # Create a linear series with a gap and a series with a spike on the last day
+    grid = np.array(
+        [
+            [[10.0], [8.0], [np.nan], [4.0], [2.0]],
+            [[5.0], [5.0], [6.0], [5.0], [50.0]],
+        ]
+    )
+
+    # Check the rolling mean over the last two days, ignoring the gap
+    rolling = rolling_mean(grid, 2)
+    assert rolling[0, :, 0].tolist() == [10, 9, 8, 4, 3]
+
+    # Check that the EWMA carries over the gap
+    averages = ewma(grid, 0.5)
+    assert averages[0, :, 0].tolist() == [10, 9, 9, 6.5, 4.25]
+
+    # Check the slope per day of the linear series
+    assert trend_slope(grid)[0, 0] == pytest.approx(-2)
+
+    # Check that only the spike is an anomaly
+    z_scores = latest_z_score(grid)
+    assert abs(z_scores[0, 0]) < 3
+    assert z_scores[1, 0] > 3
+
+
+# Test the ranking of the vendors by deterioration
+@pytest.mark.django_db
+def test_rank_vendors_by_deterioration(db, admin_user, vendor_factory):
+    # Create a deteriorating and a stable Vendor object
+    deteriorating, stable = vendor_factory.create_batch(2)
+    for days in range(10):
+        period_start = get_period_start(
+            timezone.now() - datetime.timedelta(days=days), "daily"
+        )
+        DailyPerformanceRollup.objects.create(
+            vendor=deteriorating,
+            period_start=period_start,
+            fulfillment_rate_mean=50 + 5 * days,
+        )
+        DailyPerformanceRollup.objects.create(
+            vendor=stable, period_start=period_start, fulfillment_rate_mean=90
+        )
+
+    # Rank the vendors
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    response = client.get(
+        reverse("historical-performances--rank-vendors"),
+        {"token": token.key, "days": 10},
+    )
+
+    # Check that the deteriorating vendor comes first
+    assert response.status_code == 200
+    assert response.data["vendor_count"] == 2
+    assert [vendor["vendor_code"] for vendor in response.data["results"]] == [
+        deteriorating.vendor_code,
+        stable.vendor_code,
+    ]
+    metrics = response.data["results"][0]["metrics"]["fulfillment_rate"]
+    assert metrics["slope"] == pytest.approx(-5)
+    assert metrics["latest"] == 50
+
+    # Analyze the deteriorating vendor
+    response = client.get(
+        reverse(
+            "historical-performances--analyze-vendor",
+            kwargs={"vendor_code": deteriorating.vendor_code},
+        ),
+        {"token": token.key, "days": 10},
+    )
+
+    # Check the daily series of the vendor
+    assert response.status_code == 200
+    assert response.data["series"]["fulfillment_rate"]["value"][-1] == 50
+    assert len(response.data["series"]["date"]) == 10
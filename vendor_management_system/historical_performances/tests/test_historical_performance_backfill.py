@@ -0,0 +1,113 @@
+# Imports
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+)
+from vendor_management_system.historical_performances.series import floor_date
+from vendor_management_system.historical_performances.snapshots import SNAPSHOT_INTERVAL
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderEvent,
+)
+from vendor_management_system.vendors.metrics import (
+    METRIC_FIELDS,
+    rebuild_vendor_counters,
+)
+
+
+# Test that the backfill rebuilds the metrics at every past boundary
+@pytest.mark.django_db
+def test_backfill_historical_performance(db, vendor_factory, purchase_order_factory):
+    # Create a Vendor object with a delivered and an acknowledged order
+    vendor = vendor_factory()
+    delivered = purchase_order_factory(
+        status="DELIVERED", vendor=vendor, quality_rating=4
+    )
+    acknowledged = purchase_order_factory(status="ACKNOWLEDGED", vendor=vendor)
+
+    # Move the order history to the past
+    start = floor_date(timezone.now() - datetime.timedelta(days=10))
+    PurchaseOrder.objects.filter(pk=delivered.pk).update(
+        issue_date=start,
+        acknowledgment_date=start + datetime.timedelta(hours=2),
+        expected_delivery_date=start + datetime.timedelta(days=2),
+        actual_delivery_date=start + datetime.timedelta(days=1),
+    )
+    PurchaseOrder.objects.filter(pk=acknowledged.pk).update(
+        issue_date=start + datetime.timedelta(days=1),
+        acknowledgment_date=start + datetime.timedelta(days=1, hours=4),
+    )
+    rebuild_vendor_counters(vendor.vendor_code)
+    vendor.refresh_from_db()
+
+    # Backfill the historical performance
+    call_command("backfill_historical_performance")
+    records = list(HistoricalPerformance.objects.filter(vendor=vendor).order_by("date"))
+
+    # Check that a record exists at every boundary since the first order
+    assert records[0].date == start + SNAPSHOT_INTERVAL
+    assert all(
+        later.date - earlier.date == SNAPSHOT_INTERVAL
+        for earlier, later in zip(records, records[1:])
+    )
+
+    # Check the metrics before the first delivery
+    assert records[0].fulfillment_rate == 0
+    assert records[0].average_response_time == 2
+    assert records[0].on_time_delivery_rate is None
+    assert records[0].quality_rating_avg is None
+
+    # Check that the latest record matches the current metrics of the vendor
+    for field in METRIC_FIELDS:
+        assert getattr(records[-1], field) == pytest.approx(getattr(vendor, field))
+
+    # Check that the backfilled days are folded into the rollups
+    assert DailyPerformanceRollup.objects.filter(vendor=vendor).exists()
+
+    # Check that a second backfill does not add records
+    call_command("backfill_historical_performance")
+    assert HistoricalPerformance.objects.filter(vendor=vendor).count() == len(records)
+
+
+# Test that the backfill places the status changes at the time of their events
+@pytest.mark.django_db
+def test_backfill_historical_performance_events(
+    db, vendor_factory, purchase_order_factory
+):
+    # Create a Vendor object with an order moved through every status
+    vendor = vendor_factory()
+    order = purchase_order_factory(status="PENDING", vendor=vendor, quality_rating=5)
+    for status in ["ISSUED", "ACKNOWLEDGED", "DELIVERED"]:
+        order.status = status
+        order.save()
+
+    # Move the order history to the past, the dates set by the status changes
+    # only keep the day, while the events keep the time of the change
+    start = floor_date(timezone.now() - datetime.timedelta(days=10))
+    PurchaseOrder.objects.filter(pk=order.pk).update(
+        issue_date=start,
+        acknowledgment_date=start,
+        expected_delivery_date=start + datetime.timedelta(days=2),
+        actual_delivery_date=start,
+    )
+    for status, hours in [("ISSUED", 1), ("ACKNOWLEDGED", 2), ("DELIVERED", 20)]:
+        PurchaseOrderEvent.objects.filter(
+            purchase_order=order, to_status=status
+        ).update(timestamp=start + datetime.timedelta(hours=hours))
+    rebuild_vendor_counters(vendor.vendor_code)
+
+    # Backfill the historical performance
+    call_command("backfill_historical_performance")
+    records = list(HistoricalPerformance.objects.filter(vendor=vendor).order_by("date"))
+
+    # Check that the order is issued at the first boundary but delivered only at
+    # the first boundary after the time of its delivery event
+    assert [record.fulfillment_rate for record in records[:4]] == [0, 0, 0, 100]
+    assert records[3].date == start + 4 * SNAPSHOT_INTERVAL
+    assert records[3].quality_rating_avg == 5
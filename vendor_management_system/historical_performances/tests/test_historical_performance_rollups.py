@@ -0,0 +1,117 @@
+# Imports
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+    MonthlyPerformanceRollup,
+)
+from vendor_management_system.historical_performances.partitions import (
+    create_partitions,
+)
+from vendor_management_system.historical_performances.retention import expire_records
+from vendor_management_system.historical_performances.rollups import get_period_start
+from vendor_management_system.historical_performances.series import (
+    get_performance_series,
+    select_resolution,
+)
+from vendor_management_system.historical_performances.snapshots import (
+    SNAPSHOT_INTERVAL,
+)
+from vendor_management_system.historical_performances.tasks import (
+    record_historical_performance_shard,
+)
+
+
+# Test that the rollups are updated by every snapshot
+@pytest.mark.django_db
+def test_historical_performance_rollups(db, settings, vendor_factory):
+    # Enable the delta mode, the rollups still get a sample per snapshot
+    settings.HISTORICAL_PERFORMANCE_DELTA_MODE = True
+
+    # Create a Vendor object
+    vendor = vendor_factory(fulfillment_rate=10)
+
+    # Record snapshots with changing metrics within the same day
+    start = get_period_start(timezone.now(), "daily")
+    for index, fulfillment_rate in enumerate([10, 30, 20, 20]):
+        vendor.fulfillment_rate = fulfillment_rate
+        vendor.save(update_fields=["fulfillment_rate"])
+        record_historical_performance_shard(
+            (start + index * SNAPSHOT_INTERVAL).isoformat()
+        )
+
+    # Check the statistics of the daily rollup
+    rollup = DailyPerformanceRollup.objects.get(vendor=vendor)
+    assert rollup.period_start == start
+    assert rollup.fulfillment_rate_count == 4
+    assert rollup.fulfillment_rate_min == 10
+    assert rollup.fulfillment_rate_max == 30
+    assert rollup.fulfillment_rate_mean == pytest.approx(20)
+    assert rollup.fulfillment_rate_last == 20
+
+    # Check that the monthly rollup contains the same samples
+    rollup = MonthlyPerformanceRollup.objects.get(vendor=vendor)
+    assert rollup.fulfillment_rate_count == 4
+    assert rollup.fulfillment_rate_mean == pytest.approx(20)
+
+    # Check that a long range is read from the rollups
+    resolution, series = get_performance_series(
+        vendor.vendor_code, start - datetime.timedelta(days=700), start, max_points=50
+    )
+    assert resolution == "monthly"
+    assert len(series) == 1
+    assert series[0]["fulfillment_rate_last"] == 20
+
+
+# Test the resolution selected for a range and point budget
+def test_select_resolution():
+    # Get the end of the range
+    end = timezone.now()
+
+    # Check the resolution of increasing ranges
+    assert select_resolution(end - datetime.timedelta(days=7), end, 100) == "raw"
+    assert select_resolution(end - datetime.timedelta(days=90), end, 100) == "daily"
+    assert select_resolution(end - datetime.timedelta(days=365), end, 100) == "weekly"
+    assert select_resolution(end - datetime.timedelta(days=3650), end, 100) == (
+        "monthly"
+    )
+
+
+# Test that a range older than the retention period is read from the rollups
+@pytest.mark.django_db(transaction=True)
+def test_performance_series_expired_range(db, settings, vendor_factory):
+    # Keep the raw records for a year, without the columnar storage
+    settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS = 365
+    settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE = False
+
+    # Create a Vendor object
+    vendor = vendor_factory(fulfillment_rate=40)
+
+    # Record snapshots over ten days, starting 800 days ago
+    start = get_period_start(timezone.now() - datetime.timedelta(days=800), "daily")
+    end = start + datetime.timedelta(days=10)
+    create_partitions(start, end)
+    date = start
+    while date < end:
+        record_historical_performance_shard(date.isoformat())
+        date += SNAPSHOT_INTERVAL
+
+    # Expire the records older than the retention period
+    expire_records(datetime.timedelta(days=365))
+    assert not HistoricalPerformance.objects.exists()
+
+    # Check that a short range of the expired days is read from the daily rollups
+    resolution, series = get_performance_series(
+        vendor.vendor_code, start, start + datetime.timedelta(days=5)
+    )
+    assert resolution == "daily"
+    assert len(series) == 6
+    assert series[0]["fulfillment_rate_last"] == 40
+
+    # Check that the same range is read from the raw records when they are kept
+    settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS = 0
+    assert select_resolution(start, start + datetime.timedelta(days=5), 500) == "raw"
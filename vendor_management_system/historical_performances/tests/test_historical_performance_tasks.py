@@ -0,0 +1,413 @@
+# Imports
+import datetime
+
+import numpy as np
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.utils import timezone
+
+from config.celery_app import app
+from vendor_management_system.historical_performances import tasks
+
+from vendor_management_system.historical_performances.columnar import (
+    get_series_arrays,
+)
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    MonthlyPerformanceSeries,
+)
+from vendor_management_system.historical_performances.partitions import (
+    get_month_range,
+    get_next_month,
+    get_partition_months,
+    is_partitioned,
+)
+from vendor_management_system.historical_performances.rollups import get_period_start
+from vendor_management_system.historical_performances.series import (
+    floor_date,
+    get_dense_series,
+)
+from vendor_management_system.historical_performances.snapshots import (
+    SNAPSHOT_INTERVAL,
+    get_shard_ranges,
+)
+from vendor_management_system.historical_performances.tasks import (
+    compact_historical_performance,
+    create_historical_performance_partitions,
+    expire_historical_performance,
+    record_historical_performance,
+    record_historical_performance_shard,
+)
+
+
+# Function to make the snapshot batches time out once, after the first batch
+def _time_out_once(monkeypatch):
+    # Get the original function
+    record_snapshot_batches = tasks.record_snapshot_batches
+    timed_out = []
+
+    # Function to time out before the second batch is written, only the first time
+    def record_snapshot_batches_once(*args, **kwargs):
+        batches = record_snapshot_batches(*args, **kwargs)
+        yield next(batches)
+        if not timed_out:
+            timed_out.append(True)
+            raise SoftTimeLimitExceeded()
+        yield from batches
+
+    # Replace the function used by the tasks
+    monkeypatch.setattr(tasks, "record_snapshot_batches", record_snapshot_batches_once)
+
+
+# Test that a shard records every vendor of its range in batches
+@pytest.mark.django_db
+def test_record_historical_performance_shard(db, settings, vendor_factory):
+    # Use small batches
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+
+    # Create Vendor objects
+    vendors = vendor_factory.create_batch(5)
+
+    # Record the snapshot of all the vendors in a single shard
+    recorded = record_historical_performance_shard(timezone.now().isoformat())
+
+    # Check that every vendor is recorded once with the same date
+    assert recorded == 5
+    assert HistoricalPerformance.objects.count() == 5
+    assert HistoricalPerformance.objects.values("date").distinct().count() == 1
+
+    # Check the recorded metrics
+    for vendor in vendors:
+        record = HistoricalPerformance.objects.get(vendor=vendor)
+        assert record.on_time_delivery_rate == vendor.on_time_delivery_rate
+        assert record.fulfillment_rate == vendor.fulfillment_rate
+
+
+# Test that the shards cover every vendor exactly once
+@pytest.mark.django_db
+def test_record_historical_performance_shards(db, settings, vendor_factory):
+    # Use small batches
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+
+    # Create Vendor objects
+    vendor_codes = sorted(
+        vendor.vendor_code for vendor in vendor_factory.create_batch(7)
+    )
+
+    # Record every shard
+    date = timezone.now().isoformat()
+    recorded = [
+        record_historical_performance_shard(date, after=after, until=until)
+        for after, until in get_shard_ranges(3)
+    ]
+
+    # Check the shard sizes and that every vendor is recorded once
+    vendor_ids = HistoricalPerformance.objects.values_list("vendor_id", flat=True)
+    assert recorded == [3, 3, 1]
+    assert sorted(vendor_ids) == vendor_codes
+
+
+# Test that a shard resumes after the given vendor
+@pytest.mark.django_db
+def test_record_historical_performance_shard_resume(db, settings, vendor_factory):
+    # Use small batches
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+
+    # Create Vendor objects ordered by vendor code
+    vendor_codes = sorted(
+        vendor.vendor_code for vendor in vendor_factory.create_batch(4)
+    )
+
+    # Resume the shard after the second vendor
+    recorded = record_historical_performance_shard(
+        timezone.now().isoformat(), after=vendor_codes[1], recorded=2
+    )
+
+    # Check that only the remaining vendors are recorded and counted
+    vendor_ids = HistoricalPerformance.objects.values_list("vendor_id", flat=True)
+    assert recorded == 4
+    assert sorted(vendor_ids) == vendor_codes[2:]
+
+
+# Test that a timed out shard retries from the last committed vendor
+@pytest.mark.django_db
+def test_record_historical_performance_shard_retry(
+    db, settings, monkeypatch, vendor_factory
+):
+    # Use small batches and time out after the first one
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+    _time_out_once(monkeypatch)
+
+    # Create Vendor objects
+    vendor_codes = sorted(
+        vendor.vendor_code for vendor in vendor_factory.create_batch(5)
+    )
+
+    # Run the shard as it is dispatched, the retry runs eagerly instead of being
+    # raised to the caller
+    result = record_historical_performance_shard.apply(
+        args=[timezone.now().isoformat()],
+        kwargs={"until": vendor_codes[-1]},
+        throw=False,
+    )
+
+    # Check that every vendor is recorded once across the retry
+    vendor_ids = HistoricalPerformance.objects.values_list("vendor_id", flat=True)
+    assert result.get() == 5
+    assert sorted(vendor_ids) == vendor_codes
+
+
+# Test that a run records every shard and summarizes the totals
+@pytest.mark.django_db
+def test_record_historical_performance(
+    db, settings, monkeypatch, caplog, vendor_factory
+):
+    # Use small batches over three shards, one of them timing out once
+    settings.HISTORICAL_PERFORMANCE_BATCH_SIZE = 2
+    settings.HISTORICAL_PERFORMANCE_SHARDS = 3
+    _time_out_once(monkeypatch)
+
+    # Run the tasks eagerly, running the retries instead of raising them
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    monkeypatch.setattr(app.conf, "CELERY_TASK_EAGER_PROPAGATES", False)
+
+    # Create Vendor objects
+    vendor_codes = sorted(
+        vendor.vendor_code for vendor in vendor_factory.create_batch(9)
+    )
+
+    # Record the snapshot
+    with caplog.at_level("INFO", logger=tasks.__name__):
+        shards = record_historical_performance()
+
+    # Check that every vendor is recorded once with the same date
+    vendor_ids = HistoricalPerformance.objects.values_list("vendor_id", flat=True)
+    assert shards == 3
+    assert sorted(vendor_ids) == vendor_codes
+    assert HistoricalPerformance.objects.values("date").distinct().count() == 1
+
+    # Check that the summary counts the records of every shard
+    assert "Recorded 9 historical performance records" in caplog.text
+    assert "over 3 shards" in caplog.text
+
+
+# Test that delta snapshots skip unchanged vendors and reads stay dense
+@pytest.mark.django_db
+def test_record_historical_performance_delta(db, settings, vendor_factory):
+    # Enable the delta mode
+    settings.HISTORICAL_PERFORMANCE_DELTA_MODE = True
+    settings.HISTORICAL_PERFORMANCE_HEARTBEAT_HOURS = 24
+
+    # Create Vendor objects
+    changed, unchanged = vendor_factory.create_batch(2)
+
+    # Record a first snapshot for every vendor
+    start = floor_date(timezone.now())
+    record_historical_performance_shard(start.isoformat())
+
+    # Change the metrics of one of the vendors and record a second snapshot
+    changed.fulfillment_rate = 12.5
+    changed.save(update_fields=["fulfillment_rate"])
+    recorded = record_historical_performance_shard(
+        (start + SNAPSHOT_INTERVAL).isoformat()
+    )
+
+    # Check that only the changed vendor is recorded
+    assert recorded == 1
+    assert HistoricalPerformance.objects.filter(vendor=unchanged).count() == 1
+
+    # Check that the series of the unchanged vendor is still dense
+    series = get_dense_series(unchanged.vendor_code, start, start + SNAPSHOT_INTERVAL)
+    assert [point["date"] for point in series] == [start, start + SNAPSHOT_INTERVAL]
+    assert series[1]["fulfillment_rate"] == unchanged.fulfillment_rate
+
+    # Record a snapshot after the heartbeat interval
+    recorded = record_historical_performance_shard(
+        (start + datetime.timedelta(hours=30)).isoformat()
+    )
+
+    # Check that every vendor is recorded again
+    assert recorded == 2
+
+
+# Test that expired records are folded into the rollups before their months are dropped
+@pytest.mark.django_db(transaction=True)
+def test_expire_historical_performance(
+    db, settings, vendor_factory, historical_performance_factory
+):
+    # Keep the raw records for 30 days
+    settings.HISTORICAL_PERFORMANCE_RETENTION_DAYS = 30
+
+    # Get the first month to keep and a day of the month before it
+    cutoff = get_period_start(timezone.now() - datetime.timedelta(days=30), "monthly")
+    day_start = get_period_start(cutoff - datetime.timedelta(days=20), "daily")
+
+    # Create a Vendor object with a snapshot already folded into the rollups
+    vendor = vendor_factory(fulfillment_rate=50)
+    record_historical_performance_shard(day_start.isoformat())
+
+    # Create a record of the folded day and one of a day missing from the rollups
+    for hours, fulfillment_rate in [(6, 70), (30, 90)]:
+        historical_performance_factory(
+            vendor=vendor,
+            date=day_start + datetime.timedelta(hours=hours),
+            fulfillment_rate=fulfillment_rate,
+        )
+
+    # Create a record of the folded day with an ID set by hand, stored in the default
+    # partition
+    historical_performance_factory(
+        id="HPR0000001", vendor=vendor, date=day_start + datetime.timedelta(hours=12)
+    )
+
+    # Create a record of the month of the cutoff and one within the retention period
+    historical_performance_factory(vendor=vendor, date=cutoff)
+    historical_performance_factory(vendor=vendor, date=timezone.now())
+
+    # Expire the records
+    expired_months = [
+        month
+        for month in get_partition_months()
+        if month < timezone.localtime(cutoff).date()
+    ]
+    result = expire_historical_performance()
+
+    # Check that the whole expired months are dropped
+    assert expired_months
+    assert result == {"downsampled": 1, "dropped": len(expired_months)}
+    assert get_partition_months()[0] == timezone.localtime(cutoff).date()
+    assert HistoricalPerformance.objects.count() == 2
+
+    # Check that the folded day is not counted twice
+    rollup = DailyPerformanceRollup.objects.get(vendor=vendor, period_start=day_start)
+    assert rollup.fulfillment_rate_count == 1
+    assert rollup.fulfillment_rate_last == 50
+
+    # Check that the missing day is downsampled
+    rollup = DailyPerformanceRollup.objects.exclude(period_start=day_start).get()
+    assert rollup.fulfillment_rate_count == 1
+    assert rollup.fulfillment_rate_last == 90
+    monthly_counts = MonthlyPerformanceRollup.objects.values_list(
+        "fulfillment_rate_count", flat=True
+    )
+    assert sum(monthly_counts) == 2
+
+
+# Test that the partitions of the coming months are created ahead
+@pytest.mark.django_db
+def test_create_historical_performance_partitions(db, settings, vendor_factory):
+    # Keep five months of partitions ahead
+    settings.HISTORICAL_PERFORMANCE_PARTITIONS_AHEAD = 5
+
+    # Create the partitions
+    create_historical_performance_partitions()
+
+    # Check that the table is partitioned up to the fifth month ahead
+    assert is_partitioned()
+    month = timezone.localdate().replace(day=1)
+    for _ in range(5):
+        month = get_next_month(month)
+    assert get_partition_months()[-1] == month
+
+    # Check that the existing partitions are kept
+    assert create_historical_performance_partitions() == 0
+
+    # Check that a snapshot of the last month is routed to its partition
+    vendor_factory()
+    date = get_month_range(month)[1] - SNAPSHOT_INTERVAL
+    record_historical_performance_shard(date.isoformat())
+    assert HistoricalPerformance.objects.get().date == date
+
+
+# Test that a compacted month reads back as the same NumPy arrays
+@pytest.mark.django_db(transaction=True)
+def test_compact_historical_performance(
+    db, settings, vendor_factory, historical_performance_factory
+):
+    # Create a Vendor object with records in the previous month, one undefined
+    vendor = vendor_factory()
+    month_start = get_period_start(
+        get_period_start(timezone.now(), "monthly") - datetime.timedelta(days=1),
+        "monthly",
+    )
+    records = [
+        historical_performance_factory(
+            vendor=vendor,
+            date=month_start + index * SNAPSHOT_INTERVAL,
+            quality_rating_avg=None if index == 0 else index,
+        )
+        for index in range(4)
+    ]
+
+    # Read the series from the records before the compaction
+    end = month_start + datetime.timedelta(days=1)
+    expected = get_series_arrays(vendor.vendor_code, month_start, end)
+
+    # Check that the month is not compacted without the columnar storage
+    settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE = False
+    assert compact_historical_performance() == 0
+    assert not MonthlyPerformanceSeries.objects.exists()
+
+    # Compact the previous month in the columnar storage
+    settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE = True
+    assert compact_historical_performance() == 1
+    series = MonthlyPerformanceSeries.objects.get(vendor=vendor)
+    assert series.point_count == 4
+
+    # Check that the packed series reads back the same arrays
+    arrays = get_series_arrays(vendor.vendor_code, month_start, end)
+    for field, values in expected.items():
+        np.testing.assert_array_equal(arrays[field], values)
+
+    # Check the unpacked values
+    assert np.isnan(arrays["quality_rating_avg"][0])
+    assert list(arrays["quality_rating_avg"][1:]) == [1, 2, 3]
+    assert list(arrays["fulfillment_rate"]) == [
+        record.fulfillment_rate for record in records
+    ]
+
+
+# Test that the columnar storage drops the compacted records and reads the series
+@pytest.mark.django_db(transaction=True)
+def test_compact_historical_performance_columnar(
+    db, settings, vendor_factory, historical_performance_factory
+):
+    # Keep the compacted months only as packed series
+    settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE = True
+
+    # Create a Vendor object with records in the previous month, one undefined
+    vendor = vendor_factory()
+    current_month_start = get_period_start(timezone.now(), "monthly")
+    month_start = get_period_start(
+        current_month_start - datetime.timedelta(days=1), "monthly"
+    )
+    for index in range(4):
+        historical_performance_factory(
+            vendor=vendor,
+            date=month_start + index * SNAPSHOT_INTERVAL,
+            quality_rating_avg=None if index == 0 else index,
+            fulfillment_rate=index * 10,
+        )
+
+    # Read the dense series from the records before the compaction
+    end = month_start + 5 * SNAPSHOT_INTERVAL
+    expected = get_dense_series(vendor.vendor_code, month_start, end)
+
+    # Compact the previous month
+    assert compact_historical_performance() == 1
+
+    # Check that the partition of the month is dropped
+    assert timezone.localtime(month_start).date() not in get_partition_months()
+    assert not HistoricalPerformance.objects.exists()
+
+    # Check that the dense series reads back the same points from the packed series
+    assert get_dense_series(vendor.vendor_code, month_start, end) == expected
+    assert expected[0]["quality_rating_avg"] is None
+
+    # Check that the last packed point is carried forward into the current month
+    series = get_dense_series(
+        vendor.vendor_code, current_month_start, current_month_start
+    )
+    assert [point["fulfillment_rate"] for point in series] == [30]
@@ -0,0 +1,228 @@
+# Imports
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vendor_management_system.historical_performances.rollups import update_rollups
+from vendor_management_system.historical_performances.series import floor_date
+from vendor_management_system.historical_performances.snapshots import (
+    SNAPSHOT_INTERVAL,
+)
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Test the keyset paginated historical performance of a vendor
+@pytest.mark.django_db
+def test_list_vendor_historical_performance(
+    db, admin_user, vendor_factory, historical_performance_factory
+):
+    # Create a Vendor object with records sharing some dates
+    vendor = vendor_factory()
+    start = timezone.now().replace(microsecond=123456)
+    dates = [start + datetime.timedelta(hours=6 * (index // 2)) for index in range(7)]
+    for date in dates:
+        historical_performance_factory(vendor=vendor, date=date)
+    historical_performance_factory(date=start)
+
+    # Get the url of the historical performance of the vendor
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "historical-performances--list-vendor-historical-performance",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+
+    # Fetch every page
+    client = APIClient()
+    response = client.get(
+        url, {"token": token.key, "resolution": "raw", "page_size": 3}
+    )
+    records = []
+    while True:
+        assert response.status_code == 200
+        records += response.data["results"]
+        if response.data["next"] is None:
+            break
+        response = client.get(response.data["next"])
+
+    # Check that every record of the vendor is returned once, latest first
+    assert len({record["id"] for record in records}) == 7
+    assert [record["date"] for record in records] == [
+        timezone.localtime(date).isoformat() for date in sorted(dates, reverse=True)
+    ]
+
+    # Check the range filter
+    start_from = start + datetime.timedelta(hours=12)
+    response = client.get(
+        url, {"token": token.key, "resolution": "raw", "from": start_from.isoformat()}
+    )
+    assert len(response.data["results"]) == 3
+
+    # Check an invalid range
+    response = client.get(
+        url,
+        {
+            "token": token.key,
+            "resolution": "raw",
+            "from": start.isoformat(),
+            "to": (start - datetime.timedelta(days=1)).isoformat(),
+        },
+    )
+    assert response.status_code == 400
+
+
+# Test that the delta records of a vendor are listed as a dense series
+@pytest.mark.django_db
+def test_list_vendor_historical_performance_dense(
+    db, settings, admin_user, vendor_factory, historical_performance_factory
+):
+    # Enable the delta mode
+    settings.HISTORICAL_PERFORMANCE_DELTA_MODE = True
+
+    # Create a Vendor object with records only where its metrics changed
+    vendor = vendor_factory()
+    start = floor_date(timezone.now()) - 9 * SNAPSHOT_INTERVAL
+    for index, fulfillment_rate in [(0, 10), (4, 20), (5, 30)]:
+        historical_performance_factory(
+            vendor=vendor,
+            date=start + index * SNAPSHOT_INTERVAL,
+            fulfillment_rate=fulfillment_rate,
+        )
+
+    # Get the url of the historical performance of the vendor
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "historical-performances--list-vendor-historical-performance",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+
+    # Fetch every page of the raw series
+    client = APIClient()
+    response = client.get(
+        url, {"token": token.key, "resolution": "raw", "page_size": 4}
+    )
+    points = []
+    while True:
+        assert response.status_code == 200
+        points += response.data["results"]
+        if response.data["next"] is None:
+            break
+        response = client.get(response.data["next"])
+
+    # Check that every interval since the first record has a point, latest first
+    assert [point["date"] for point in points] == [
+        timezone.localtime(start + index * SNAPSHOT_INTERVAL).isoformat()
+        for index in range(9, -1, -1)
+    ]
+
+    # Check that the last record is carried forward
+    assert [point["fulfillment_rate"] for point in points] == [
+        *[30] * 5,
+        20,
+        *[10] * 4,
+    ]
+
+    # Check an invalid cursor
+    response = client.get(url, {"token": token.key, "resolution": "raw", "cursor": "x"})
+    assert response.status_code == 404
+
+
+# Test that the resolution of the series is selected from the range if omitted
+@pytest.mark.django_db
+def test_list_vendor_historical_performance_series(
+    db, admin_user, vendor_factory, historical_performance_factory
+):
+    # Create a Vendor object with records over the last days
+    vendor = vendor_factory()
+    end = floor_date(timezone.now())
+    for index in range(8):
+        record = historical_performance_factory(
+            vendor=vendor,
+            date=end - index * SNAPSHOT_INTERVAL,
+            fulfillment_rate=index * 10,
+        )
+        sample = {field: getattr(record, field) for field in METRIC_FIELDS}
+        update_rollups([{"vendor_code": vendor.vendor_code, **sample}], record.date)
+
+    # Get the url of the historical performance of the vendor
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "historical-performances--list-vendor-historical-performance",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+
+    # Check that a short range is served from the dense raw series, oldest first
+    client = APIClient()
+    response = client.get(
+        url,
+        {
+            "token": token.key,
+            "from": (end - 3 * SNAPSHOT_INTERVAL).isoformat(),
+            "to": end.isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    assert response.data["resolution"] == "raw"
+    assert [point["fulfillment_rate"] for point in response.data["results"]] == [
+        30,
+        20,
+        10,
+        0,
+    ]
+
+    # Check that a range exceeding the point budget is served from the rollups
+    response = client.get(
+        url,
+        {
+            "token": token.key,
+            "from": (end - datetime.timedelta(days=30)).isoformat(),
+            "to": end.isoformat(),
+            "max_points": 40,
+        },
+    )
+    assert response.status_code == 200
+    assert response.data["resolution"] == "daily"
+    assert (
+        sum(rollup["fulfillment_rate_count"] for rollup in response.data["results"])
+        == 8
+    )
+
+    # Check that the range defaults to the whole history of the vendor
+    response = client.get(url, {"token": token.key})
+    assert response.status_code == 200
+    assert response.data["resolution"] == "raw"
+    assert response.data["results"][-1]["fulfillment_rate"] == 0
+
+
+# Test that listing the historical performance does not query per record
+@pytest.mark.django_db
+def test_list_vendor_historical_performance_queries(
+    db,
+    admin_user,
+    vendor_factory,
+    historical_performance_factory,
+    assert_constant_queries,
+):
+    # Create a Vendor object with records
+    vendor = vendor_factory()
+    historical_performance_factory.create_batch(10, vendor=vendor)
+
+    # Function to fetch a page of the records
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse(
+        "historical-performances--list-vendor-historical-performance",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+
+    def fetch_page(page_size):
+        response = client.get(
+            url, {"token": token.key, "resolution": "raw", "page_size": page_size}
+        )
+        assert len(response.data["results"]) == page_size
+
+    # Check that the number of queries does not depend on the page size
+    assert_constant_queries(fetch_page)
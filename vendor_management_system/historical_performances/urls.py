@@ -0,0 +1,27 @@
+# Imports
+from django.urls import path
+
+from vendor_management_system.historical_performances.views import (
+    HistoricalPerformanceAnalyticsViewSet,
+    HistoricalPerformanceViewSet,
+)
+
+
+# Define the URL patterns for the historical performances app
+urlpatterns = [
+    path(
+        "historical-performance/analytics/",
+        HistoricalPerformanceAnalyticsViewSet.as_view({"get": "list"}),
+        name="historical-performances--rank-vendors",
+    ),
+    path(
+        "<vendor_code>/historical-performance/",
+        HistoricalPerformanceViewSet.as_view({"get": "list"}),
+        name="historical-performances--list-vendor-historical-performance",
+    ),
+    path(
+        "<vendor_code>/historical-performance/analytics/",
+        HistoricalPerformanceAnalyticsViewSet.as_view({"get": "retrieve"}),
+        name="historical-performances--analyze-vendor",
+    ),
+]
@@ -0,0 +1,401 @@
+# Imports
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import permissions, response, status, viewsets
+from rest_framework.exceptions import NotFound
+
+from vendor_management_system.core.authentication import (
+    QueryParameterTokenAuthentication,
+)
+from vendor_management_system.core.pagination import KeysetPagination
+
+from vendor_management_system.historical_performances.analytics import (
+    analyze_vendors,
+    rank_vendors,
+)
+
+from vendor_management_system.historical_performances.models import (
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    WeeklyPerformanceRollup,
+)
+from vendor_management_system.historical_performances.serializers import (
+    DailyPerformanceRollupSerializer,
+    HistoricalPerformanceAnalyticsQuerySerializer,
+    HistoricalPerformancePointSerializer,
+    HistoricalPerformanceQuerySerializer,
+    HistoricalPerformanceSerializer,
+    HistoricalPerformanceVendorSerializer,
+    MonthlyPerformanceRollupSerializer,
+    WeeklyPerformanceRollupSerializer,
+)
+from vendor_management_system.historical_performances.series import (
+    EPOCH,
+    get_dense_series_page,
+    get_performance_series,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Model, serializer and date field of every resolution
+RESOLUTIONS = {
+    "raw": (HistoricalPerformance, HistoricalPerformanceSerializer, "date"),
+    "daily": (DailyPerformanceRollup, DailyPerformanceRollupSerializer, "period_start"),
+    "weekly": (
+        WeeklyPerformanceRollup,
+        WeeklyPerformanceRollupSerializer,
+        "period_start",
+    ),
+    "monthly": (
+        MonthlyPerformanceRollup,
+        MonthlyPerformanceRollupSerializer,
+        "period_start",
+    ),
+}
+
+
+# Class based ViewSet for HistoricalPerformance
+class HistoricalPerformanceViewSet(viewsets.ViewSet):
+    # Set the permission and authentication classes
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [QueryParameterTokenAuthentication]
+
+    # Method to handle listing the historical performance of a vendor
+    @swagger_auto_schema(
+        operation_id="historical-performances--list-vendor-historical-performance",
+        operation_description="List the historical performance of a vendor",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="vendor_code",
+                format="string",
+                in_=openapi.IN_PATH,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The vendor_code for the vendor",
+            ),
+            openapi.Parameter(
+                name="from",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="The earliest date of the records",
+            ),
+            openapi.Parameter(
+                name="to",
+                format="date-time",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="The latest date of the records",
+            ),
+            openapi.Parameter(
+                name="resolution",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(RESOLUTIONS),
+                required=False,
+                description=(
+                    "The raw records or the daily, weekly or monthly rollups, "
+                    "selected from the range and max_points if omitted"
+                ),
+            ),
+            openapi.Parameter(
+                name="max_points",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="The maximum number of points if the resolution is omitted",
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="The cursor of the page, taken from the next link",
+            ),
+            openapi.Parameter(
+                name="page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="The number of records per page",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Response(
+                "A page of the historical performance of the vendor, or the "
+                "selected resolution and its series if the resolution is omitted",
+                schema=HistoricalPerformanceSerializer(many=True),
+            ),
+            status.HTTP_400_BAD_REQUEST: "Bad request",
+            status.HTTP_404_NOT_FOUND: "Vendor not found",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Historical Performances"],
+    )
+    def list(self, request, vendor_code=None):
+        # Validate the query parameters
+        query_serializer = HistoricalPerformanceQuerySerializer(
+            data=request.query_params
+        )
+
+        # If the query parameters are not valid
+        if not query_serializer.is_valid():
+            return response.Response(
+                query_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get the vendor by vendor_code, with only the columns of the serializer
+        vendor = get_object_or_404(
+            Vendor.objects.only(*HistoricalPerformanceVendorSerializer.Meta.fields),
+            vendor_code=vendor_code,
+        )
+
+        # If the resolution is omitted, select it from the range
+        resolution = query_serializer.validated_data.get("resolution")
+        if resolution is None:
+            return self.list_performance_series(vendor, query_serializer.validated_data)
+
+        # If the raw records are only written when the metrics change or are
+        # compacted into packed series, carry them forward to a dense series
+        if resolution == "raw" and (
+            settings.HISTORICAL_PERFORMANCE_DELTA_MODE
+            or settings.HISTORICAL_PERFORMANCE_COLUMNAR_STORAGE
+        ):
+            return self.list_dense_series(
+                request, vendor, query_serializer.validated_data
+            )
+
+        # Get the records of the resolution, using the (vendor, date) index
+        model, serializer_class, date_field = RESOLUTIONS[resolution]
+        records = model.objects.filter(vendor=vendor)
+
+        # Limit the records to the requested range
+        if "from" in query_serializer.validated_data:
+            records = records.filter(
+                **{f"{date_field}__gte": query_serializer.validated_data["from"]}
+            )
+        if "to" in query_serializer.validated_data:
+            records = records.filter(
+                **{f"{date_field}__lte": query_serializer.validated_data["to"]}
+            )
+
+        # Get a page of the records, latest first
+        paginator = KeysetPagination(ordering=[(date_field, True), ("id", True)])
+        page = paginator.paginate_queryset(records, request)
+
+        # Every record belongs to the same vendor, avoid fetching it again
+        for record in page:
+            record.vendor = vendor
+
+        # Serialize the records
+        serializer = serializer_class(page, many=True)
+
+        # Return the response
+        return paginator.get_paginated_response(serializer.data)
+
+    # Method to list the series of a vendor at the finest resolution fitting the
+    # point budget, oldest first
+    def list_performance_series(self, vendor, parameters):
+        # Get the range of the series, from the first monthly rollup of the vendor
+        end = parameters.get("to", timezone.now())
+        start = parameters.get("from")
+        if start is None:
+            start = (
+                MonthlyPerformanceRollup.objects.filter(vendor=vendor)
+                .order_by("period_start")
+                .values_list("period_start", flat=True)
+                .first()
+            ) or end
+
+        # Get the series at the selected resolution
+        resolution, series = get_performance_series(
+            vendor.vendor_code, start, end, max_points=parameters["max_points"]
+        )
+
+        # Serialize the points of the resolution
+        if resolution == "raw":
+            serializer = HistoricalPerformancePointSerializer(series, many=True)
+        else:
+            serializer = RESOLUTIONS[resolution][1](series, many=True)
+
+        # Return the response
+        return response.Response(
+            {"resolution": resolution, "results": serializer.data},
+            status=status.HTTP_200_OK,
+        )
+
+    # Method to list the dense series of a vendor a page at a time, latest first
+    def list_dense_series(self, request, vendor, parameters):
+        # Get the range of the series
+        start = parameters.get("from", EPOCH)
+        end = parameters.get("to", timezone.now())
+
+        # Function to fetch the points before the cursor
+        def fetch(values, limit):
+            # Get the date of the cursor, if any
+            before = None
+            if values is not None:
+                try:
+                    before = parse_datetime(values[0])
+                except (TypeError, ValueError):
+                    pass
+
+                # If the cursor is not a date
+                if before is None:
+                    raise NotFound("Invalid cursor")
+
+            # Return the points
+            return get_dense_series_page(
+                vendor.vendor_code, start, end, before=before, limit=limit
+            )
+
+        # Get a page of the points, using the date of the points as the cursor
+        paginator = KeysetPagination(ordering=[("date", True)])
+        page = paginator.paginate_fetched(fetch, request)
+
+        # Serialize the points
+        serializer = HistoricalPerformancePointSerializer(page, many=True)
+
+        # Return the response
+        return paginator.get_paginated_response(serializer.data)
+
+
+# Class based ViewSet for the HistoricalPerformance analytics
+class HistoricalPerformanceAnalyticsViewSet(viewsets.ViewSet):
+    # Set the permission and authentication classes
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [QueryParameterTokenAuthentication]
+
+    # Method to handle ranking the vendors by deterioration
+    @swagger_auto_schema(
+        operation_id="historical-performances--rank-vendors",
+        operation_description="Rank the vendors by the deterioration of their metrics",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+        ],
+        query_serializer=HistoricalPerformanceAnalyticsQuerySerializer,
+        responses={
+            status.HTTP_200_OK: "The vendors ranked by deterioration",
+            status.HTTP_400_BAD_REQUEST: "Bad request",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Historical Performances"],
+    )
+    def list(self, request):
+        # Validate the query parameters
+        query_serializer = HistoricalPerformanceAnalyticsQuerySerializer(
+            data=request.query_params
+        )
+
+        # If the query parameters are not valid
+        if not query_serializer.is_valid():
+            return response.Response(
+                query_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Analyze every vendor in batch
+        parameters = query_serializer.validated_data
+        analytics = analyze_vendors(
+            days=parameters["days"],
+            window=parameters["window"],
+            alpha=parameters["alpha"],
+            threshold=parameters["threshold"],
+        )
+
+        # Return the response
+        return response.Response(
+            {
+                "vendor_count": len(analytics),
+                "results": rank_vendors(analytics, limit=parameters["limit"]),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    # Method to handle analyzing a single vendor
+    @swagger_auto_schema(
+        operation_id="historical-performances--analyze-vendor",
+        operation_description="Analyze the trend of a specific vendor's metrics",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="vendor_code",
+                format="string",
+                in_=openapi.IN_PATH,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The vendor_code for the vendor to analyze",
+            ),
+        ],
+        query_serializer=HistoricalPerformanceAnalyticsQuerySerializer,
+        responses={
+            status.HTTP_200_OK: "The analytics of the vendor",
+            status.HTTP_400_BAD_REQUEST: "Bad request",
+            status.HTTP_404_NOT_FOUND: "Vendor not found",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Historical Performances"],
+    )
+    def retrieve(self, request, vendor_code=None):
+        # Validate the query parameters
+        query_serializer = HistoricalPerformanceAnalyticsQuerySerializer(
+            data=request.query_params
+        )
+
+        # If the query parameters are not valid
+        if not query_serializer.is_valid():
+            return response.Response(
+                query_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get the vendor by vendor_code
+        vendor = get_object_or_404(Vendor, vendor_code=vendor_code)
+
+        # Analyze the vendor with its daily series
+        parameters = query_serializer.validated_data
+        analytics = analyze_vendors(
+            days=parameters["days"],
+            window=parameters["window"],
+            alpha=parameters["alpha"],
+            threshold=parameters["threshold"],
+            vendor_codes=[vendor.vendor_code],
+            include_series=True,
+        )
+
+        # If the vendor has no series yet
+        if not analytics:
+            return response.Response(
+                {"detail": "No historical performance for the vendor"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        # Return the response
+        return response.Response(analytics[0], status=status.HTTP_200_OK)
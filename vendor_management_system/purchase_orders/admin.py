@@ -1,7 +1,10 @@
 # Imports
 from django.contrib import admin
 
-from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderEvent,
+)
 
 
 # Register PurchaseOrder model in admin
@@ -61,3 +64,34 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
     ]
     ordering = ["order_date"]
     list_filter = ["status"]
+
+
+# Register PurchaseOrderEvent model in admin
+@admin.register(PurchaseOrderEvent)
+class PurchaseOrderEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "purchase_order_id",
+        "vendor_id",
+        "from_status",
+        "to_status",
+        "timestamp",
+    ]
+    search_fields = ["purchase_order__po_number", "vendor__vendor_code"]
+    fields = [
+        "purchase_order_id",
+        "vendor_id",
+        "from_status",
+        "to_status",
+        "timestamp",
+    ]
+    readonly_fields = fields
+    ordering = ["-timestamp"]
+    list_filter = ["to_status"]
+
+    # The event log is append-only
+    def has_add_permission(self, request):
+        return False
+
+    # The event log is append-only
+    def has_change_permission(self, request, obj=None):
+        return False
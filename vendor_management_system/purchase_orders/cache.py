@@ -0,0 +1,32 @@
+# Imports
+from vendor_management_system.core.cache import get_or_build_entry, invalidate
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.vendors.cache import VENDOR_IDENTITY_CACHE_PREFIX
+
+
+# Prefix of the cache keys of the purchase orders
+ORDER_CACHE_PREFIX = "purchase-orders:retrieve"
+
+
+# Function to get the cached representation of an order with its versions, building
+# it if it changed
+def get_cached_order_entry(po_number, build):
+    # Function to get the identity of the vendor nested in the representation of
+    # the order, its metrics are not nested
+    def get_dependencies():
+        return [
+            (VENDOR_IDENTITY_CACHE_PREFIX, vendor_code)
+            for vendor_code in PurchaseOrder.objects.filter(
+                po_number=po_number, vendor__isnull=False
+            ).values_list("vendor_id", flat=True)
+        ]
+
+    # Return the representation, also rebuilt when the vendor is renamed or deleted
+    return get_or_build_entry(
+        ORDER_CACHE_PREFIX, po_number, build, dependencies=get_dependencies
+    )
+
+
+# Function to invalidate the cached representation of an order
+def invalidate_order(po_number):
+    invalidate(ORDER_CACHE_PREFIX, po_number)
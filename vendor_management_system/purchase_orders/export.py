@@ -0,0 +1,138 @@
+# Imports
+import csv
+import datetime
+import json
+
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.serializers import ValidationError
+
+from vendor_management_system.purchase_orders.filters import (
+    PurchaseOrderFilterSerializer,
+    filter_purchase_orders,
+)
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+
+
+# Fields of the exported purchase orders, the vendor is exported as its code
+EXPORT_FIELDS = [
+    "po_number",
+    "vendor",
+    "order_date",
+    "expected_delivery_date",
+    "actual_delivery_date",
+    "items",
+    "quantity",
+    "status",
+    "quality_rating",
+    "issue_date",
+    "acknowledgment_date",
+]
+
+
+# Renderer for the newline delimited JSON export
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    # Method to render the responses that are not streamed, such as the errors
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data) + "\n").encode()
+
+
+# Renderer for the CSV export
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    # Method to render the responses that are not streamed, such as the errors
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data) + "\n").encode()
+
+
+# Serializer for the PurchaseOrder export query parameters
+class PurchaseOrderExportSerializer(PurchaseOrderFilterSerializer):
+    # The export is always ordered by order date then number to allow resuming
+    ordering = None
+    after_order_date = serializers.DateTimeField(
+        required=False, help_text="Order date of the last exported order"
+    )
+    after_po_number = serializers.CharField(
+        required=False, help_text="Purchase order number of the last exported order"
+    )
+
+    # Method to validate the data
+    def validate(self, data):
+        # If only one part of the watermark is given, raise a validation error
+        if ("after_order_date" in data) != ("after_po_number" in data):
+            raise ValidationError(
+                {
+                    "after_po_number": (
+                        "after_order_date and after_po_number must be given together"
+                    )
+                }
+            )
+
+        # Return the validated data
+        return data
+
+
+# Function to get the rows of the purchase orders to export
+def get_export_rows(filters, chunk_size):
+    # Get the filtered purchase orders
+    orders = filter_purchase_orders(PurchaseOrder.objects.all(), filters)
+
+    # If a watermark is given, resume after the last exported order
+    if "after_order_date" in filters:
+        orders = orders.filter(
+            Q(order_date__gt=filters["after_order_date"])
+            | Q(
+                order_date=filters["after_order_date"],
+                po_number__gt=filters["after_po_number"],
+            )
+        )
+
+    # Return the rows in index order, fetched in chunks through a server side cursor
+    return (
+        orders.order_by("order_date", "po_number")
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+# Function to format a value of an exported row
+def _format_value(value):
+    # Keep the full precision of the dates so they can be used as a watermark
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+
+    # Return the value
+    return value
+
+
+# Function to stream the rows as newline delimited JSON
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps({field: _format_value(row[field]) for field in EXPORT_FIELDS})
+        yield "\n"
+
+
+# Pseudo buffer returning what is written, for the CSV writer
+class _Echo:
+    def write(self, value):
+        return value
+
+
+# Function to stream the rows as CSV, the items are written as JSON
+def stream_csv(rows):
+    # Write the header
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    # Write the rows, with the items as JSON
+    for row in rows:
+        row["items"] = json.dumps(row["items"])
+        yield writer.writerow([_format_value(row[field]) for field in EXPORT_FIELDS])
@@ -0,0 +1,66 @@
+# Imports
+from rest_framework import serializers
+
+from vendor_management_system.purchase_orders.models import STATUS_CHOICES
+
+
+# Orderings of the purchase orders, each backed by an index ending in po_number
+ORDERINGS = {
+    "order_date": [("order_date", False), ("po_number", False)],
+    "-order_date": [("order_date", True), ("po_number", True)],
+    "expected_delivery_date": [("expected_delivery_date", False), ("po_number", False)],
+    "-expected_delivery_date": [("expected_delivery_date", True), ("po_number", True)],
+}
+
+
+# Lookups of the purchase orders, each backed by an index
+LOOKUPS = {
+    "status": "status__in",
+    "vendor": "vendor_id",
+    "order_date__gte": "order_date__gte",
+    "order_date__lte": "order_date__lte",
+    "expected_delivery_date__lt": "expected_delivery_date__lt",
+}
+
+
+# Serializer for the PurchaseOrder filter query parameters
+class PurchaseOrderFilterSerializer(serializers.Serializer):
+    status = serializers.ListField(
+        child=serializers.ChoiceField(choices=STATUS_CHOICES),
+        required=False,
+        help_text="Status of the orders, can be given multiple times",
+    )
+    vendor = serializers.CharField(
+        required=False, help_text="Vendor code of the orders"
+    )
+    order_date__gte = serializers.DateTimeField(
+        required=False, help_text="Earliest order date"
+    )
+    order_date__lte = serializers.DateTimeField(
+        required=False, help_text="Latest order date"
+    )
+    expected_delivery_date__lt = serializers.DateTimeField(
+        required=False, help_text="Expected delivery before this date"
+    )
+    ordering = serializers.ChoiceField(
+        choices=list(ORDERINGS),
+        required=False,
+        default="order_date",
+        help_text="Field to order the orders by, prefixed with - for descending",
+    )
+
+
+# Function to filter the purchase orders with the validated filters
+def filter_purchase_orders(orders, filters):
+    return orders.filter(
+        **{
+            lookup: filters[parameter]
+            for parameter, lookup in LOOKUPS.items()
+            if parameter in filters
+        }
+    )
+
+
+# Function to get the keyset ordering of the validated filters
+def get_purchase_order_ordering(filters):
+    return ORDERINGS[filters["ordering"]]
@@ -1,6 +1,7 @@
 # Imports
 import uuid
 
+from django.contrib.postgres.indexes import BrinIndex
 from django.core import validators
 from django.db import models
 
@@ -8,6 +9,16 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+# Statuses of a PurchaseOrder
+STATUS_CHOICES = [
+    ("PENDING", _("Pending")),
+    ("ISSUED", _("Issued")),
+    ("ACKNOWLEDGED", _("Acknowledged")),
+    ("DELIVERED", _("Delivered")),
+    ("CANCELLED", _("Cancelled")),
+]
+
+
 # Model for PurchaseOrder
 class PurchaseOrder(models.Model):
     # Fields
@@ -61,13 +72,7 @@ class PurchaseOrder(models.Model):
     status = models.CharField(
         _("Status"),
         max_length=20,
-        choices=[
-            ("PENDING", _("Pending")),
-            ("ISSUED", _("Issued")),
-            ("ACKNOWLEDGED", _("Acknowledged")),
-            ("DELIVERED", _("Delivered")),
-            ("CANCELLED", _("Cancelled")),
-        ],
+        choices=STATUS_CHOICES,
         default="PENDING",
         help_text=_("Status of Purchase Order"),
     )
@@ -88,17 +93,109 @@ class PurchaseOrder(models.Model):
         null=True,
         blank=True,
     )
+    updated_at = models.DateTimeField(
+        _("Updated At"),
+        help_text=_("Date of the last change of Purchase Order"),
+        auto_now=True,
+    )
 
     # Metadata
     class Meta:
         verbose_name = _("Purchase Order")
         verbose_name_plural = _("Purchase Orders")
         ordering = ["order_date"]
+        indexes = [
+            models.Index(
+                fields=["order_date", "po_number"], name="po_order_date_number_idx"
+            ),
+            models.Index(
+                fields=["vendor", "status", "order_date", "po_number"],
+                name="po_vendor_status_date_idx",
+            ),
+            models.Index(
+                fields=["status", "expected_delivery_date", "po_number"],
+                name="po_status_expected_date_idx",
+            ),
+            models.Index(
+                fields=["expected_delivery_date", "po_number"],
+                name="po_expected_date_number_idx",
+            ),
+            models.Index(
+                models.F("expected_delivery_date").desc(nulls_last=True),
+                models.F("po_number").desc(),
+                name="po_expected_date_desc_idx",
+            ),
+        ]
 
     # String representation
     def __str__(self):
         return self.po_number
 
+    # Method to create an instance from the values loaded from the database
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Create the instance
+        instance = super(PurchaseOrder, cls).from_db(db, field_names, values)
+
+        # Keep the loaded values to detect changes without querying the database
+        instance._loaded_values = dict(zip(field_names, values))
+
+        # Return the instance
+        return instance
+
+    # Method to remember the current values of the given fields as the stored state
+    def _store_loaded_values(self, fields=None):
+        # Get the attribute names of the fields to remember
+        attnames = [
+            field.attname
+            for field in self._meta.concrete_fields
+            if fields is None or field.name in fields or field.attname in fields
+        ]
+
+        # Update the stored state with the current values
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{
+                attname: getattr(self, attname)
+                for attname in attnames
+                if attname in self.__dict__
+            },
+        }
+
+    # Method to get the stored values of the given fields before a pending save
+    def get_previous_values(self, *fields):
+        # If the instance is not stored yet, there are no previous values
+        if self._state.adding:
+            return None
+
+        # Get the values loaded from the database
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        # If some of the fields were not loaded, fetch them once from the database
+        missing_fields = [field for field in fields if field not in loaded_values]
+        if missing_fields:
+            stored_values = (
+                PurchaseOrder.objects.filter(pk=self.pk).values(*missing_fields).first()
+            )
+
+            # If the instance is not stored in the database
+            if stored_values is None:
+                return None
+
+            # Remember the fetched values
+            loaded_values = self._loaded_values = {**loaded_values, **stored_values}
+
+        # Return the previous values
+        return {field: loaded_values[field] for field in fields}
+
+    # Method to reload the instance from the database
+    def refresh_from_db(self, *args, **kwargs):
+        # Reload the instance
+        super(PurchaseOrder, self).refresh_from_db(*args, **kwargs)
+
+        # Remember the reloaded values as the stored state
+        self._store_loaded_values(kwargs.get("fields"))
+
     # Save method
     def save(self, *args, **kwargs):
         # If purchase order number is not specified
@@ -113,3 +210,70 @@ class PurchaseOrder(models.Model):
 
         # Save the model
         super(PurchaseOrder, self).save(*args, **kwargs)
+
+        # Remember the saved values as the stored state
+        self._store_loaded_values(kwargs.get("update_fields"))
+
+
+# Model for PurchaseOrderEvent
+class PurchaseOrderEvent(models.Model):
+    # Fields
+    purchase_order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="events",
+        verbose_name=_("Purchase Order"),
+        help_text=_("Purchase Order whose status changed"),
+    )
+    vendor = models.ForeignKey(
+        "vendors.Vendor",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="purchase_order_events",
+        verbose_name=_("Vendor"),
+        help_text=_("Vendor of the Purchase Order at the time of the change"),
+        null=True,
+        blank=True,
+    )
+    from_status = models.CharField(
+        _("From Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        null=True,
+        blank=True,
+        help_text=_("Status of Purchase Order before the change"),
+    )
+    to_status = models.CharField(
+        _("To Status"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        help_text=_("Status of Purchase Order after the change"),
+    )
+    timestamp = models.DateTimeField(
+        _("Timestamp"),
+        help_text=_("Date of the status change"),
+        default=timezone.now,
+    )
+
+    # Metadata
+    class Meta:
+        verbose_name = _("Purchase Order Event")
+        verbose_name_plural = _("Purchase Order Events")
+        ordering = ["timestamp", "id"]
+        indexes = [
+            models.Index(
+                fields=["purchase_order", "timestamp"],
+                name="po_event_order_timestamp_idx",
+            ),
+            models.Index(
+                fields=["vendor", "timestamp"], name="po_event_vendor_timestamp_idx"
+            ),
+            BrinIndex(fields=["timestamp"], name="po_event_timestamp_brin"),
+        ]
+
+    # String representation
+    def __str__(self):
+        return f"{self.purchase_order_id}: {self.from_status} -> {self.to_status}"
@@ -1,24 +1,46 @@
 # Imports
+from django.conf import settings
 from django.utils import timezone
 
-from django.db import models
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders.cache import invalidate_order
+from vendor_management_system.purchase_orders.models import (
+    PurchaseOrder,
+    PurchaseOrderEvent,
+)
+from vendor_management_system.vendors import metrics as vendor_metrics
+from vendor_management_system.vendors.tasks import schedule_vendor_metrics_recompute
+
+
+# Create a signal to capture the tracked state of a PurchaseOrder before it is saved
+@receiver(pre_save, sender=PurchaseOrder)
+def capture_previous_state(sender, instance, **kwargs):
+    # Get the stored values of the tracked fields from the loaded state
+    instance._previous_state = instance.get_previous_values(
+        *vendor_metrics.TRACKED_FIELDS
+    )
+
+
+# Function to check if the status of a PurchaseOrder is changing between two values
+def _is_status_changing(instance, from_status, to_status):
+    # Get the previous state of the instance
+    previous_state = getattr(instance, "_previous_state", None)
+
+    # If the instance is being created
+    if previous_state is None:
+        return False
+
+    # Check if the status is changing
+    return previous_state["status"] == from_status and instance.status == to_status
 
 
 # Create a signal to set the issue_date when a PurchaseOrder is issued
 @receiver(pre_save, sender=PurchaseOrder)
 def set_issue_date(sender, instance, **kwargs):
-    try:
-        # Get the initial state of the instance before saving
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return
-
     # Check if the status is changing from PENDING to ISSUED
-    if old_instance.status == "PENDING" and instance.status == "ISSUED":
+    if _is_status_changing(instance, "PENDING", "ISSUED"):
         # Set the issue_date to the current date
         instance.issue_date = timezone.now().date()
 
@@ -26,14 +48,8 @@ def set_issue_date(sender, instance, **kwargs):
 # Create a signal to set the acknowledgment_date when a PurchaseOrder is acknowledged
 @receiver(pre_save, sender=PurchaseOrder)
 def set_acknowledgment_date(sender, instance, **kwargs):
-    try:
-        # Get the initial state of the instance before saving
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return
-
     # Check if the status is changing from ISSUED to ACKNOWLEDGED
-    if old_instance.status == "ISSUED" and instance.status == "ACKNOWLEDGED":
+    if _is_status_changing(instance, "ISSUED", "ACKNOWLEDGED"):
         # Set the acknowledgment_date to the current date
         instance.acknowledgment_date = timezone.now().date()
 
@@ -41,147 +57,68 @@ def set_acknowledgment_date(sender, instance, **kwargs):
 # Create a signal to set the actual_delivery_date when a PurchaseOrder is marked as DELIVERED
 @receiver(pre_save, sender=PurchaseOrder)
 def set_actual_delivery_date(sender, instance, **kwargs):
-    try:
-        # Get the initial state of the instance before saving
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return
-
     # Check if the status is changing from ACKNOWLEDGED to DELIVERED
-    if old_instance.status == "ACKNOWLEDGED" and instance.status == "DELIVERED":
+    if _is_status_changing(instance, "ACKNOWLEDGED", "DELIVERED"):
         # Set the actual_delivery_date to the current date
         instance.actual_delivery_date = timezone.now().date()
 
 
-# Create a signal to set the on_time_delivery_rate of the Vendor when a PurchaseOrder is marked as DELIVERED
+# Create a signal to record a PurchaseOrderEvent when the status of a PurchaseOrder changes
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_on_time_delivery_rate(sender, instance, **kwargs):
-    # Check if the instance is being updated (not created)
-    if instance.status != "PENDING":
-        # Get the vendor
-        vendor = instance.vendor
+def record_status_event(sender, instance, **kwargs):
+    # Get the previous status of the instance
+    previous_state = getattr(instance, "_previous_state", None)
+    from_status = previous_state["status"] if previous_state else None
 
-        # Get the list of all completed deliveries by the Vendor
-        completed_deliveries = PurchaseOrder.objects.filter(
-            vendor=vendor, status="DELIVERED"
-        )
+    # If the status did not change
+    if from_status == instance.status:
+        return
 
-        # Get the all the PurchaseOrders delivered on time by the Vendor
-        on_time_delivers_orders = completed_deliveries.filter(
-            actual_delivery_date__lte=models.F("expected_delivery_date")
-        )
+    # Append the status change to the event log
+    PurchaseOrderEvent.objects.create(
+        purchase_order=instance,
+        vendor_id=instance.vendor_id,
+        from_status=from_status,
+        to_status=instance.status,
+    )
 
-        if completed_deliveries.count() > 0:
-            # Calculate the on_time_delivery_rate
-            on_time_delivery_rate = (
-                on_time_delivers_orders.count() / completed_deliveries.count()
-            )
 
-            # Update the on_time_delivery_rate of the Vendor
-            vendor.on_time_delivery_rate = round(on_time_delivery_rate * 100, 4)
+# Function to apply the change of a PurchaseOrder to the metrics of its vendors
+def _apply_order_change(previous_state, current_state):
+    # If the metrics are recomputed asynchronously
+    if settings.VENDOR_METRICS_ASYNC:
+        # Schedule the recomputation of the affected vendors
+        for vendor_code in vendor_metrics.get_vendor_deltas(
+            previous_state, current_state
+        ):
+            schedule_vendor_metrics_recompute(vendor_code)
 
-            # Save the Vendor
-            vendor.save()
+    # Otherwise update the counters of the affected vendors
+    else:
+        vendor_metrics.apply_order_change(previous_state, current_state)
 
 
-# Create a signal to set the quality_rating_avg of the Vendor when a PurchaseOrder is marked as DELIVERED and is rated
+# Create a signal to update the metrics of the Vendor when a PurchaseOrder is saved
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_quality_rating_avg(sender, instance, **kwargs):
-    # Check if the instance is being updated (not created)
-    if instance.status not in ["PENDING", "CANCELLED"] and instance.vendor is not None:
-
-        # Get the vendor
-        vendor = instance.vendor
-
-        # If the vendor.quality_rating_avg is not None
-        if vendor.quality_rating_avg is not None:
-            # Check if current order is rated
-            if instance.quality_rating is not None:
-                # Calculate the quality_rating_avg
-                quality_rating_avg = (
-                    vendor.quality_rating_avg + instance.quality_rating
-                ) / 2
+def update_vendor_metrics(sender, instance, **kwargs):
+    # Apply the change of the order to the vendor counters
+    _apply_order_change(
+        getattr(instance, "_previous_state", None),
+        vendor_metrics.get_order_state(instance),
+    )
 
-                # Update the quality_rating_avg of the Vendor
-                vendor.quality_rating_avg = quality_rating_avg
 
-                # Save the Vendor
-                vendor.save()
+# Create a signal to update the metrics of the Vendor when a PurchaseOrder is deleted
+@receiver(post_delete, sender=PurchaseOrder)
+def revert_vendor_metrics(sender, instance, **kwargs):
+    # Remove the stored contribution of the order from the vendor counters
+    _apply_order_change(
+        instance.get_previous_values(*vendor_metrics.TRACKED_FIELDS), None
+    )
 
-        else:
-            # Get the list of all rated PurchaseOrders by the Vendor
-            rated_orders = PurchaseOrder.objects.filter(
-                vendor=vendor, status="DELIVERED", quality_rating__isnull=False
-            )
 
-            if rated_orders.count() > 0:
-                # Calculate the quality_rating_avg
-                quality_rating_avg = rated_orders.aggregate(
-                    avg_quality_rating=models.Avg("quality_rating")
-                )["avg_quality_rating"]
-
-                # Update the quality_rating_avg of the Vendor
-                vendor.quality_rating_avg = round(quality_rating_avg, 4)
-
-                # Save the Vendor
-                vendor.save()
-
-
-# Create a signal to set the average_response_time of the Vendor when a PurchaseOrder is marked as ACKNOWLEDGED
-@receiver(post_save, sender=PurchaseOrder)
-def update_vendor_average_response_time(sender, instance, **kwargs):
-    # Check if the instance is being updated (not created)
-    if instance.status != "PENDING":
-        # Get the vendor
-        vendor = instance.vendor
-
-        # Get the list of all acknowledged PurchaseOrders by the Vendor
-        acknowledged_orders = PurchaseOrder.objects.filter(
-            vendor=vendor, status="ACKNOWLEDGED"
-        )
-
-        if acknowledged_orders.count() > 0:
-            # Calculate the average_response_time
-            total_response_time = sum(
-                (
-                    (order.acknowledgment_date - order.issue_date).total_seconds()
-                    / 3600
-                    for order in acknowledged_orders
-                )
-            )
-            average_response_time = total_response_time / acknowledged_orders.count()
-
-            # Update the average_response_time of the Vendor
-            vendor.average_response_time = round(average_response_time, 4)
-
-            # Save the Vendor
-            vendor.save()
-
-
-# Create a signal to set the fulfillment_rate of the Vendor when a PurchaseOrder is marked as DELIVERED
+# Create a signal to invalidate the cached PurchaseOrder when it is saved or deleted
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_fulfillment_rate(sender, instance, **kwargs):
-    # Check if the instance being updated (not created)
-    if instance.status != "PENDING":
-        # Get the vendor
-        vendor = instance.vendor
-
-        # Get the list of all completed deliveries by the Vendor
-        completed_deliveries = PurchaseOrder.objects.filter(
-            vendor=vendor, status="DELIVERED"
-        )
-
-        # Issued orders
-        issued_orders = PurchaseOrder.objects.filter(
-            vendor=vendor, issue_date__isnull=False
-        )
-
-        if issued_orders.count() > 0:
-            # Calculate the fulfillment_rate
-            fulfillment_rate = completed_deliveries.count() / issued_orders.count()
-
-            # Update the fulfillment_rate of the Vendor
-            vendor.fulfillment_rate = round(fulfillment_rate * 100, 4)
-
-            # Save the Vendor
-            vendor.save()
+@receiver(post_delete, sender=PurchaseOrder)
+def invalidate_cached_order(sender, instance, **kwargs):
+    invalidate_order(instance.po_number)
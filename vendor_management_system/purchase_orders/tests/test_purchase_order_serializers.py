@@ -0,0 +1,119 @@
+# Imports
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from vendor_management_system.core.serializers import ValuesSerializer
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.purchase_orders.serializers import (
+    PurchaseOrderListSerializer,
+)
+
+
+# Test that the values serializer renders the same bytes as the model serializer
+@pytest.mark.django_db
+def test_values_serializer_matches_model_serializer(db, purchase_order_factory):
+    # Create PurchaseOrder objects, with and without vendors
+    purchase_order_factory(status="PENDING")
+    purchase_order_factory(status="DELIVERED")
+    purchase_order_factory.create_batch(5)
+
+    # Serialize the orders with both serializers
+    serializer = ValuesSerializer(PurchaseOrderListSerializer)
+    orders = PurchaseOrder.objects.order_by("po_number")
+    expected = PurchaseOrderListSerializer(orders, many=True).data
+    rows = serializer.serialize(orders.values(*serializer.columns))
+
+    # Check that the rendered output is identical
+    assert JSONRenderer().render(rows) == JSONRenderer().render(expected)
+
+
+# Test that the values serializer only selects and returns the requested fields
+@pytest.mark.django_db
+def test_values_serializer_sparse_fields(db, purchase_order_factory):
+    # Create a PurchaseOrder object
+    order = purchase_order_factory(status="ISSUED")
+
+    # Serialize the order with some of the fields
+    serializer = ValuesSerializer(
+        PurchaseOrderListSerializer, fields=("po_number", "vendor")
+    )
+    rows = serializer.serialize(PurchaseOrder.objects.values(*serializer.columns))
+
+    # Check the columns and the output
+    assert serializer.columns == [
+        "po_number",
+        "vendor",
+        "vendor__vendor_code",
+        "vendor__name",
+    ]
+    assert rows == [
+        {
+            "po_number": order.po_number,
+            "vendor": {
+                "vendor_code": order.vendor.vendor_code,
+                "name": order.vendor.name,
+            },
+        }
+    ]
+
+
+# Test that the values serializer renders a 10k row page as the model serializer
+@pytest.mark.django_db
+def test_values_serializer_large_page(db, purchase_order_factory):
+    # Build 10k orders in memory, sharing 100 vendors, and their rows
+    orders = purchase_order_factory.build_batch(100, status="ISSUED") * 100
+    serializer = ValuesSerializer(PurchaseOrderListSerializer)
+    rows = [
+        {
+            "po_number": order.po_number,
+            "vendor": order.vendor.vendor_code,
+            "vendor__vendor_code": order.vendor.vendor_code,
+            "vendor__name": order.vendor.name,
+            "order_date": order.order_date,
+            "expected_delivery_date": order.expected_delivery_date,
+            "quantity": order.quantity,
+            "status": order.status,
+            "quality_rating": order.quality_rating,
+        }
+        for order in orders
+    ]
+
+    # Check that the output is identical
+    values_output = JSONRenderer().render(serializer.serialize(rows))
+    model_output = JSONRenderer().render(
+        PurchaseOrderListSerializer(orders, many=True).data
+    )
+    assert values_output == model_output
+
+
+# Benchmark the values serializer against the model serializer on a 10k row page
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_values_serializer_throughput(db, purchase_order_factory):
+    # Create PurchaseOrder objects and load a 10k row page of them, as the model
+    # instances and as the values rows read from the database
+    purchase_order_factory.create_batch(100, status="ISSUED")
+    serializer = ValuesSerializer(PurchaseOrderListSerializer)
+    orders = list(PurchaseOrder.objects.select_related("vendor")) * 100
+    rows = list(PurchaseOrder.objects.values(*serializer.columns)) * 100
+
+    # Function to get the best time of a few runs of a serialization
+    def measure(serialize):
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    # Measure both serializers
+    model_time = measure(lambda: PurchaseOrderListSerializer(orders, many=True).data)
+    values_time = measure(lambda: serializer.serialize(rows))
+
+    # Check that the values serializer has at least 3x the throughput
+    assert model_time >= 3 * values_time, (
+        f"{model_time:.3f}s with the model serializer but {values_time:.3f}s "
+        f"with the values serializer"
+    )
@@ -0,0 +1,398 @@
+# Imports
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+
+
+# Test the keyset paginated purchase order list
+@pytest.mark.django_db
+def test_list_purchase_orders(db, admin_user, purchase_order_factory):
+    # Create PurchaseOrder objects, some sharing the same order date
+    order_date = timezone.now()
+    orders = [
+        purchase_order_factory(order_date=order_date if index < 4 else timezone.now())
+        for index in range(7)
+    ]
+
+    # Fetch every page
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    response = client.get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "page_size": 3},
+    )
+    po_numbers = []
+    while True:
+        assert response.status_code == 200
+        assert len(response.data["results"]) <= 3
+        po_numbers += [order["po_number"] for order in response.data["results"]]
+        if response.data["next"] is None:
+            break
+        response = client.get(response.data["next"])
+
+    # Check that every order is listed once, by order date then number
+    orders.sort(key=lambda order: (order.order_date, order.po_number))
+    assert po_numbers == [order.po_number for order in orders]
+
+
+# Test that listing purchase orders does not query the vendors per order
+@pytest.mark.django_db
+def test_list_purchase_orders_queries(
+    db, admin_user, purchase_order_factory, assert_constant_queries
+):
+    # Create PurchaseOrder objects with their own vendors
+    purchase_order_factory.create_batch(10)
+
+    # Function to fetch a page of the purchase orders
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+
+    def fetch_page(page_size):
+        response = client.get(
+            reverse("purchase_orders--list-create-order"),
+            {"token": token.key, "page_size": page_size},
+        )
+        assert len(response.data["results"]) == page_size
+
+    # Check that the number of queries does not depend on the page size
+    assert_constant_queries(fetch_page)
+
+
+# Test that retrieving a purchase order loads its vendor in the same query
+@pytest.mark.django_db
+def test_retrieve_purchase_order_queries(
+    db, admin_user, purchase_order_factory, assert_num_queries
+):
+    # Create a PurchaseOrder object
+    order = purchase_order_factory(status="ISSUED")
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "purchase_orders--retrieve-update-destroy-order",
+        kwargs={"po_number": order.po_number},
+    )
+
+    # Retrieve the order, one query authenticates, one gets the vendor of the cache
+    # entry and one loads the order with its vendor
+    with assert_num_queries(3):
+        response = APIClient().get(url, {"token": token.key})
+
+    # Check the nested vendor
+    assert response.status_code == 200
+    assert response.data["vendor"] == {
+        "vendor_code": order.vendor.vendor_code,
+        "name": order.vendor.name,
+    }
+
+    # Retrieve the order again, the authentication, the order and its ETag are
+    # served from the cache without querying the database
+    with assert_num_queries(0):
+        cached_response = APIClient().get(url, {"token": token.key})
+    assert cached_response.data == response.data
+
+
+# Test that the cached purchase order follows the changes of the order and its vendor
+@pytest.mark.django_db
+def test_retrieve_purchase_order_cache_invalidation(
+    db, admin_user, purchase_order_factory, django_capture_on_commit_callbacks
+):
+    # Create a PurchaseOrder object and cache it
+    order = purchase_order_factory(status="ISSUED")
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "purchase_orders--retrieve-update-destroy-order",
+        kwargs={"po_number": order.po_number},
+    )
+    APIClient().get(url, {"token": token.key})
+
+    # Change the quantity of the order and the name of its vendor
+    with django_capture_on_commit_callbacks(execute=True):
+        order.quantity += 1
+        order.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        order.vendor.name = "Renamed Vendor"
+        order.vendor.save()
+
+    # Check that both changes are returned
+    response = APIClient().get(url, {"token": token.key})
+    assert response.data["quantity"] == order.quantity
+    assert response.data["vendor"]["name"] == "Renamed Vendor"
+
+
+# Test that the cached purchase order is kept when only the metrics of its vendor
+# change, they are not nested in the order
+@pytest.mark.django_db
+def test_retrieve_purchase_order_cache_vendor_metrics(
+    db,
+    admin_user,
+    purchase_order_factory,
+    django_capture_on_commit_callbacks,
+    assert_num_queries,
+):
+    # Create PurchaseOrder objects of the same vendor and cache one of them
+    order = purchase_order_factory(status="ISSUED")
+    other_order = purchase_order_factory(status="ISSUED", vendor=order.vendor)
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse(
+        "purchase_orders--retrieve-update-destroy-order",
+        kwargs={"po_number": order.po_number},
+    )
+    etag = client.get(url, {"token": token.key})["ETag"]
+
+    # Deliver the other order, which changes the metrics of the vendor
+    with django_capture_on_commit_callbacks(execute=True):
+        other_order.status = "DELIVERED"
+        other_order.save()
+
+    # Check that the cached order is still served without querying the database
+    with assert_num_queries(0):
+        response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    # Rename the vendor
+    with django_capture_on_commit_callbacks(execute=True):
+        order.vendor.name = "Renamed Vendor"
+        order.vendor.save(update_fields=["name", "updated_at"])
+
+    # Check that the order is sent again with the new name
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["vendor"]["name"] == "Renamed Vendor"
+
+
+# Test filtering the purchase order list
+@pytest.mark.django_db
+def test_filter_purchase_orders(db, admin_user, vendor_factory, purchase_order_factory):
+    # Create PurchaseOrder objects with different statuses and vendors, the pending
+    # orders have no vendor by default
+    vendor = vendor_factory()
+    pending = purchase_order_factory(status="PENDING", vendor=vendor)
+    issued = purchase_order_factory(status="ISSUED", vendor=vendor)
+    purchase_order_factory(status="ISSUED", vendor=vendor_factory())
+    token = Token.objects.create(user=admin_user)
+
+    # List the issued orders of the vendor
+    response = APIClient().get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "status": "ISSUED", "vendor": vendor.vendor_code},
+    )
+
+    # Check that only the matching order is listed
+    assert response.status_code == 200
+    assert [order["po_number"] for order in response.data["results"]] == [
+        issued.po_number
+    ]
+
+    # List the orders of both statuses of the vendor
+    response = APIClient().get(
+        reverse("purchase_orders--list-create-order"),
+        {
+            "token": token.key,
+            "status": ["PENDING", "ISSUED"],
+            "vendor": vendor.vendor_code,
+        },
+    )
+
+    # Check that both orders are listed
+    assert response.status_code == 200
+    assert {order["po_number"] for order in response.data["results"]} == {
+        pending.po_number,
+        issued.po_number,
+    }
+
+
+# Test ordering the purchase order list by a nullable field across pages
+@pytest.mark.django_db
+def test_order_purchase_orders_by_expected_delivery_date(
+    db, admin_user, purchase_order_factory
+):
+    # Create PurchaseOrder objects, some without an expected delivery date
+    orders = purchase_order_factory.create_batch(7)
+    PurchaseOrder.objects.filter(
+        po_number__in=[order.po_number for order in orders[:3]]
+    ).update(expected_delivery_date=None)
+
+    # Fetch every page in descending order of the expected delivery date
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    response = client.get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "page_size": 2, "ordering": "-expected_delivery_date"},
+    )
+    po_numbers = []
+    while True:
+        assert response.status_code == 200
+        po_numbers += [order["po_number"] for order in response.data["results"]]
+        if response.data["next"] is None:
+            break
+        response = client.get(response.data["next"])
+
+    # Check that every order is listed once, the orders without a date last
+    expected = sorted(
+        PurchaseOrder.objects.exclude(expected_delivery_date=None),
+        key=lambda order: (order.expected_delivery_date, order.po_number),
+        reverse=True,
+    ) + sorted(
+        PurchaseOrder.objects.filter(expected_delivery_date=None),
+        key=lambda order: order.po_number,
+        reverse=True,
+    )
+    assert po_numbers == [order.po_number for order in expected]
+
+
+# Test that the purchase order list rejects an unknown ordering
+@pytest.mark.django_db
+def test_list_purchase_orders_invalid_ordering(db, admin_user):
+    # List the orders with an ordering that is not indexed
+    token = Token.objects.create(user=admin_user)
+    response = APIClient().get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "ordering": "quantity"},
+    )
+
+    # Check the response
+    assert response.status_code == 400
+    assert "ordering" in response.data
+
+
+# Test streaming the purchase order export and resuming it from a watermark
+@pytest.mark.django_db
+def test_export_purchase_orders(db, admin_user, vendor_factory, purchase_order_factory):
+    # Create issued PurchaseOrder objects of a vendor, some sharing the same order date
+    vendor = vendor_factory()
+    order_date = timezone.now()
+    orders = [
+        purchase_order_factory(
+            status="ISSUED",
+            vendor=vendor,
+            order_date=order_date if index < 3 else timezone.now(),
+        )
+        for index in range(5)
+    ]
+    orders.sort(key=lambda order: (order.order_date, order.po_number))
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+
+    # Export the orders as NDJSON
+    response = client.get(
+        reverse("purchase_orders--export-orders"), {"token": token.key}
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("application/x-ndjson")
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).decode().splitlines()
+    ]
+
+    # Check that every order is exported in order with its vendor code
+    assert [row["po_number"] for row in rows] == [order.po_number for order in orders]
+    assert rows[0]["vendor"] == vendor.vendor_code
+    assert rows[0]["items"] == orders[0].items
+
+    # Resume the export after the second order
+    response = client.get(
+        reverse("purchase_orders--export-orders"),
+        {
+            "token": token.key,
+            "format": "csv",
+            "after_order_date": rows[1]["order_date"],
+            "after_po_number": rows[1]["po_number"],
+        },
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/csv")
+    reader = csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+
+    # Check that only the remaining orders are exported
+    assert [row["po_number"] for row in reader] == [
+        order.po_number for order in orders[2:]
+    ]
+
+
+# Test that the purchase order export requires both parts of the watermark
+@pytest.mark.django_db
+def test_export_purchase_orders_partial_watermark(db, admin_user):
+    # Export the orders with only the order date of the watermark
+    token = Token.objects.create(user=admin_user)
+    response = APIClient().get(
+        reverse("purchase_orders--export-orders"),
+        {"token": token.key, "after_order_date": timezone.now().isoformat()},
+    )
+
+    # Check the response
+    assert response.status_code == 400
+
+
+# Test listing only some of the fields of the purchase orders
+@pytest.mark.django_db
+def test_list_purchase_orders_fields(db, admin_user, purchase_order_factory):
+    # Create PurchaseOrder objects
+    purchase_order_factory.create_batch(3)
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+
+    # List the orders with some of the fields, across pages
+    response = client.get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "fields": "po_number,status", "page_size": 2},
+    )
+    assert response.status_code == 200
+    results = response.data["results"]
+    results += client.get(response.data["next"]).data["results"]
+
+    # Check that only the requested fields are returned
+    assert len(results) == 3
+    assert all(set(order) == {"po_number", "status"} for order in results)
+
+    # List the orders with an unknown field
+    response = client.get(
+        reverse("purchase_orders--list-create-order"),
+        {"token": token.key, "fields": "po_number,items"},
+    )
+
+    # Check the response
+    assert response.status_code == 400
+    assert "fields" in response.data
+
+
+# Test the conditional GET of the purchase order list
+@pytest.mark.django_db
+def test_list_purchase_orders_etag(
+    db, admin_user, purchase_order_factory, assert_num_queries
+):
+    # Create PurchaseOrder objects and list them
+    order = purchase_order_factory(status="ISSUED")
+    purchase_order_factory.create_batch(2)
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse("purchase_orders--list-create-order")
+    response = client.get(url, {"token": token.key})
+    etag = response["ETag"]
+
+    # Check that the unchanged list is not sent again, the ETag is built from the
+    # page itself without querying every order
+    with assert_num_queries(1):
+        response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    # Check that another page or set of fields has another ETag
+    response = client.get(url, {"token": token.key, "fields": "po_number"})
+    assert response["ETag"] != etag
+
+    # Rename the vendor of an order
+    order.vendor.name = "Renamed Vendor"
+    order.vendor.save()
+
+    # Check that the list is sent again with a new ETag
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
@@ -1,7 +1,10 @@
 # Imports
 from django.urls import path
 
-from vendor_management_system.purchase_orders.views import PurchaseOrderViewSet
+from vendor_management_system.purchase_orders.views import (
+    PurchaseOrderExportViewSet,
+    PurchaseOrderViewSet,
+)
 
 
 # Define the URL patterns for the purchase_orders app
@@ -11,6 +14,11 @@ urlpatterns = [
         PurchaseOrderViewSet.as_view({"get": "list", "post": "create"}),
         name="purchase_orders--list-create-order",
     ),
+    path(
+        "export/",
+        PurchaseOrderExportViewSet.as_view({"get": "export"}),
+        name="purchase_orders--export-orders",
+    ),
     path(
         "<po_number>/",
         PurchaseOrderViewSet.as_view(
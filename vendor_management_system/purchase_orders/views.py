@@ -1,4 +1,6 @@
 # Imports
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_yasg import openapi
@@ -8,7 +10,31 @@ from rest_framework import permissions, response, status, viewsets
 from vendor_management_system.core.authentication import (
     QueryParameterTokenAuthentication,
 )
+from vendor_management_system.core.conditional import (
+    get_entry_etag,
+    get_list_etag,
+    respond_conditionally,
+)
+from vendor_management_system.core.pagination import KeysetPagination
+from vendor_management_system.core.serializers import (
+    get_requested_fields,
+    get_values_serializer,
+)
 
+from vendor_management_system.purchase_orders.cache import get_cached_order_entry
+from vendor_management_system.purchase_orders.export import (
+    CSVRenderer,
+    NDJSONRenderer,
+    PurchaseOrderExportSerializer,
+    get_export_rows,
+    stream_csv,
+    stream_ndjson,
+)
+from vendor_management_system.purchase_orders.filters import (
+    PurchaseOrderFilterSerializer,
+    filter_purchase_orders,
+    get_purchase_order_ordering,
+)
 from vendor_management_system.purchase_orders.models import PurchaseOrder
 from vendor_management_system.purchase_orders.serializers import (
     PurchaseOrderCreateUpdateSerializer,
@@ -16,11 +42,25 @@ from vendor_management_system.purchase_orders.serializers import (
     PurchaseOrderOnlyVendorSerializer,
     PurchaseOrderSerializer,
     PurchaseOrderSetQualityRatingSerializer,
+    PurchaseOrderVendorSerializer,
 )
 
 from vendor_management_system.vendors.models import Vendor
 
 
+# Function to get the purchase orders with the vendor columns of the nested serializer
+def get_orders_with_vendor():
+    return PurchaseOrder.objects.select_related("vendor").only(
+        *(field.name for field in PurchaseOrder._meta.concrete_fields),
+        *(f"vendor__{field}" for field in PurchaseOrderVendorSerializer.Meta.fields),
+    )
+
+
+# Function to get the vendors with only the columns of the nested serializer
+def get_order_vendors():
+    return Vendor.objects.only(*PurchaseOrderVendorSerializer.Meta.fields)
+
+
 # Class based ViewSet for PurchaseOrder
 class PurchaseOrderViewSet(viewsets.ViewSet):
     # Set the permission and authentication classes
@@ -39,25 +79,74 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
                 type=openapi.TYPE_STRING,
                 required=True,
                 description="The token to authenticate the user",
-            )
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="The cursor of the page, taken from the next link",
+            ),
+            openapi.Parameter(
+                name="page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="The number of purchase orders per page",
+            ),
+            openapi.Parameter(
+                name="fields",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Comma separated fields to return, all by default",
+            ),
         ],
+        query_serializer=PurchaseOrderFilterSerializer,
         responses={
             status.HTTP_200_OK: openapi.Response(
-                "List of all purchase orders", schema=PurchaseOrderSerializer(many=True)
+                "A page of the purchase orders",
+                schema=PurchaseOrderSerializer(many=True),
             ),
+            status.HTTP_400_BAD_REQUEST: "Bad request",
             status.HTTP_401_UNAUTHORIZED: "Unauthorized",
         },
         tags=["Purchase Orders"],
     )
     def list(self, request):
-        # Get all purchase orders
-        orders = PurchaseOrder.objects.all()
+        # Validate the filters
+        filter_serializer = PurchaseOrderFilterSerializer(data=request.query_params)
+
+        # If the filters are not valid
+        if not filter_serializer.is_valid():
+            return response.Response(
+                filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get the serializer of the requested fields
+        serializer = get_values_serializer(
+            PurchaseOrderListSerializer,
+            get_requested_fields(request, PurchaseOrderListSerializer),
+        )
+
+        # Get the columns of the filtered purchase orders and of their ordering
+        ordering = get_purchase_order_ordering(filter_serializer.validated_data)
+        columns = dict.fromkeys(serializer.columns + [field for field, _ in ordering])
+        orders = filter_purchase_orders(
+            PurchaseOrder.objects.values(*columns), filter_serializer.validated_data
+        )
 
-        # Serialize the purchase orders
-        serializer = PurchaseOrderListSerializer(orders, many=True)
+        # Get a page of the purchase orders in the requested order
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(orders, request)
 
-        # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Get the response, serialized straight from the rows
+        list_response = paginator.get_paginated_response(serializer.serialize(page))
+
+        # Return the response, not modified if the client already has the page
+        return respond_conditionally(
+            request, get_list_etag(request, list_response.data), list_response
+        )
 
     # Method to handle new purchase order creation
     @swagger_auto_schema(
@@ -145,14 +234,21 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
         tags=["Purchase Orders"],
     )
     def retrieve(self, request, po_number=None):
-        # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
-
-        # Serialize the purchase order
-        serializer = PurchaseOrderSerializer(order)
-
-        # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Function to serialize the order from the database
+        def build():
+            return PurchaseOrderSerializer(
+                get_object_or_404(get_orders_with_vendor(), po_number=po_number)
+            ).data
+
+        # Get the serialized order, from the cache unless it or its vendor changed
+        entry = get_cached_order_entry(po_number, build)
+
+        # Return the response, not modified if the client already has the order
+        return respond_conditionally(
+            request,
+            get_entry_etag(entry),
+            response.Response(entry["value"], status=status.HTTP_200_OK),
+        )
 
     # Method to handle updating a purchase order
     @swagger_auto_schema(
@@ -189,7 +285,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def update(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # Deserialize and validate the data
         order_create_serializer = PurchaseOrderCreateUpdateSerializer(
@@ -203,7 +299,9 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
 
             # Get the vendor and serialize the data
             if "vendor" in validated_data:
-                vendor = get_object_or_404(Vendor, vendor_code=validated_data["vendor"])
+                vendor = get_object_or_404(
+                    get_order_vendors(), vendor_code=validated_data["vendor"]
+                )
             else:
                 vendor = order.vendor
 
@@ -303,7 +401,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def issue(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # If the order is already issued
         if order.status in ["ISSUED", "ACKNOWLEDGED", "DELIVERED", "CANCELLED"]:
@@ -319,7 +417,8 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
         if issue_serializer.is_valid():
             # Get the vendor and serialize the data
             vendor = get_object_or_404(
-                Vendor, vendor_code=issue_serializer.validated_data["vendor"]
+                get_order_vendors(),
+                vendor_code=issue_serializer.validated_data["vendor"],
             )
 
             # Set the vendor
@@ -376,7 +475,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def acknowledge(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # If the order is not issued
         if order.status in ["PENDING"]:
@@ -458,7 +557,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def deliver(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # If the order is not acknowledged
         if order.status in ["PENDING", "ISSUED"]:
@@ -539,7 +638,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def cancel(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # If the order is already delivered
         if order.status in ["DELIVERED", "CANCELLED"]:
@@ -612,7 +711,7 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
     )
     def rate_quality(self, request, po_number=None):
         # Get the order by po_number
-        order = get_object_or_404(PurchaseOrder, po_number=po_number)
+        order = get_object_or_404(get_orders_with_vendor(), po_number=po_number)
 
         # If the order is not delivered
         if order.status in ["PENDING", "ISSUED", "ACKNOWLEDGED"]:
@@ -660,3 +759,73 @@ class PurchaseOrderViewSet(viewsets.ViewSet):
         return response.Response(
             rate_quality_serializer.errors, status=status.HTTP_400_BAD_REQUEST
         )
+
+
+# Class based ViewSet for the PurchaseOrder export
+class PurchaseOrderExportViewSet(viewsets.ViewSet):
+    # Set the permission, authentication and renderer classes
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [QueryParameterTokenAuthentication]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    # Method to handle exporting the purchase orders
+    @swagger_auto_schema(
+        operation_id="purchase_orders--export-orders",
+        operation_description="Stream the purchase orders as NDJSON or CSV",
+        manual_parameters=[
+            openapi.Parameter(
+                name="token",
+                format="string",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=True,
+                description="The token to authenticate the user",
+            ),
+            openapi.Parameter(
+                name="format",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["ndjson", "csv"],
+                required=False,
+                description="The format of the export, ndjson by default",
+            ),
+        ],
+        query_serializer=PurchaseOrderExportSerializer,
+        responses={
+            status.HTTP_200_OK: "The purchase orders by order date then number",
+            status.HTTP_400_BAD_REQUEST: "Bad request",
+            status.HTTP_401_UNAUTHORIZED: "Unauthorized",
+        },
+        tags=["Purchase Orders"],
+    )
+    def export(self, request):
+        # Validate the filters
+        filter_serializer = PurchaseOrderExportSerializer(data=request.query_params)
+
+        # If the filters are not valid
+        if not filter_serializer.is_valid():
+            return response.Response(
+                filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get the rows, they are fetched lazily while the response is streamed
+        rows = get_export_rows(
+            filter_serializer.validated_data,
+            chunk_size=settings.PURCHASE_ORDER_EXPORT_CHUNK_SIZE,
+        )
+
+        # Get the stream of the requested format
+        renderer = request.accepted_renderer
+        if renderer.format == "csv":
+            content = stream_csv(rows)
+        else:
+            content = stream_ndjson(rows)
+
+        # Return the streaming response
+        export_response = StreamingHttpResponse(
+            content, content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        export_response["Content-Disposition"] = (
+            f'attachment; filename="purchase-orders.{renderer.format}"'
+        )
+        return export_response
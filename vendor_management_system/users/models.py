@@ -3,7 +3,7 @@ import uuid
 from typing import ClassVar
 
 from django.contrib.auth.models import AbstractUser
-from django.db.models import CharField, EmailField
+from django.db.models import CharField, DateTimeField, EmailField
 from django.utils.translation import gettext_lazy as _
 
 from vendor_management_system.users.managers import UserManager
@@ -18,6 +18,9 @@ class User(AbstractUser):
     last_name = None
     email = EmailField(_("Email Address"), unique=True)
     username = None
+    updated_at = DateTimeField(
+        _("Updated At"), help_text=_("Date of the last change of User"), auto_now=True
+    )
 
     # Username Field
     USERNAME_FIELD = "email"
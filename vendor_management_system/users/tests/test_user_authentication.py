@@ -0,0 +1,72 @@
+# Imports
+import pytest
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from vendor_management_system.core.authentication import (
+    QueryParameterTokenAuthentication,
+)
+
+
+# Test that the credentials of a token are authenticated from the caches
+@pytest.mark.django_db
+def test_authentication_cached(db, admin_user, django_assert_num_queries):
+    # Authenticate a token once
+    token = Token.objects.create(user=admin_user)
+    authentication = QueryParameterTokenAuthentication()
+    authentication.authenticate_credentials(token.key)
+
+    # Check that authenticating it again does not query the database
+    with django_assert_num_queries(0):
+        user, _ = authentication.authenticate_credentials(token.key)
+    assert str(user.pk) == str(admin_user.pk)
+
+
+# Test that the cached credentials are invalidated when the user is deactivated
+@pytest.mark.django_db
+def test_authentication_cache_user_deactivated(
+    db, admin_user, django_capture_on_commit_callbacks
+):
+    # Authenticate a token
+    token = Token.objects.create(user=admin_user)
+    authentication = QueryParameterTokenAuthentication()
+    authentication.authenticate_credentials(token.key)
+
+    # Deactivate the user
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_user.is_active = False
+        admin_user.save()
+
+    # Check that the token is not authenticated anymore
+    with pytest.raises(AuthenticationFailed):
+        authentication.authenticate_credentials(token.key)
+
+
+# Test that the cached credentials are invalidated when the token is deleted
+@pytest.mark.django_db
+def test_authentication_cache_token_deleted(
+    db, admin_user, django_capture_on_commit_callbacks
+):
+    # Authenticate a token, keeping its key as the deleted token loses it
+    token = Token.objects.create(user=admin_user)
+    key = token.key
+    authentication = QueryParameterTokenAuthentication()
+    authentication.authenticate_credentials(key)
+
+    # Delete the token
+    with django_capture_on_commit_callbacks(execute=True):
+        token.delete()
+
+    # Check that the token is not authenticated anymore
+    with pytest.raises(AuthenticationFailed):
+        authentication.authenticate_credentials(key)
+
+
+# Test that an empty token is rejected before it is looked up
+@pytest.mark.django_db
+def test_authentication_empty_token(db, django_assert_num_queries):
+    # Check that an empty or missing token fails without querying the database
+    authentication = QueryParameterTokenAuthentication()
+    for key in ["", None]:
+        with django_assert_num_queries(0), pytest.raises(AuthenticationFailed):
+            authentication.authenticate_credentials(key)
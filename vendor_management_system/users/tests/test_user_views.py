@@ -0,0 +1,64 @@
+# Imports
+import pytest
+from django.contrib.auth.models import update_last_login
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vendor_management_system.users.models import User
+
+
+# Test the conditional GET of a user, which changes with its last login
+@pytest.mark.django_db
+def test_retrieve_user_etag(db, admin_user):
+    # Retrieve the user
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse("users--retrieve-user", kwargs={"email": admin_user.email})
+    etag = client.get(url, {"token": token.key})["ETag"]
+
+    # Check that the unchanged user is not sent again
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    # Log the user in, which only saves the last login
+    update_last_login(None, admin_user)
+
+    # Check that the user is sent again with a new ETag
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+# Test the conditional GET of the user list, which changes with the last logins
+@pytest.mark.django_db
+def test_list_users_etag(db, admin_user):
+    # List the users
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse("users--list-users")
+    etag = client.get(url, {"token": token.key})["ETag"]
+
+    # Check that the unchanged list is not sent again
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    # Log the user in, which only saves the last login
+    update_last_login(None, admin_user)
+
+    # Check that the list is sent again with a new ETag
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    etag = response["ETag"]
+
+    # Check that a new user changes the ETag
+    User.object.create_user(
+        name="Test User",
+        email="testuser@example.com",
+        password="Test-R@nd0m-P@ssw0rd",
+    )
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
@@ -1,5 +1,7 @@
 # Imports
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, response, status, viewsets
@@ -7,11 +9,31 @@ from rest_framework import permissions, response, status, viewsets
 from vendor_management_system.core.authentication import (
     QueryParameterTokenAuthentication,
 )
+from vendor_management_system.core.conditional import (
+    get_list_etag,
+    make_etag,
+    respond_conditionally,
+)
+from vendor_management_system.core.serializers import (
+    get_requested_fields,
+    get_values_serializer,
+)
 
 from vendor_management_system.users.models import User
 from vendor_management_system.users.serializers import UserSerializer
 
 
+# Function to get the ETag of a user from its last change and login
+def get_user_etag(request, email=None):
+    # Get the last change and login of the user, a login does not change the user
+    versions = (
+        User.objects.filter(email=email).values_list("updated_at", "last_login").first()
+    )
+
+    # Return the ETag, None if the user does not exist
+    return None if versions is None else make_etag(email, *versions)
+
+
 # Class based ViewSet for User
 class UserViewSet(viewsets.ViewSet):
     # Set the permission and authentication classes
@@ -30,25 +52,42 @@ class UserViewSet(viewsets.ViewSet):
                 type=openapi.TYPE_STRING,
                 required=True,
                 description="The token to authenticate the user",
-            )
+            ),
+            openapi.Parameter(
+                name="fields",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Comma separated fields to return, all by default",
+            ),
         ],
         responses={
             status.HTTP_200_OK: openapi.Response(
                 "List of all users", schema=UserSerializer(many=True)
             ),
+            status.HTTP_400_BAD_REQUEST: "Bad request",
             status.HTTP_401_UNAUTHORIZED: "Unauthorized",
         },
         tags=["Users"],
     )
     def list(self, request):
-        # Get all users
-        users = User.objects.all()
+        # Get the serializer of the requested fields
+        serializer = get_values_serializer(
+            UserSerializer, get_requested_fields(request, UserSerializer)
+        )
 
-        # Serialize the users
-        serializer = UserSerializer(users, many=True)
+        # Get the columns of all users
+        users = User.objects.values(*serializer.columns)
 
-        # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Get the response, serialized straight from the rows
+        list_response = response.Response(
+            serializer.serialize(users), status=status.HTTP_200_OK
+        )
+
+        # Return the response, not modified if the client already has the users
+        return respond_conditionally(
+            request, get_list_etag(request, list_response.data), list_response
+        )
 
     # Method to handle retrieving a single user
     @swagger_auto_schema(
@@ -79,6 +118,7 @@ class UserViewSet(viewsets.ViewSet):
         },
         tags=["Users"],
     )
+    @method_decorator(condition(etag_func=get_user_etag))
     def retrieve(self, request, email=None):
         # Get the user by email
         user = get_object_or_404(User, email=email)
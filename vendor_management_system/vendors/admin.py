@@ -1,6 +1,10 @@
 # Imports
 from django.contrib import admin
 
+from vendor_management_system.vendors.metrics import (
+    iterate_vendor_batches,
+    recompute_vendors_metrics,
+)
 from vendor_management_system.vendors.models import Vendor
 
 
@@ -10,6 +14,7 @@ class VendorAdmin(admin.ModelAdmin):
     list_display = ["name", "vendor_code"]
     search_fields = ["name", "vendor_code"]
     ordering = ["name"]
+    actions = ["rebuild_performance_metrics"]
     fieldsets = (
         (
             None,
@@ -33,12 +38,57 @@ class VendorAdmin(admin.ModelAdmin):
                 )
             },
         ),
+        (
+            "Performance Counters",
+            {
+                "fields": (
+                    "issued_orders_count",
+                    "acknowledged_orders_count",
+                    "response_time_sum",
+                    "delivered_orders_count",
+                    "on_time_delivered_orders_count",
+                    "rated_orders_count",
+                    "quality_rating_sum",
+                    "counters_initialized",
+                )
+            },
+        ),
     )
     readonly_fields = [
         "vendor_code",
-        # "on_time_delivery_rate",
-        # "quality_rating_avg",
-        # "average_response_time",
-        # "fulfillment_rate",
+        "issued_orders_count",
+        "acknowledged_orders_count",
+        "response_time_sum",
+        "delivered_orders_count",
+        "on_time_delivered_orders_count",
+        "rated_orders_count",
+        "quality_rating_sum",
+        "counters_initialized",
+        "on_time_delivery_rate",
+        "quality_rating_avg",
+        "average_response_time",
+        "fulfillment_rate",
     ]
     ordering = ["name"]
+
+    # Method to save a vendor, saving only the edited fields of a stored vendor
+    def save_model(self, request, obj, form, change):
+        # If the vendor is new, save it entirely
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+
+        # Save only the edited fields and the last change date
+        obj.save(update_fields=[*form.changed_data, "updated_at"])
+
+    # Action to rebuild the performance metrics of the selected vendors
+    @admin.action(description="Rebuild performance metrics")
+    def rebuild_performance_metrics(self, request, queryset):
+        # Recompute the selected vendors batch by batch
+        for vendors in iterate_vendor_batches(
+            list(queryset.values_list("vendor_code", flat=True))
+        ):
+            recompute_vendors_metrics(vendors)
+
+        # Notify the user
+        self.message_user(request, "Performance metrics rebuilt.")
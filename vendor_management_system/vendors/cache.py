@@ -0,0 +1,27 @@
+# Imports
+from vendor_management_system.core.cache import get_or_build_entry, invalidate
+
+
+# Prefix of the cache keys of the vendors
+VENDOR_CACHE_PREFIX = "vendors:retrieve"
+
+
+# Prefix of the cache keys of the identity of the vendors, the code and the name
+# nested in the representations of their orders
+VENDOR_IDENTITY_CACHE_PREFIX = "vendors:identity"
+
+
+# Function to get the cached representation of a vendor with its versions, building
+# it if it changed
+def get_cached_vendor_entry(vendor_code, build):
+    return get_or_build_entry(VENDOR_CACHE_PREFIX, vendor_code, build)
+
+
+# Function to invalidate the cached representation of a vendor
+def invalidate_vendor(vendor_code):
+    invalidate(VENDOR_CACHE_PREFIX, vendor_code)
+
+
+# Function to invalidate the representations nesting the identity of a vendor
+def invalidate_vendor_identity(vendor_code):
+    invalidate(VENDOR_IDENTITY_CACHE_PREFIX, vendor_code)
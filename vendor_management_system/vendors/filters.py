@@ -0,0 +1,76 @@
+# Imports
+from rest_framework import serializers
+
+from vendor_management_system.vendors.metrics import METRIC_FIELDS
+
+
+# Orderings of the vendors, each backed by an index ending in vendor_code
+ORDERINGS = {
+    "name": [("name", False), ("vendor_code", False)],
+    "-name": [("name", True), ("vendor_code", True)],
+    **{field: [(field, False), ("vendor_code", False)] for field in METRIC_FIELDS},
+    **{f"-{field}": [(field, True), ("vendor_code", True)] for field in METRIC_FIELDS},
+}
+
+
+# Lookups of the vendors, bounding the metrics, each backed by an index
+LOOKUPS = {
+    **{f"min_{field}": f"{field}__gte" for field in METRIC_FIELDS},
+    **{f"max_{field}": f"{field}__lte" for field in METRIC_FIELDS},
+}
+
+
+# Serializer for the Vendor filter query parameters
+class VendorFilterSerializer(serializers.Serializer):
+    # Method to get the fields, the bounds are built from the metric fields
+    def get_fields(self):
+        return {
+            **{
+                f"min_{field}": serializers.FloatField(
+                    required=False, help_text=f"Minimum {field} of the vendors"
+                )
+                for field in METRIC_FIELDS
+            },
+            **{
+                f"max_{field}": serializers.FloatField(
+                    required=False, help_text=f"Maximum {field} of the vendors"
+                )
+                for field in METRIC_FIELDS
+            },
+            "ordering": serializers.ChoiceField(
+                choices=list(ORDERINGS),
+                required=False,
+                default="name",
+                help_text="Field to order the vendors by, prefixed with - to reverse",
+            ),
+        }
+
+    # Method to validate the bounds
+    def validate(self, attrs):
+        # If a metric has a minimum above its maximum, raise a validation error
+        for field in METRIC_FIELDS:
+            minimum = attrs.get(f"min_{field}")
+            maximum = attrs.get(f"max_{field}")
+            if minimum is not None and maximum is not None and minimum > maximum:
+                raise serializers.ValidationError(
+                    {f"min_{field}": f"min_{field} must not be above max_{field}"}
+                )
+
+        # Return the validated data
+        return attrs
+
+
+# Function to filter the vendors with the validated filters
+def filter_vendors(vendors, filters):
+    return vendors.filter(
+        **{
+            lookup: filters[parameter]
+            for parameter, lookup in LOOKUPS.items()
+            if parameter in filters
+        }
+    )
+
+
+# Function to get the keyset ordering of the validated filters
+def get_vendor_ordering(filters):
+    return ORDERINGS[filters["ordering"]]
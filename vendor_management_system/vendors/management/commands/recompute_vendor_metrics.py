@@ -0,0 +1,92 @@
+# Imports
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from vendor_management_system.vendors.metrics import (
+    iterate_vendor_batches,
+    recompute_vendors_metrics,
+)
+from vendor_management_system.vendors.tasks import recompute_vendor_metrics
+
+
+# Command to recompute the performance metrics of the vendors
+class Command(BaseCommand):
+    help = "Recompute the performance metrics of all or the given vendors"
+
+    # Method to add the command arguments
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            dest="vendor_codes",
+            help="Vendor code to recompute, can be given multiple times",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of vendors recomputed per query",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of vendors per Celery subtask with --async",
+        )
+        parser.add_argument(
+            "--uninitialized",
+            action="store_true",
+            help="Only recompute the vendors whose counters were never built",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Dispatch the recomputation to the Celery workers",
+        )
+
+    # Method to handle the command
+    def handle(self, *args, **options):
+        # If the recomputation should run on the Celery workers
+        if options["run_async"]:
+            # Dispatch the task
+            recompute_vendor_metrics.delay(
+                vendor_codes=options["vendor_codes"],
+                uninitialized=options["uninitialized"],
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"],
+            )
+
+            # Notify the user
+            self.stdout.write(self.style.SUCCESS("Recomputation dispatched."))
+            return
+
+        # Get the start time
+        start = time.monotonic()
+
+        # Recompute the vendors batch by batch
+        recomputed = 0
+        for vendors in iterate_vendor_batches(
+            options["vendor_codes"],
+            batch_size=options["batch_size"],
+            uninitialized=options["uninitialized"],
+        ):
+            with transaction.atomic():
+                recomputed += recompute_vendors_metrics(vendors)
+
+            # Report the progress
+            duration = time.monotonic() - start
+            self.stdout.write(
+                f"Recomputed {recomputed} vendors "
+                f"({recomputed / duration if duration else recomputed:.0f} vendors/sec)"
+            )
+
+        # Report the result
+        duration = time.monotonic() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed metrics of {recomputed} vendors in {duration:.2f}s."
+            )
+        )
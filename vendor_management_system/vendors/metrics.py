@@ -0,0 +1,371 @@
+# Imports
+import datetime
+
+from django.db import models
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.utils import timezone
+
+from vendor_management_system.purchase_orders.models import PurchaseOrder
+from vendor_management_system.vendors.cache import invalidate_vendor
+from vendor_management_system.vendors.models import (
+    COUNTER_FIELDS,
+    METRIC_FIELDS,
+    Vendor,
+)
+
+
+# Fields of a PurchaseOrder the vendor metrics depend on
+TRACKED_FIELDS = (
+    "vendor_id",
+    "status",
+    "issue_date",
+    "acknowledgment_date",
+    "expected_delivery_date",
+    "actual_delivery_date",
+    "quality_rating",
+)
+
+
+# Function to convert a date / naive datetime to an aware datetime
+def _as_aware_datetime(value):
+    # If the value is not set
+    if value is None:
+        return None
+
+    # If the value is a plain date, use midnight of that date
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+
+    # If the value is naive, make it aware in the current timezone
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+
+    # Return the aware datetime
+    return value
+
+
+# Function to get the tracked state of a PurchaseOrder instance
+def get_order_state(order):
+    return {field: getattr(order, field) for field in TRACKED_FIELDS}
+
+
+# Function to get the contribution of an order state to the vendor counters
+def get_order_contribution(state):
+    # Start with an empty contribution
+    contribution = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    # If there is no state or the order has no vendor
+    if state is None or state["vendor_id"] is None:
+        return contribution
+
+    # Normalize the dates of the order
+    issue_date = _as_aware_datetime(state["issue_date"])
+    acknowledgment_date = _as_aware_datetime(state["acknowledgment_date"])
+    expected_delivery_date = _as_aware_datetime(state["expected_delivery_date"])
+    actual_delivery_date = _as_aware_datetime(state["actual_delivery_date"])
+
+    # If the order is issued
+    if issue_date is not None:
+        contribution["issued_orders_count"] = 1
+
+        # If the order is acknowledged, add the response time in hours
+        if acknowledgment_date is not None:
+            contribution["acknowledged_orders_count"] = 1
+            contribution["response_time_sum"] = (
+                acknowledgment_date - issue_date
+            ).total_seconds() / 3600
+
+    # If the order is delivered
+    if state["status"] == "DELIVERED":
+        contribution["delivered_orders_count"] = 1
+
+        # If the order is delivered on time
+        if (
+            actual_delivery_date is not None
+            and expected_delivery_date is not None
+            and actual_delivery_date <= expected_delivery_date
+        ):
+            contribution["on_time_delivered_orders_count"] = 1
+
+        # If the order is rated
+        if state["quality_rating"] is not None:
+            contribution["rated_orders_count"] = 1
+            contribution["quality_rating_sum"] = state["quality_rating"]
+
+    # Return the contribution
+    return contribution
+
+
+# Function to build a rounded ratio expression keeping the current value if undefined
+def _ratio(numerator, denominator, scale, field):
+    return Coalesce(
+        Round(Cast(numerator, models.FloatField()) * scale / NullIf(denominator, 0), 4),
+        models.F(field),
+    )
+
+
+# Function to get the metric expressions for the given counter expressions
+def get_metric_expressions(counters):
+    return {
+        "on_time_delivery_rate": _ratio(
+            counters["on_time_delivered_orders_count"],
+            counters["delivered_orders_count"],
+            100,
+            "on_time_delivery_rate",
+        ),
+        "quality_rating_avg": _ratio(
+            counters["quality_rating_sum"],
+            counters["rated_orders_count"],
+            1,
+            "quality_rating_avg",
+        ),
+        "average_response_time": _ratio(
+            counters["response_time_sum"],
+            counters["acknowledged_orders_count"],
+            1,
+            "average_response_time",
+        ),
+        "fulfillment_rate": _ratio(
+            counters["delivered_orders_count"],
+            counters["issued_orders_count"],
+            100,
+            "fulfillment_rate",
+        ),
+    }
+
+
+# Function to apply counter deltas to a vendor with a single UPDATE query
+def update_vendor_counters(vendor_code, deltas):
+    # Build the counter expressions relative to the stored values
+    counters = {field: models.F(field) + deltas[field] for field in COUNTER_FIELDS}
+
+    # Update the counters and the derived metrics of the vendor, only if its
+    # counters were built, the deltas of a vendor created before the counters
+    # existed would be applied to zero counters
+    # The update skips the model, so the last change date is set explicitly
+    updated = Vendor.objects.filter(
+        vendor_code=vendor_code, counters_initialized=True
+    ).update(**counters, **get_metric_expressions(counters), updated_at=timezone.now())
+
+    # If the counters of the vendor were not built, build them from its orders,
+    # which already include the change
+    if not updated:
+        rebuild_vendor_counters(vendor_code)
+        return
+
+    # Invalidate the cached representation of the vendor
+    invalidate_vendor(vendor_code)
+
+
+# Function to get the counter deltas per vendor for the change of an order
+def get_vendor_deltas(previous_state, current_state):
+    # Get the contributions of both states
+    previous = get_order_contribution(previous_state)
+    current = get_order_contribution(current_state)
+
+    # Get the vendors of both states
+    previous_vendor = previous_state["vendor_id"] if previous_state else None
+    current_vendor = current_state["vendor_id"] if current_state else None
+
+    # Collect the deltas per vendor
+    deltas = {}
+
+    # If the vendor did not change, apply the difference of the contributions
+    if previous_vendor == current_vendor:
+        deltas[current_vendor] = {
+            field: current[field] - previous[field] for field in COUNTER_FIELDS
+        }
+
+    # Otherwise move the contribution from one vendor to the other
+    else:
+        deltas[previous_vendor] = {field: -previous[field] for field in COUNTER_FIELDS}
+        deltas[current_vendor] = current
+
+    # Return the deltas of the vendors whose counters change
+    return {
+        vendor_code: vendor_deltas
+        for vendor_code, vendor_deltas in deltas.items()
+        if vendor_code is not None and any(vendor_deltas.values())
+    }
+
+
+# Function to apply the change of an order from one state to another
+def apply_order_change(previous_state, current_state):
+    # Traverse over the vendors and update the changed counters
+    for vendor_code, vendor_deltas in get_vendor_deltas(
+        previous_state, current_state
+    ).items():
+        update_vendor_counters(vendor_code, vendor_deltas)
+
+
+# Function to get the aggregates computing the vendor counters from purchase orders
+def get_counter_aggregates():
+    # Filters of the orders counted by the counters
+    issued = models.Q(issue_date__isnull=False)
+    acknowledged = issued & models.Q(acknowledgment_date__isnull=False)
+    delivered = models.Q(status="DELIVERED")
+    on_time = delivered & models.Q(
+        actual_delivery_date__lte=models.F("expected_delivery_date")
+    )
+    rated = delivered & models.Q(quality_rating__isnull=False)
+
+    # Return the conditional aggregates
+    return {
+        "issued_orders_count": models.Count("pk", filter=issued),
+        "acknowledged_orders_count": models.Count("pk", filter=acknowledged),
+        "response_time_sum": models.Sum(
+            models.ExpressionWrapper(
+                models.F("acknowledgment_date") - models.F("issue_date"),
+                output_field=models.DurationField(),
+            ),
+            filter=acknowledged,
+        ),
+        "delivered_orders_count": models.Count("pk", filter=delivered),
+        "on_time_delivered_orders_count": models.Count("pk", filter=on_time),
+        "rated_orders_count": models.Count("pk", filter=rated),
+        "quality_rating_sum": models.Sum("quality_rating", filter=rated),
+    }
+
+
+# Function to convert the aggregated values to counter values
+def get_counter_values(aggregated):
+    # Get the counters, replacing empty sums with zero
+    counters = {field: aggregated[field] or 0 for field in COUNTER_FIELDS}
+
+    # Convert the summed response time interval to hours
+    if isinstance(counters["response_time_sum"], datetime.timedelta):
+        counters["response_time_sum"] = (
+            counters["response_time_sum"].total_seconds() / 3600
+        )
+
+    # Return the counters
+    return counters
+
+
+# Function to rebuild the counters and metrics of a vendor from its purchase orders
+def rebuild_vendor_counters(vendor_code):
+    # Aggregate the counters of the vendor in a single query
+    counters = get_counter_values(
+        PurchaseOrder.objects.filter(vendor_id=vendor_code).aggregate(
+            **get_counter_aggregates()
+        )
+    )
+
+    # Store the counters and the derived metrics of the vendor
+    Vendor.objects.filter(vendor_code=vendor_code).update(
+        **counters,
+        **get_metric_expressions(
+            {field: models.Value(value) for field, value in counters.items()}
+        ),
+        counters_initialized=True,
+        updated_at=timezone.now(),
+    )
+
+    # Invalidate the cached representation of the vendor
+    invalidate_vendor(vendor_code)
+
+    # Return the counters
+    return counters
+
+
+# Function to compute a rounded ratio, keeping the current value if undefined
+def _ratio_value(numerator, denominator, scale, current):
+    return round(numerator * scale / denominator, 4) if denominator else current
+
+
+# Function to recompute the counters and metrics of a batch of vendors
+def recompute_vendors_metrics(vendors):
+    # Aggregate the counters of all the vendors in a single grouped query
+    aggregated = {
+        row["vendor_id"]: get_counter_values(row)
+        for row in PurchaseOrder.objects.filter(vendor__in=vendors)
+        .order_by()
+        .values("vendor_id")
+        .annotate(**get_counter_aggregates())
+    }
+
+    # Traverse over the vendors
+    for vendor in vendors:
+        # Get the counters of the vendor, vendors without orders have no counts
+        counters = aggregated.get(vendor.vendor_code, dict.fromkeys(COUNTER_FIELDS, 0))
+
+        # Set the counters
+        for field, value in counters.items():
+            setattr(vendor, field, value)
+
+        # Set the derived metrics
+        vendor.on_time_delivery_rate = _ratio_value(
+            vendor.on_time_delivered_orders_count,
+            vendor.delivered_orders_count,
+            100,
+            vendor.on_time_delivery_rate,
+        )
+        vendor.quality_rating_avg = _ratio_value(
+            vendor.quality_rating_sum,
+            vendor.rated_orders_count,
+            1,
+            vendor.quality_rating_avg,
+        )
+        vendor.average_response_time = _ratio_value(
+            vendor.response_time_sum,
+            vendor.acknowledged_orders_count,
+            1,
+            vendor.average_response_time,
+        )
+        vendor.fulfillment_rate = _ratio_value(
+            vendor.delivered_orders_count,
+            vendor.issued_orders_count,
+            100,
+            vendor.fulfillment_rate,
+        )
+
+    # Write all the vendors with a single bulk update, which skips the last change
+    # date of the model, so it is set explicitly
+    updated_at = timezone.now()
+    for vendor in vendors:
+        vendor.counters_initialized = True
+        vendor.updated_at = updated_at
+    Vendor.objects.bulk_update(
+        vendors,
+        [*COUNTER_FIELDS, *METRIC_FIELDS, "counters_initialized", "updated_at"],
+    )
+
+    # Invalidate the cached representations of the vendors
+    for vendor in vendors:
+        invalidate_vendor(vendor.vendor_code)
+
+    # Return the number of vendors recomputed
+    return len(vendors)
+
+
+# Function to iterate over the vendors in batches ordered by vendor code
+def iterate_vendor_batches(vendor_codes=None, batch_size=1000, uninitialized=False):
+    # Get the vendors with only the fields needed for the recomputation
+    vendors = Vendor.objects.order_by("vendor_code").only(*METRIC_FIELDS)
+
+    # If a subset of vendors is requested
+    if vendor_codes is not None:
+        vendors = vendors.filter(vendor_code__in=vendor_codes)
+
+    # If only the vendors whose counters were never built are requested
+    if uninitialized:
+        vendors = vendors.filter(counters_initialized=False)
+
+    # Fetch the batches using the vendor code as a keyset
+    last_vendor_code = None
+    while True:
+        # Get the next batch
+        batch_vendors = vendors
+        if last_vendor_code is not None:
+            batch_vendors = batch_vendors.filter(vendor_code__gt=last_vendor_code)
+        batch = list(batch_vendors[:batch_size])
+
+        # If there are no more vendors
+        if not batch:
+            return
+
+        # Yield the batch
+        yield batch
+
+        # Continue after the last vendor of the batch
+        last_vendor_code = batch[-1].vendor_code
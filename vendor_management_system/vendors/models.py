@@ -6,6 +6,31 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+# Metric fields of the Vendor derived from the counters
+METRIC_FIELDS = (
+    "on_time_delivery_rate",
+    "quality_rating_avg",
+    "average_response_time",
+    "fulfillment_rate",
+)
+
+
+# Counter fields of the Vendor maintained by the metrics engine
+COUNTER_FIELDS = (
+    "issued_orders_count",
+    "acknowledged_orders_count",
+    "response_time_sum",
+    "delivered_orders_count",
+    "on_time_delivered_orders_count",
+    "rated_orders_count",
+    "quality_rating_sum",
+)
+
+
+# Fields of the Vendor only written by the metrics engine, in the database
+ENGINE_FIELDS = (*COUNTER_FIELDS, *METRIC_FIELDS, "counters_initialized")
+
+
 # Model for Vendor
 class Vendor(models.Model):
     # Fields
@@ -59,11 +84,103 @@ class Vendor(models.Model):
         blank=True,
     )
 
+    # Counters maintained by the vendor metrics engine
+    issued_orders_count = models.PositiveIntegerField(
+        _("Issued Orders Count"),
+        help_text=_("Number of Purchase Orders issued to Vendor"),
+        default=0,
+        editable=False,
+    )
+    acknowledged_orders_count = models.PositiveIntegerField(
+        _("Acknowledged Orders Count"),
+        help_text=_("Number of Purchase Orders acknowledged by Vendor"),
+        default=0,
+        editable=False,
+    )
+    response_time_sum = models.FloatField(
+        _("Response Time Sum"),
+        help_text=_("Sum of acknowledgment response times of Vendor in Hours"),
+        default=0,
+        editable=False,
+    )
+    delivered_orders_count = models.PositiveIntegerField(
+        _("Delivered Orders Count"),
+        help_text=_("Number of Purchase Orders delivered by Vendor"),
+        default=0,
+        editable=False,
+    )
+    on_time_delivered_orders_count = models.PositiveIntegerField(
+        _("On-time Delivered Orders Count"),
+        help_text=_("Number of Purchase Orders delivered on time by Vendor"),
+        default=0,
+        editable=False,
+    )
+    rated_orders_count = models.PositiveIntegerField(
+        _("Rated Orders Count"),
+        help_text=_("Number of delivered Purchase Orders rated for Vendor"),
+        default=0,
+        editable=False,
+    )
+    quality_rating_sum = models.FloatField(
+        _("Quality Rating Sum"),
+        help_text=_("Sum of quality ratings of delivered Purchase Orders of Vendor"),
+        default=0,
+        editable=False,
+    )
+    counters_initialized = models.BooleanField(
+        _("Counters Initialized"),
+        help_text=_("Whether the counters of Vendor were built from its orders"),
+        default=False,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        _("Updated At"), help_text=_("Date of the last change of Vendor"), auto_now=True
+    )
+
     # Metadata
     class Meta:
         verbose_name = _("Vendor")
         verbose_name_plural = _("Vendors")
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name", "vendor_code"], name="vendor_name_code_idx"),
+            models.Index(
+                fields=["on_time_delivery_rate", "vendor_code"],
+                name="vendor_on_time_rate_idx",
+            ),
+            models.Index(
+                models.F("on_time_delivery_rate").desc(nulls_last=True),
+                models.F("vendor_code").desc(),
+                name="vendor_on_time_rate_desc_idx",
+            ),
+            models.Index(
+                fields=["quality_rating_avg", "vendor_code"],
+                name="vendor_quality_rating_idx",
+            ),
+            models.Index(
+                models.F("quality_rating_avg").desc(nulls_last=True),
+                models.F("vendor_code").desc(),
+                name="vendor_quality_rating_desc_idx",
+            ),
+            models.Index(
+                fields=["average_response_time", "vendor_code"],
+                name="vendor_response_time_idx",
+            ),
+            models.Index(
+                models.F("average_response_time").desc(nulls_last=True),
+                models.F("vendor_code").desc(),
+                name="vendor_response_time_desc_idx",
+            ),
+            models.Index(
+                fields=["fulfillment_rate", "vendor_code"],
+                name="vendor_fulfillment_rate_idx",
+            ),
+            models.Index(
+                models.F("fulfillment_rate").desc(nulls_last=True),
+                models.F("vendor_code").desc(),
+                name="vendor_fulfillment_desc_idx",
+            ),
+        ]
 
     # String representation
     def __str__(self):
@@ -76,5 +193,22 @@ class Vendor(models.Model):
             # Generate a new vendor code
             self.vendor_code = str(uuid.uuid4()).replace("-", "")[:10].upper()
 
+        # If the vendor is new, it has no orders, so its zero counters are exact
+        if self._state.adding:
+            self.counters_initialized = True
+
+        # If the vendor is stored and the fields to save are not specified, save
+        # the loaded fields but the engine fields, the instance may be older than
+        # the counters updated in the database since it was loaded
+        elif kwargs.get("update_fields") is None:
+            deferred_fields = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ENGINE_FIELDS
+                and field.attname not in deferred_fields
+            ]
+
         # Save the model
         super(Vendor, self).save(*args, **kwargs)
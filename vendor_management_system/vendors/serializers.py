@@ -70,3 +70,15 @@ class VendorCreateUpdateSerializer(ModelSerializer):
 
         # Return the validated data
         return data
+
+    # Method to update the vendor, saving only the edited fields
+    def update(self, instance, validated_data):
+        # Set the edited fields on the vendor
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+
+        # Save only the edited fields and the last change date
+        instance.save(update_fields=[*validated_data, "updated_at"])
+
+        # Return the vendor
+        return instance
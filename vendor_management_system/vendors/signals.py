@@ -0,0 +1,26 @@
+# Imports
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vendor_management_system.vendors.cache import (
+    invalidate_vendor,
+    invalidate_vendor_identity,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Create a signal to invalidate the cached Vendor when it is saved, and the
+# representations nesting it when its name may have changed
+@receiver(post_save, sender=Vendor)
+def invalidate_cached_vendor(sender, instance, update_fields=None, **kwargs):
+    invalidate_vendor(instance.vendor_code)
+    if update_fields is None or "name" in update_fields:
+        invalidate_vendor_identity(instance.vendor_code)
+
+
+# Create a signal to invalidate the cached Vendor and the representations nesting it
+# when it is deleted
+@receiver(post_delete, sender=Vendor)
+def invalidate_deleted_vendor(sender, instance, **kwargs):
+    invalidate_vendor(instance.vendor_code)
+    invalidate_vendor_identity(instance.vendor_code)
@@ -0,0 +1,113 @@
+# Imports
+import logging
+import time
+
+from celery import group, shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from vendor_management_system.vendors.metrics import (
+    iterate_vendor_batches,
+    rebuild_vendor_counters,
+    recompute_vendors_metrics,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Get the logger
+logger = logging.getLogger(__name__)
+
+
+# Function to get the cache key marking a vendor as scheduled for recomputation
+def get_scheduled_vendor_key(vendor_code):
+    return f"vendors:metrics-scheduled:{vendor_code}"
+
+
+# Function to schedule the recomputation of the metrics of a vendor
+def schedule_vendor_metrics_recompute(vendor_code):
+    # Get the debounce window
+    window = settings.VENDOR_METRICS_DEBOUNCE_SECONDS
+
+    # Function to schedule the task once the changes are committed
+    def schedule():
+        # Mark the vendor as scheduled in the current window
+        # The marker expires after two windows in case the task is lost
+        scheduled = cache.add(
+            get_scheduled_vendor_key(vendor_code), True, timeout=2 * window
+        )
+
+        # If the vendor is not yet scheduled in the current window, or the cache
+        # is unavailable (None) and the window cannot be checked
+        if scheduled is not False:
+            # Recompute the metrics at the end of the window
+            recompute_vendor_metrics_debounced.apply_async(
+                args=[vendor_code], countdown=window
+            )
+
+    # Schedule the task after the current transaction is committed
+    transaction.on_commit(schedule)
+
+
+# Task to recompute the metrics of a vendor scheduled by the debounce window
+@shared_task
+def recompute_vendor_metrics_debounced(vendor_code):
+    # Clear the marker first, so changes from now on schedule a new run
+    cache.delete(get_scheduled_vendor_key(vendor_code))
+
+    # Rebuild the counters and metrics of the vendor
+    rebuild_vendor_counters(vendor_code)
+
+
+# Task to recompute the metrics of a chunk of vendors
+@shared_task
+def recompute_vendor_metrics_chunk(vendor_codes, batch_size=1000):
+    # Get the start time
+    start = time.monotonic()
+
+    # Recompute the vendors batch by batch
+    recomputed = 0
+    for vendors in iterate_vendor_batches(vendor_codes, batch_size=batch_size):
+        with transaction.atomic():
+            recomputed += recompute_vendors_metrics(vendors)
+
+    # Log the throughput
+    duration = time.monotonic() - start
+    logger.info(
+        "Recomputed metrics of %d vendors in %.2fs (%.0f vendors/sec)",
+        recomputed,
+        duration,
+        recomputed / duration if duration else recomputed,
+    )
+
+    # Return the number of vendors recomputed
+    return recomputed
+
+
+# Task to recompute the metrics of all or the given vendors across the workers
+@shared_task
+def recompute_vendor_metrics(
+    vendor_codes=None, chunk_size=5000, batch_size=1000, uninitialized=False
+):
+    # Get the vendor codes to recompute
+    vendors = Vendor.objects.order_by("vendor_code")
+    if vendor_codes is not None:
+        vendors = vendors.filter(vendor_code__in=vendor_codes)
+    if uninitialized:
+        vendors = vendors.filter(counters_initialized=False)
+    vendor_codes = list(vendors.values_list("vendor_code", flat=True))
+
+    # Split the vendor codes into chunks, one subtask per chunk
+    chunks = [
+        vendor_codes[index : index + chunk_size]
+        for index in range(0, len(vendor_codes), chunk_size)
+    ]
+
+    # Run the chunks in parallel on the workers
+    group(
+        recompute_vendor_metrics_chunk.s(chunk, batch_size=batch_size)
+        for chunk in chunks
+    ).apply_async()
+
+    # Return the number of chunks dispatched
+    return len(chunks)
@@ -0,0 +1,267 @@
+# Imports
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from vendor_management_system.vendors.metrics import (
+    COUNTER_FIELDS,
+    rebuild_vendor_counters,
+)
+from vendor_management_system.vendors.models import Vendor
+
+
+# Function to move a purchase order through the given statuses
+def _transition(order, *statuses):
+    for status in statuses:
+        order.status = status
+        order.save()
+
+
+# Test the vendor counters through the whole order lifecycle
+@pytest.mark.django_db
+def test_vendor_metrics_order_lifecycle(db, vendor_factory, purchase_order_factory):
+    # Create a Vendor object and a pending PurchaseOrder object
+    vendor = vendor_factory()
+    order = purchase_order_factory(
+        status="PENDING", order_date=timezone.now(), quality_rating=None
+    )
+
+    # Issue the order to the vendor
+    order.vendor = vendor
+    _transition(order, "ISSUED")
+    vendor.refresh_from_db()
+
+    # Check the counters after the order is issued
+    assert vendor.issued_orders_count == 1
+    assert vendor.delivered_orders_count == 0
+    assert vendor.fulfillment_rate == 0
+
+    # Acknowledge and deliver the order
+    _transition(order, "ACKNOWLEDGED", "DELIVERED")
+    vendor.refresh_from_db()
+
+    # Check the counters after the order is delivered
+    assert vendor.acknowledged_orders_count == 1
+    assert vendor.average_response_time == 0
+    assert vendor.delivered_orders_count == 1
+    assert vendor.on_time_delivered_orders_count == 1
+    assert vendor.on_time_delivery_rate == 100
+    assert vendor.fulfillment_rate == 100
+
+    # Rate the order
+    order.quality_rating = 4
+    order.save()
+    vendor.refresh_from_db()
+
+    # Check the quality rating counters
+    assert vendor.rated_orders_count == 1
+    assert vendor.quality_rating_sum == 4
+    assert vendor.quality_rating_avg == 4
+
+
+# Test that re-saving an unchanged order does not touch the vendor
+@pytest.mark.django_db
+def test_vendor_metrics_unchanged_save(db, vendor_factory, purchase_order_factory):
+    # Create a delivered PurchaseOrder object
+    order = purchase_order_factory(status="DELIVERED")
+    vendor = order.vendor
+    vendor.refresh_from_db()
+    counters = (vendor.delivered_orders_count, vendor.rated_orders_count)
+
+    # Save the order again and capture the queries
+    with CaptureQueriesContext(connection) as context:
+        order.save()
+
+    # Check that no vendor row was written
+    assert not any(
+        query["sql"].startswith('UPDATE "vendors_vendor"')
+        for query in context.captured_queries
+    )
+
+    # Check that the counters are unchanged
+    vendor.refresh_from_db()
+    assert (vendor.delivered_orders_count, vendor.rated_orders_count) == counters
+
+
+# Test that deleting an order removes its contribution
+@pytest.mark.django_db
+def test_vendor_metrics_order_delete(db, vendor_factory, purchase_order_factory):
+    # Create a delivered PurchaseOrder object
+    order = purchase_order_factory(status="DELIVERED")
+    vendor = order.vendor
+
+    # Delete the order
+    order.delete()
+    vendor.refresh_from_db()
+
+    # Check that the counters are reset
+    assert vendor.issued_orders_count == 0
+    assert vendor.delivered_orders_count == 0
+    assert vendor.rated_orders_count == 0
+
+
+# Test that saving a vendor loaded before its orders changed keeps the counters
+@pytest.mark.django_db
+def test_vendor_metrics_stale_vendor_save(db, vendor_factory, purchase_order_factory):
+    # Create a Vendor object with an issued PurchaseOrder object
+    vendor = vendor_factory()
+    order = purchase_order_factory(status="ISSUED", vendor=vendor, quality_rating=None)
+
+    # Load the vendor before the order is delivered and rated
+    stale_vendor = Vendor.objects.get(vendor_code=vendor.vendor_code)
+    order.quality_rating = 4
+    _transition(order, "DELIVERED")
+
+    # Rename and save the stale vendor
+    stale_vendor.name = "Renamed Vendor"
+    stale_vendor.save()
+    vendor.refresh_from_db()
+
+    # Check that the name is saved and the counters are kept
+    assert vendor.name == "Renamed Vendor"
+    assert vendor.counters_initialized
+    assert vendor.delivered_orders_count == 1
+    assert vendor.rated_orders_count == 1
+    assert vendor.quality_rating_avg == 4
+    assert vendor.fulfillment_rate == 100
+
+
+# Test that the quality rating average is the exact mean of all ratings
+@pytest.mark.django_db
+def test_vendor_quality_rating_avg_exact_mean(
+    db, vendor_factory, purchase_order_factory
+):
+    # Create a Vendor object
+    vendor = vendor_factory()
+
+    # Create delivered PurchaseOrder objects with ratings 5, 5 and 2
+    orders = [
+        purchase_order_factory(status="DELIVERED", vendor=vendor, quality_rating=rating)
+        for rating in [5, 5, 2]
+    ]
+    vendor.refresh_from_db()
+
+    # Check the exact mean instead of a recency weighted value
+    assert vendor.rated_orders_count == 3
+    assert vendor.quality_rating_sum == 12
+    assert vendor.quality_rating_avg == 4
+
+    # Save every order again
+    for order in orders:
+        order.save()
+    vendor.refresh_from_db()
+
+    # Check that repeated saves do not add the ratings again
+    assert vendor.rated_orders_count == 3
+    assert vendor.quality_rating_avg == 4
+
+    # Change the rating of one of the orders
+    orders[2].quality_rating = 5
+    orders[2].save()
+    vendor.refresh_from_db()
+
+    # Check that the old rating is replaced
+    assert vendor.rated_orders_count == 3
+    assert vendor.quality_rating_avg == 5
+
+
+# Test that rebuilding the counters matches the incremental counters
+@pytest.mark.django_db
+def test_rebuild_vendor_counters(db, vendor_factory, purchase_order_factory):
+    # Create a Vendor object with PurchaseOrder objects in every status
+    vendor = vendor_factory()
+    for status in ["ISSUED", "ACKNOWLEDGED", "DELIVERED", "DELIVERED", "CANCELLED"]:
+        purchase_order_factory(status=status, vendor=vendor)
+    vendor.refresh_from_db()
+
+    # Get the incrementally maintained counters
+    incremental = {field: getattr(vendor, field) for field in COUNTER_FIELDS}
+
+    # Rebuild the counters from the purchase orders
+    rebuilt = rebuild_vendor_counters(vendor.vendor_code)
+    vendor.refresh_from_db()
+
+    # Check that both agree
+    assert rebuilt == pytest.approx(incremental)
+    assert vendor.average_response_time == pytest.approx(
+        round(rebuilt["response_time_sum"] / rebuilt["acknowledged_orders_count"], 4)
+    )
+
+
+# Test the recompute_vendor_metrics management command
+@pytest.mark.django_db
+def test_recompute_vendor_metrics_command(db, vendor_factory, purchase_order_factory):
+    # Create Vendor objects with delivered PurchaseOrder objects
+    vendors = vendor_factory.create_batch(3)
+    for vendor in vendors:
+        purchase_order_factory(status="DELIVERED", vendor=vendor, quality_rating=3)
+
+    # Reset the counters and metrics of the vendors
+    Vendor.objects.update(**dict.fromkeys(COUNTER_FIELDS, 0), quality_rating_avg=None)
+
+    # Run the command in small batches
+    call_command("recompute_vendor_metrics", batch_size=2)
+
+    # Check that every vendor is recomputed
+    for vendor in vendors:
+        vendor.refresh_from_db()
+        assert vendor.delivered_orders_count == 1
+        assert vendor.rated_orders_count == 1
+        assert vendor.quality_rating_avg == 3
+        assert vendor.fulfillment_rate == 100
+
+
+# Test that the counters of a vendor created before they existed are built, not
+# decremented below zero
+@pytest.mark.django_db
+def test_vendor_metrics_uninitialized_counters(
+    db, vendor_factory, purchase_order_factory
+):
+    # Create a Vendor object with delivered PurchaseOrder objects
+    vendor = vendor_factory()
+    orders = [
+        purchase_order_factory(status="DELIVERED", vendor=vendor, quality_rating=4)
+        for _ in range(3)
+    ]
+
+    # Reset the counters, as for a vendor created before the counters existed
+    Vendor.objects.update(
+        **dict.fromkeys(COUNTER_FIELDS, 0), counters_initialized=False
+    )
+
+    # Delete one of the orders
+    orders[0].delete()
+    vendor.refresh_from_db()
+
+    # Check that the counters are built from the remaining orders
+    assert vendor.counters_initialized
+    assert vendor.delivered_orders_count == 2
+    assert vendor.rated_orders_count == 2
+    assert vendor.quality_rating_avg == 4
+
+
+# Test that the command only recomputes the vendors whose counters were never built
+@pytest.mark.django_db
+def test_recompute_vendor_metrics_command_uninitialized(
+    db, vendor_factory, purchase_order_factory
+):
+    # Create Vendor objects with delivered PurchaseOrder objects
+    vendors = vendor_factory.create_batch(2)
+    for vendor in vendors:
+        purchase_order_factory(status="DELIVERED", vendor=vendor)
+
+    # Reset the counters of both vendors, only the first one is uninitialized
+    Vendor.objects.update(**dict.fromkeys(COUNTER_FIELDS, 0))
+    Vendor.objects.filter(pk=vendors[0].pk).update(counters_initialized=False)
+
+    # Run the command for the uninitialized vendors
+    call_command("recompute_vendor_metrics", uninitialized=True)
+
+    # Check that only the uninitialized vendor is recomputed
+    vendors[0].refresh_from_db()
+    vendors[1].refresh_from_db()
+    assert vendors[0].counters_initialized
+    assert vendors[0].delivered_orders_count == 1
+    assert vendors[1].delivered_orders_count == 0
@@ -0,0 +1,22 @@
+# Imports
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from vendor_management_system.core.serializers import ValuesSerializer
+from vendor_management_system.vendors.models import Vendor
+from vendor_management_system.vendors.serializers import VendorSerializer
+
+
+# Test that the values serializer renders the same bytes as the model serializer
+@pytest.mark.django_db
+def test_values_serializer_matches_model_serializer(db, vendor_factory):
+    # Create Vendor objects
+    vendor_factory.create_batch(5)
+
+    # Serialize the vendors with both serializers
+    serializer = ValuesSerializer(VendorSerializer)
+    expected = VendorSerializer(Vendor.objects.all(), many=True).data
+    rows = serializer.serialize(Vendor.objects.values(*serializer.columns))
+
+    # Check that the rendered output is identical
+    assert JSONRenderer().render(rows) == JSONRenderer().render(expected)
@@ -0,0 +1,84 @@
+# Imports
+import pytest
+
+from vendor_management_system.vendors import tasks
+from vendor_management_system.vendors.metrics import COUNTER_FIELDS
+
+
+# Set the fixture to capture the debounced recomputations instead of queuing them
+@pytest.fixture()
+def scheduled_vendors(settings, monkeypatch):
+    # Enable the asynchronous metrics
+    settings.VENDOR_METRICS_ASYNC = True
+
+    # Record the vendors passed to the debounced task
+    scheduled = []
+    monkeypatch.setattr(
+        tasks.recompute_vendor_metrics_debounced,
+        "apply_async",
+        lambda args, countdown: scheduled.append(args[0]),
+    )
+
+    # Return the scheduled vendors
+    return scheduled
+
+
+# Test that the changes of a vendor in the debounce window are coalesced
+@pytest.mark.django_db
+def test_schedule_vendor_metrics_recompute_coalesced(
+    db, scheduled_vendors, purchase_order_factory, django_capture_on_commit_callbacks
+):
+    # Create an issued PurchaseOrder object and change it several times
+    with django_capture_on_commit_callbacks(execute=True):
+        order = purchase_order_factory(status="ISSUED", quality_rating=None)
+    vendor = order.vendor
+    for status in ["ACKNOWLEDGED", "DELIVERED"]:
+        with django_capture_on_commit_callbacks(execute=True):
+            order.status = status
+            order.save()
+
+    # Check that a single recomputation is scheduled and nothing is applied yet
+    assert scheduled_vendors == [vendor.vendor_code]
+    vendor.refresh_from_db()
+    assert vendor.delivered_orders_count == 0
+
+    # Run the debounced recomputation
+    tasks.recompute_vendor_metrics_debounced(vendor.vendor_code)
+    vendor.refresh_from_db()
+
+    # Check that the vendor is rebuilt from its orders
+    assert vendor.issued_orders_count == 1
+    assert vendor.delivered_orders_count == 1
+    assert vendor.fulfillment_rate == 100
+
+    # Change the order again and check that a new recomputation is scheduled
+    with django_capture_on_commit_callbacks(execute=True):
+        order.quality_rating = 4
+        order.save()
+    assert scheduled_vendors == [vendor.vendor_code, vendor.vendor_code]
+
+
+# Test that the recomputations are still scheduled when the cache is unavailable
+@pytest.mark.django_db
+def test_schedule_vendor_metrics_recompute_cache_unavailable(
+    db,
+    scheduled_vendors,
+    monkeypatch,
+    vendor_factory,
+    django_capture_on_commit_callbacks,
+):
+    # Make the cache fail as it does with the exceptions ignored
+    monkeypatch.setattr(tasks.cache, "add", lambda *args, **kwargs: None)
+
+    # Schedule the recomputation of a vendor twice
+    vendor = vendor_factory()
+    for _ in range(2):
+        with django_capture_on_commit_callbacks(execute=True):
+            tasks.schedule_vendor_metrics_recompute(vendor.vendor_code)
+
+    # Check that no recomputation is lost
+    assert scheduled_vendors == [vendor.vendor_code, vendor.vendor_code]
+
+    # Check that the counters are untouched until the recomputation runs
+    vendor.refresh_from_db()
+    assert not any(getattr(vendor, field) for field in COUNTER_FIELDS)
@@ -0,0 +1,181 @@
+# Imports
+import pytest
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vendor_management_system.vendors.metrics import (
+    COUNTER_FIELDS,
+    update_vendor_counters,
+)
+from vendor_management_system.vendors.models import Vendor
+from vendor_management_system.vendors.serializers import VendorSerializer
+
+
+# Test filtering and ordering the vendor list by their metrics across pages
+@pytest.mark.django_db
+def test_list_vendors_metric_filters(db, admin_user, vendor_factory):
+    # Create Vendor objects, some sharing the same fulfillment rate
+    vendor_factory.create_batch(4, on_time_delivery_rate=70.0, fulfillment_rate=50.0)
+    vendor_factory.create_batch(6)
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+
+    # Fetch every page of the vendors below 80% on time, by fulfillment rate
+    response = client.get(
+        reverse("vendors--list-create-vendor"),
+        {
+            "token": token.key,
+            "max_on_time_delivery_rate": 80,
+            "ordering": "fulfillment_rate",
+            "page_size": 3,
+        },
+    )
+    vendor_codes = []
+    while True:
+        assert response.status_code == 200
+        vendor_codes += [vendor["vendor_code"] for vendor in response.data["results"]]
+        if response.data["next"] is None:
+            break
+        response = client.get(response.data["next"])
+
+    # Check that every matching vendor is listed once, in order
+    expected = sorted(
+        Vendor.objects.filter(on_time_delivery_rate__lte=80),
+        key=lambda vendor: (vendor.fulfillment_rate, vendor.vendor_code),
+    )
+    assert vendor_codes == [vendor.vendor_code for vendor in expected]
+
+
+# Test that the vendor list rejects invalid filters
+@pytest.mark.django_db
+def test_list_vendors_invalid_filters(db, admin_user):
+    # List the vendors with an unknown ordering and with an empty range
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    invalid_ordering = client.get(
+        reverse("vendors--list-create-vendor"),
+        {"token": token.key, "ordering": "address"},
+    )
+    empty_range = client.get(
+        reverse("vendors--list-create-vendor"),
+        {"token": token.key, "min_fulfillment_rate": 90, "max_fulfillment_rate": 10},
+    )
+
+    # Check the responses
+    assert invalid_ordering.status_code == 400
+    assert "ordering" in invalid_ordering.data
+    assert empty_range.status_code == 400
+    assert "min_fulfillment_rate" in empty_range.data
+
+
+# Test that the cached vendor follows the changes of its metrics
+@pytest.mark.django_db
+def test_retrieve_vendor_cache_invalidation(
+    db, admin_user, vendor_factory, django_capture_on_commit_callbacks
+):
+    # Create a Vendor object and cache it
+    vendor = vendor_factory()
+    token = Token.objects.create(user=admin_user)
+    url = reverse(
+        "vendors--retrieve-update-destroy-vendor",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+    response = APIClient().get(url, {"token": token.key})
+    assert response.data == VendorSerializer(vendor).data
+
+    # Update the counters of the vendor with a single query, without saving it
+    with django_capture_on_commit_callbacks(execute=True):
+        update_vendor_counters(
+            vendor.vendor_code,
+            {
+                **dict.fromkeys(COUNTER_FIELDS, 0),
+                "delivered_orders_count": 2,
+                "on_time_delivered_orders_count": 1,
+            },
+        )
+
+    # Check that the updated metrics are returned
+    vendor.refresh_from_db()
+    response = APIClient().get(url, {"token": token.key})
+    assert response.data["on_time_delivery_rate"] == 50
+    assert response.data == VendorSerializer(vendor).data
+
+
+# Test the conditional GET of a vendor
+@pytest.mark.django_db
+def test_retrieve_vendor_etag(
+    db,
+    admin_user,
+    vendor_factory,
+    django_capture_on_commit_callbacks,
+    assert_num_queries,
+):
+    # Create a Vendor object and retrieve it
+    vendor = vendor_factory()
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse(
+        "vendors--retrieve-update-destroy-vendor",
+        kwargs={"vendor_code": vendor.vendor_code},
+    )
+    etag = client.get(url, {"token": token.key})["ETag"]
+
+    # Check that the unchanged vendor is not sent again, without querying the database
+    with assert_num_queries(0):
+        response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    # Update the metrics of the vendor with a single query
+    with django_capture_on_commit_callbacks(execute=True):
+        update_vendor_counters(
+            vendor.vendor_code,
+            {**dict.fromkeys(COUNTER_FIELDS, 0), "delivered_orders_count": 1},
+        )
+
+    # Check that the vendor is sent again with a new ETag
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+# Test the conditional GET of the vendor list
+@pytest.mark.django_db
+def test_list_vendors_etag(db, admin_user, vendor_factory):
+    # Create Vendor objects and list them
+    vendor, removed_vendor = vendor_factory.create_batch(2)
+    token = Token.objects.create(user=admin_user)
+    client = APIClient()
+    url = reverse("vendors--list-create-vendor")
+    etag = client.get(url, {"token": token.key})["ETag"]
+
+    # Check that the unchanged list is not sent again
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    # Check that another ordering or set of fields has another ETag
+    response = client.get(url, {"token": token.key, "ordering": "-name"})
+    assert response["ETag"] != etag
+    response = client.get(url, {"token": token.key, "fields": "vendor_code"})
+    assert response["ETag"] != etag
+
+    # Update the metrics of a vendor with a single query
+    update_vendor_counters(
+        vendor.vendor_code,
+        {**dict.fromkeys(COUNTER_FIELDS, 0), "delivered_orders_count": 1},
+    )
+
+    # Check that the list is sent again with a new ETag
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    etag = response["ETag"]
+
+    # Check that deleting a vendor changes the ETag
+    removed_vendor.delete()
+    response = client.get(url, {"token": token.key}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert [result["vendor_code"] for result in response.data["results"]] == [
+        vendor.vendor_code
+    ]
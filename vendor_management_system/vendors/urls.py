@@ -16,5 +16,6 @@ urlpatterns = [
         VendorViewSet.as_view(
             {"get": "retrieve", "put": "update", "delete": "destroy"}
         ),
+        name="vendors--retrieve-update-destroy-vendor",
     ),
 ]
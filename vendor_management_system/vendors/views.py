@@ -7,7 +7,23 @@ from rest_framework import permissions, response, status, viewsets
 from vendor_management_system.core.authentication import (
     QueryParameterTokenAuthentication,
 )
+from vendor_management_system.core.conditional import (
+    get_entry_etag,
+    get_list_etag,
+    respond_conditionally,
+)
+from vendor_management_system.core.pagination import KeysetPagination
+from vendor_management_system.core.serializers import (
+    get_requested_fields,
+    get_values_serializer,
+)
 
+from vendor_management_system.vendors.cache import get_cached_vendor_entry
+from vendor_management_system.vendors.filters import (
+    VendorFilterSerializer,
+    filter_vendors,
+    get_vendor_ordering,
+)
 from vendor_management_system.vendors.models import Vendor
 from vendor_management_system.vendors.serializers import (
     VendorCreateUpdateSerializer,
@@ -33,25 +49,72 @@ class VendorViewSet(viewsets.ViewSet):
                 type=openapi.TYPE_STRING,
                 required=True,
                 description="The token to authenticate the user",
-            )
+            ),
+            openapi.Parameter(
+                name="fields",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="Comma separated fields to return, all by default",
+            ),
+            openapi.Parameter(
+                name="cursor",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                required=False,
+                description="The cursor of the page, taken from the next link",
+            ),
+            openapi.Parameter(
+                name="page_size",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="The number of vendors per page",
+            ),
         ],
+        query_serializer=VendorFilterSerializer,
         responses={
             status.HTTP_200_OK: openapi.Response(
-                "List of all vendors", schema=VendorSerializer(many=True)
+                "A page of the vendors", schema=VendorSerializer(many=True)
             ),
+            status.HTTP_400_BAD_REQUEST: "Bad request",
             status.HTTP_401_UNAUTHORIZED: "Unauthorized",
         },
         tags=["Vendors"],
     )
     def list(self, request):
-        # Get all vendors
-        vendors = Vendor.objects.all()
+        # Validate the filters
+        filter_serializer = VendorFilterSerializer(data=request.query_params)
 
-        # Serialize the vendors
-        serializer = VendorSerializer(vendors, many=True)
+        # If the filters are not valid
+        if not filter_serializer.is_valid():
+            return response.Response(
+                filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Get the serializer of the requested fields
+        serializer = get_values_serializer(
+            VendorSerializer, get_requested_fields(request, VendorSerializer)
+        )
+
+        # Get the columns of the filtered vendors and of their ordering
+        ordering = get_vendor_ordering(filter_serializer.validated_data)
+        columns = dict.fromkeys(serializer.columns + [field for field, _ in ordering])
+        vendors = filter_vendors(
+            Vendor.objects.values(*columns), filter_serializer.validated_data
+        )
+
+        # Get a page of the vendors in the requested order
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(vendors, request)
+
+        # Get the response, serialized straight from the rows
+        list_response = paginator.get_paginated_response(serializer.serialize(page))
+
+        # Return the response, not modified if the client already has the page
+        return respond_conditionally(
+            request, get_list_etag(request, list_response.data), list_response
+        )
 
     # Method to handle new vendor creation
     @swagger_auto_schema(
@@ -144,14 +207,21 @@ class VendorViewSet(viewsets.ViewSet):
         tags=["Vendors"],
     )
     def retrieve(self, request, vendor_code=None):
-        # Get the vendor by vendor_code
-        vendor = get_object_or_404(Vendor, vendor_code=vendor_code)
+        # Function to serialize the vendor from the database
+        def build():
+            return VendorSerializer(
+                get_object_or_404(Vendor, vendor_code=vendor_code)
+            ).data
 
-        # Serialize the vendor
-        serializer = VendorSerializer(vendor)
+        # Get the serialized vendor, from the cache unless it changed
+        entry = get_cached_vendor_entry(vendor_code, build)
 
-        # Return the response
-        return response.Response(serializer.data, status=status.HTTP_200_OK)
+        # Return the response, not modified if the client already has the vendor
+        return respond_conditionally(
+            request,
+            get_entry_etag(entry),
+            response.Response(entry["value"], status=status.HTTP_200_OK),
+        )
 
     # Method to handle updating a vendor
     @swagger_auto_schema(